@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import List
+from typing import Dict, List
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -22,6 +22,43 @@ class Settings(BaseSettings):
     ark_model_id: str | None = Field(default=None, alias="ARK_MODEL_ID")
     ark_outline_model_id: str | None = Field(default=None, alias="ARK_OUTLINE_MODEL_ID")
     ark_policy_model_id: str | None = Field(default=None, alias="ARK_POLICY_MODEL_ID")
+    http_pool_limit: int = Field(default=100, alias="HTTP_POOL_LIMIT")
+    http_pool_limit_per_host: int = Field(default=20, alias="HTTP_POOL_LIMIT_PER_HOST")
+    http_keepalive_seconds: float = Field(default=30.0, alias="HTTP_KEEPALIVE_SECONDS")
+    http_dns_ttl_seconds: int = Field(default=300, alias="HTTP_DNS_TTL_SECONDS")
+    http_prewarm: bool = Field(default=False, alias="HTTP_PREWARM")
+    llm_rate_per_second: float = Field(default=10.0, alias="LLM_RATE_PER_SECOND")
+    llm_burst: int = Field(default=20, alias="LLM_BURST")
+    llm_queue_size: int = Field(default=64, alias="LLM_QUEUE_SIZE")
+    outline_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, alias="OUTLINE_CACHE_TTL_SECONDS")
+    outline_cache_memory_size: int = Field(default=256, alias="OUTLINE_CACHE_MEMORY_SIZE")
+    outline_topic_match_threshold: float = Field(default=0.7, alias="OUTLINE_TOPIC_MATCH_THRESHOLD")
+    outline_coverage_threshold: float = Field(default=0.5, alias="OUTLINE_COVERAGE_THRESHOLD")
+    extraction_keywords_raw: str | None = Field(default=None, alias="EXTRACTION_KEYWORDS")
+    outline_batch_concurrency: int = Field(default=4, alias="OUTLINE_BATCH_CONCURRENCY")
+    outline_job_ttl_seconds: float = Field(default=3600.0, alias="OUTLINE_JOB_TTL_SECONDS")
+    turn_debounce_ms: int = Field(default=600, alias="TURN_DEBOUNCE_MS")
+    turn_budget_ms: int = Field(default=3000, alias="TURN_BUDGET_MS")
+    turn_tts_reserve_ms: int = Field(default=400, alias="TURN_TTS_RESERVE_MS")
+    policy_breaker_failures: int = Field(default=3, alias="POLICY_BREAKER_FAILURES")
+    policy_breaker_reset_seconds: float = Field(default=30.0, alias="POLICY_BREAKER_RESET_SECONDS")
+    policy_prompt_tokens: int = Field(default=1200, alias="POLICY_PROMPT_TOKENS")
+    prompt_token_budgets_raw: str | None = Field(default=None, alias="PROMPT_TOKEN_BUDGETS")
+    conversation_summary_tokens: int = Field(default=300, alias="CONVERSATION_SUMMARY_TOKENS")
+    hybrid_policy_enabled: bool = Field(default=False, alias="HYBRID_POLICY_ENABLED")
+    hybrid_policy_min_confidence: float = Field(default=0.9, alias="HYBRID_POLICY_MIN_CONFIDENCE")
+    policy_memo_models_raw: str | None = Field(default=None, alias="POLICY_MEMO_MODELS")
+    policy_memo_ttl_seconds: float = Field(default=600.0, alias="POLICY_MEMO_TTL_SECONDS")
+    policy_memo_size: int = Field(default=1024, alias="POLICY_MEMO_SIZE")
+    policy_hedge_enabled: bool = Field(default=False, alias="POLICY_HEDGE_ENABLED")
+    policy_hedge_percentile: float = Field(default=0.9, alias="POLICY_HEDGE_PERCENTILE")
+    policy_hedge_max_ratio: float = Field(default=0.1, alias="POLICY_HEDGE_MAX_RATIO")
+    policy_hedge_min_delay_ms: int = Field(default=200, alias="POLICY_HEDGE_MIN_DELAY_MS")
+    precompute_branches_enabled: bool = Field(default=False, alias="PRECOMPUTE_BRANCHES_ENABLED")
+    speculative_policy_enabled: bool = Field(default=False, alias="SPECULATIVE_POLICY_ENABLED")
+    speculative_stable_ms: int = Field(default=400, alias="SPECULATIVE_STABLE_MS")
+    speculative_match_threshold: float = Field(default=0.9, alias="SPECULATIVE_MATCH_THRESHOLD")
+    speculative_max_waste_ratio: float = Field(default=0.3, alias="SPECULATIVE_MAX_WASTE_RATIO")
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore", case_sensitive=False)
 
@@ -31,6 +68,29 @@ class Settings(BaseSettings):
             return ["http://localhost:5173", "http://127.0.0.1:5173"]
         return [origin.strip() for origin in self.allow_origins_raw.split(",") if origin.strip()]
     
+    @property
+    def policy_memo_models(self) -> List[str]:
+        """Model ids whose policy decisions are memoized (``*`` for all)."""
+
+        return [model.strip() for model in (self.policy_memo_models_raw or "").split(",") if model.strip()]
+
+    @property
+    def extraction_keywords(self) -> List[str]:
+        """Domain keywords recorded as notes whenever an answer mentions them."""
+
+        return [word.strip() for word in (self.extraction_keywords_raw or "").split(",") if word.strip()]
+
+    @property
+    def prompt_token_budgets(self) -> Dict[str, int]:
+        """Per-model prompt budgets from ``model=tokens`` pairs, e.g. ``ep-a=2000,ep-b=800``."""
+
+        budgets: Dict[str, int] = {}
+        for item in (self.prompt_token_budgets_raw or "").split(","):
+            model, _, tokens = item.partition("=")
+            if model.strip() and tokens.strip().isdigit():
+                budgets[model.strip()] = int(tokens)
+        return budgets
+
     @property
     def llm_credentials_ready(self) -> bool:
         return bool(self.ark_base_url and self.ark_api_key and self.ark_model_id)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+try:  # pragma: no cover - optional dependency for tests
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore[assignment]
+
+from ..config import settings
+
+LOGGER = logging.getLogger(__name__)
+# 同步驱动旧会话 close() 时允许的最多裸 yield 次数
+_MAX_SYNC_CLOSE_STEPS = 8
+
+
+@dataclass
+class PoolConfig:
+    limit: int
+    limit_per_host: int
+    keepalive_timeout: float
+    dns_ttl: int
+    prewarm_url: Optional[str] = None
+
+
+class PooledClient:
+    """A long-lived ``aiohttp.ClientSession`` bound to one event loop."""
+
+    def __init__(self, name: str, config: PoolConfig) -> None:
+        self.name = name
+        self.config = config
+        self.session: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sessions_created = 0
+
+    def get(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._loop is not loop:
+            self._drop_stale()
+            connector = aiohttp.TCPConnector(
+                limit=self.config.limit,
+                limit_per_host=self.config.limit_per_host,
+                keepalive_timeout=self.config.keepalive_timeout,
+                ttl_dns_cache=self.config.dns_ttl,
+                use_dns_cache=True,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+            self.sessions_created += 1
+            LOGGER.info("[http] created pooled client %s", self.name)
+        return self.session
+
+    def _drop_stale(self) -> None:
+        """Close the session left over from a previous event loop before replacing it."""
+
+        stale = self.session
+        if stale is None or stale.closed:
+            return
+        # aiohttp 3.9：ClientSession.close() 同步关闭连接器，之后只有一次裸 yield（不等待
+        # future），因此无需旧事件循环即可驱动完成，会话本身也被标记为已关闭（GC 时不再告警）
+        closing = stale.close()
+        try:
+            for _ in range(_MAX_SYNC_CLOSE_STEPS):
+                if closing.send(None) is not None:
+                    break  # 在等待旧事件循环上的 future：无法同步完成
+        except StopIteration:
+            LOGGER.info("[http] closed pooled client %s from a previous event loop", self.name)
+        except Exception as exc:  # 旧事件循环已关闭时 transport 无法再关闭
+            LOGGER.warning("[http] dropped pooled client %s from a previous event loop: %s", self.name, exc)
+        else:
+            closing.close()
+            LOGGER.warning("[http] pooled client %s from a previous event loop could not be closed synchronously", self.name)
+
+    async def prewarm(self, timeout: float = 3.0) -> None:
+        """Open one keep-alive connection (DNS + TCP + TLS) ahead of the first real request."""
+
+        url = self.config.prewarm_url
+        if not url:
+            return
+        session = self.get()
+        try:
+            async with session.head(url, timeout=aiohttp.ClientTimeout(total=timeout), allow_redirects=False):
+                pass
+            LOGGER.info("[http] pre-warmed %s -> %s", self.name, url)
+        except Exception as exc:  # network errors are not fatal at startup
+            LOGGER.warning("[http] pre-warm failed for %s: %s", self.name, exc)
+
+    def stats(self) -> Dict[str, Any]:
+        session = self.session
+        if session is None or session.closed:
+            return {"open": False, "sessions_created": self.sessions_created}
+        connector = session.connector
+        acquired = len(getattr(connector, "_acquired", ()))
+        idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        return {
+            "open": True,
+            "sessions_created": self.sessions_created,
+            "in_use": acquired,
+            "idle": idle,
+            "limit": self.config.limit,
+            "limit_per_host": self.config.limit_per_host,
+        }
+
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            with contextlib.suppress(Exception):
+                await self.session.close()
+        self.session = None
+        self._loop = None
+
+
+def _origin(url: str | None) -> str | None:
+    if not url:
+        return None
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return None
+    scheme = {"ws": "http", "wss": "https"}.get(parts.scheme, parts.scheme)
+    return f"{scheme}://{parts.netloc}/"
+
+
+class HttpClientRegistry:
+    """Process-wide pooled clients for the Ark, TTS and ASR upstreams."""
+
+    def __init__(self) -> None:
+        self._clients: Dict[str, PooledClient] = {}
+
+    def register(
+        self,
+        name: str,
+        *,
+        prewarm_url: str | None = None,
+        limit: int | None = None,
+        limit_per_host: int | None = None,
+    ) -> PooledClient:
+        """Pooled client for ``name``; ``limit``/``limit_per_host`` override HTTP_POOL_* (0: unlimited)."""
+
+        client = self._clients.get(name)
+        if client is None:
+            client = PooledClient(
+                name,
+                PoolConfig(
+                    limit=settings.http_pool_limit if limit is None else limit,
+                    limit_per_host=settings.http_pool_limit_per_host if limit_per_host is None else limit_per_host,
+                    keepalive_timeout=settings.http_keepalive_seconds,
+                    dns_ttl=settings.http_dns_ttl_seconds,
+                ),
+            )
+            self._clients[name] = client
+        if prewarm_url:
+            client.config.prewarm_url = _origin(prewarm_url)
+        return client
+
+    def get(self, name: str) -> Any:
+        """Return the shared ``ClientSession`` for ``name`` (created lazily)."""
+
+        if aiohttp is None:
+            raise RuntimeError("aiohttp is required for pooled HTTP clients")
+        return self.register(name).get()
+
+    async def start(self, prewarm: bool = False) -> None:
+        if aiohttp is None:
+            return
+        for client in self._clients.values():
+            client.get()
+        if prewarm:
+            await asyncio.gather(*(client.prewarm() for client in self._clients.values()))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: client.stats() for name, client in self._clients.items()}
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.close()
+        LOGGER.info("[http] pooled clients closed")
+
+
+http_clients = HttpClientRegistry()
+
+
+__all__ = ["HttpClientRegistry", "PooledClient", "http_clients"]
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator, List, Tuple
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+
+
+class JsonStringFieldExtractor:
+    """Incrementally surface one top-level string field of a streamed JSON object.
+
+    Feed the raw text deltas of a model response; :meth:`feed` returns the
+    newly decoded characters of ``field``'s value as soon as they arrive.
+    Text before the first ``{`` (code fences, chatter) is ignored, escapes
+    (including ``\\uXXXX`` and surrogate pairs) are decoded, and nested
+    objects/arrays are skipped. Only the first occurrence of the field is
+    surfaced; the full payload should still be validated with ``json.loads``.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.value = ""
+        self.done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: str | None = None
+        self._high_surrogate: str | None = None
+        self._expect_key = False
+        self._after_colon = False
+        self._is_key = False
+        self._capturing = False
+        self._key_chars: list[str] = []
+        self._current_key: str | None = None
+
+    def feed(self, text: str) -> str:
+        out: list[str] = []
+        for ch in text:
+            if self._in_string:
+                self._string_char(ch, out)
+            else:
+                self._structural_char(ch)
+        emitted = "".join(out)
+        self.value += emitted
+        return emitted
+
+    def _structural_char(self, ch: str) -> None:
+        if ch == '"':
+            if self._depth == 0:
+                return
+            self._in_string = True
+            self._is_key = self._depth == 1 and self._expect_key
+            self._capturing = (
+                self._depth == 1
+                and self._after_colon
+                and not self.done
+                and self._current_key == self.field
+            )
+            self._key_chars = []
+            self._after_colon = False
+        elif ch in "{[":
+            self._depth += 1
+            if self._depth == 1 and ch == "{":
+                self._expect_key = True
+            self._after_colon = False
+        elif ch in "}]":
+            self._depth = max(self._depth - 1, 0)
+            self._after_colon = False
+        elif ch == ":" and self._depth == 1:
+            self._after_colon = True
+        elif ch == "," and self._depth == 1:
+            self._expect_key = True
+            self._after_colon = False
+        elif not ch.isspace():
+            self._after_colon = False
+
+    def _string_char(self, ch: str, out: list[str]) -> None:
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                self._emit_codepoint(self._unicode, out)
+                self._unicode = None
+            return
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+                return
+            self._emit(_ESCAPES.get(ch, ch), out)
+            return
+        if ch == "\\":
+            self._escape = True
+            return
+        if ch == '"':
+            self._in_string = False
+            if self._is_key:
+                self._current_key = "".join(self._key_chars)
+                self._expect_key = False
+            elif self._capturing:
+                self.done = True
+            self._capturing = False
+            self._is_key = False
+            return
+        self._emit(ch, out)
+
+    def _emit_codepoint(self, hex_digits: str, out: list[str]) -> None:
+        try:
+            code = int(hex_digits, 16)
+        except ValueError:
+            return
+        if 0xD800 <= code <= 0xDBFF:
+            self._high_surrogate = hex_digits
+            return
+        if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+            high = int(self._high_surrogate, 16)
+            self._high_surrogate = None
+            self._emit(chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00)), out)
+            return
+        self._emit(chr(code), out)
+
+    def _emit(self, ch: str, out: list[str]) -> None:
+        if self._is_key:
+            self._key_chars.append(ch)
+        elif self._capturing:
+            out.append(ch)
+
+
+_CLOSERS = {"]": "[", "}": "{"}
+# 截断输出会留下未闭合的字符串 / 括号，使后文的引号奇偶错位；有限次重新同步
+MAX_RESYNC_PASSES = 8
+_AFTER_STRING = frozenset(":,]}")
+
+
+class JsonObjectStream:
+    """Surface each ``{...}`` object of a streamed JSON document once it closes.
+
+    :meth:`feed` returns the objects completed by the new text, innermost
+    first, decoded with ``json.loads``; fragments that do not decode are
+    dropped. Quotes are only tracked inside brackets, so prose before the
+    payload (code fences, chatter) is ignored.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: List[str] = []
+        self._length = 0
+        self._stack: List[Tuple[str, int]] = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        completed: List[Any] = []
+        offset = self._length
+        self._buffer.append(text)
+        self._length += len(text)
+        for index, ch in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == "[" or ch == "{":
+                self._stack.append((ch, offset + index))
+            elif ch == "]" or ch == "}":
+                if not self._stack or self._stack[-1][0] != _CLOSERS[ch]:
+                    self._stack.clear()
+                    continue
+                _, start = self._stack.pop()
+                if ch == "}":
+                    value = self._decode(start, offset + index + 1)
+                    if value is not None:
+                        completed.append(value)
+            elif ch == '"' and self._stack:
+                self._in_string = True
+        if not self._stack:
+            # 没有未闭合的对象时无需保留历史文本
+            self._buffer = []
+            self._length = 0
+        return completed
+
+    def _decode(self, start: int, end: int) -> Any:
+        if len(self._buffer) > 1:
+            self._buffer = ["".join(self._buffer)]
+        try:
+            return json.loads(self._buffer[0][start:end])
+        except ValueError:
+            return None
+
+
+def scan_json_spans(text: str) -> List[Tuple[int, int]]:
+    """Return ``(start, end)`` of every bracket-balanced ``[...]``/``{...}`` span.
+
+    Brackets inside JSON strings (with escapes) are ignored, quotes outside
+    brackets are treated as prose, and a mismatched closer invalidates every
+    span still open around it. A truncated fragment (unclosed string or
+    bracket) flips the string state of everything after it; that shows up as
+    a string followed by something other than ``: , ] }`` or as brackets left
+    open at the end, and the scan then resumes with a clean state right after
+    the offending quote / outermost open bracket. Resumption happens at most
+    ``MAX_RESYNC_PASSES`` times, so the work stays linear in ``len(text)``.
+    Spans are ordered by start offset, so an enclosing span precedes the
+    spans nested in it.
+    """
+
+    spans: set[Tuple[int, int]] = set()
+    start: int | None = 0
+    for _ in range(MAX_RESYNC_PASSES):
+        start = _scan_from(text, start, spans)
+        if start is None:
+            break
+    return sorted(spans)
+
+
+def _scan_from(text: str, start: int, spans: set[Tuple[int, int]]) -> int | None:
+    """One scanning pass; returns where to resume when the pass lost sync."""
+
+    stack: List[Tuple[str, int]] = []
+    in_string = False
+    escape = False
+    string_start = -1
+    closed_string = False
+    for pos in range(start, len(text)):
+        ch = text[pos]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                closed_string = True
+            continue
+        if closed_string and not ch.isspace():
+            closed_string = False
+            if ch not in _AFTER_STRING:
+                return string_start + 1
+        if ch == "[" or ch == "{":
+            stack.append((ch, pos))
+        elif ch == "]" or ch == "}":
+            if stack and stack[-1][0] == _CLOSERS[ch]:
+                spans.add((stack.pop()[1], pos + 1))
+            else:
+                stack.clear()
+        elif ch == '"' and stack:
+            in_string = True
+            string_start = pos
+    if stack:
+        return stack[0][1] + 1
+    return None
+
+
+def iter_json_values(text: str) -> Iterator[Any]:
+    """Decode embedded JSON arrays/objects from free-form text, left to right.
+
+    Only balanced candidates from :func:`scan_json_spans` are handed to the
+    decoder. Once a candidate decodes, the spans nested inside it are
+    skipped; when it does not, its children are tried instead.
+    """
+
+    skip_until = -1
+    for start, end in scan_json_spans(text):
+        if start < skip_until:
+            continue
+        try:
+            value = json.loads(text[start:end])
+        except ValueError:
+            continue
+        skip_until = end
+        yield value
+
+
+__all__ = ["JsonObjectStream", "JsonStringFieldExtractor", "iter_json_values", "scan_json_spans"]
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import json
 import logging
 from collections.abc import AsyncIterator, Iterable
 from typing import Any, Dict, Optional
@@ -10,6 +9,9 @@ except ImportError:  # pragma: no cover
     aiohttp = None  # type: ignore[assignment]
 
 from ..config import settings
+from .http_clients import http_clients
+from .llm_limiter import LLMPriority, LLMQueueFullError, llm_limiter
+from .sse import SSEDecoder, SSEEvent, decode_json_event
 
 LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +27,7 @@ async def chat_stream(
     temperature: float | None = None,
     top_p: float | None = None,
     extra_headers: Optional[Dict[str, str]] = None,
+    priority: LLMPriority = LLMPriority.SETUP,
 ) -> AsyncIterator[str]:
     """Stream chat completion chunks from the Ark OpenAI-compatible endpoint.
 
@@ -40,6 +43,9 @@ async def chat_stream(
         Optional nucleus sampling probability.
     extra_headers:
         Extra HTTP headers to merge into the request.
+    priority:
+        Admission class used by the process-wide limiter; live policy calls
+        are admitted ahead of outline and batch requests.
 
     Yields
     ------
@@ -72,29 +78,38 @@ async def chat_stream(
     url = f"{settings.ark_base_url.rstrip('/')}/chat/completions"
     timeout = aiohttp.ClientTimeout(total=60)
 
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.post(url, headers=headers, json=payload) as response:
-            response.raise_for_status()
-            async for line in response.content:
-                if not line:
-                    continue
-                for chunk in line.decode("utf-8").splitlines():
-                    if not chunk or not chunk.startswith("data:"):
-                        continue
-                    data = chunk.removeprefix("data:").strip()
-                    if data == "[DONE]":
-                        return
-                    try:
-                        parsed = json.loads(data)
-                    except json.JSONDecodeError:
-                        LOGGER.debug("Skipping non-JSON stream fragment: %s", data)
-                        continue
-                    choices = parsed.get("choices") or []
-                    for choice in choices:
-                        delta = choice.get("delta", {})
-                        content = delta.get("content")
-                        if content:
-                            yield content
-
-
-__all__ = ["chat_stream", "LLMNotConfiguredError"]
\ No newline at end of file
+    waited = await llm_limiter.acquire(payload["model"], priority)
+    if waited > 0.05:
+        LOGGER.info("Ark request (%s) queued %.0f ms for admission", priority.name.lower(), waited * 1000)
+
+    session = http_clients.get("ark")
+    async with session.post(url, headers=headers, json=payload, timeout=timeout) as response:
+        response.raise_for_status()
+        decoder = SSEDecoder()
+        async for raw in response.content.iter_any():
+            for event in decoder.feed(raw):
+                if event.data == b"[DONE]":
+                    return
+                for content in _iter_deltas(event):
+                    yield content
+        for event in decoder.close():
+            if event.data == b"[DONE]":
+                return
+            for content in _iter_deltas(event):
+                yield content
+
+
+def _iter_deltas(event: SSEEvent) -> Iterable[str]:
+    parsed_items = decode_json_event(event)
+    if not parsed_items:
+        LOGGER.debug("Skipping non-JSON stream fragment: %r", event.data[:200])
+    for parsed in parsed_items:
+        if not isinstance(parsed, dict):
+            continue
+        for choice in parsed.get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+__all__ = ["chat_stream", "LLMNotConfiguredError", "LLMPriority", "LLMQueueFullError"]
\ No newline at end of file
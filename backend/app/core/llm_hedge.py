@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from typing import Deque, Dict, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+StreamFactory = Callable[[], AsyncIterator[str]]
+
+
+class HedgedStreams:
+    """Send a second identical streaming request when the first is slow to start.
+
+    The hedge delay is the ``percentile`` of recently observed time-to-first-
+    token, measured from the start of the attempt that won (never below
+    ``min_delay``); until ``min_samples`` observations exist
+    ``initial_delay`` is used. Whichever stream yields its first chunk
+    first wins and the other one is cancelled. Hedges are capped at
+    ``max_ratio`` of all requests so the extra spend stays bounded.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 0.9,
+        max_ratio: float = 0.1,
+        min_delay: float = 0.2,
+        initial_delay: float = 1.0,
+        min_samples: int = 20,
+        window: int = 200,
+    ) -> None:
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+
+    def delay(self) -> float:
+        """Seconds to wait for a first token before hedging."""
+
+        if len(self._samples) < self.min_samples:
+            return max(self.min_delay, self.initial_delay)
+        ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[rank])
+
+    def record(self, ttft: float) -> None:
+        self._samples.append(ttft)
+
+    async def stream(self, factory: StreamFactory) -> AsyncIterator[str]:
+        """Yield the chunks of the winning stream created by ``factory``."""
+
+        self.requests += 1
+        primary = _Attempt(factory())
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait({primary.first}, timeout=self.delay())
+            if not done:
+                if self._budget_allows():
+                    self.hedged += 1
+                    attempts.append(_Attempt(factory()))
+                else:
+                    self.over_budget += 1
+            winner, first = await _first_to_start(attempts)
+            if winner is not primary:
+                self.hedge_wins += 1
+            self.record(time.perf_counter() - winner.started)
+            losers = [attempt for attempt in attempts if attempt is not winner]
+            attempts = [winner]
+            await _close_all(losers)
+            if first is None:
+                return
+            yield first
+            async for chunk in winner.stream:
+                yield chunk
+        finally:
+            await _close_all(attempts)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "skipped_over_budget": self.over_budget,
+            "extra_request_ratio": round(self.hedged / self.requests, 3) if self.requests else 0.0,
+            "delay_ms": round(self.delay() * 1000, 1),
+        }
+
+    def _budget_allows(self) -> bool:
+        return self.hedged + 1 <= self.max_ratio * self.requests
+
+
+class _Attempt:
+    """One upstream request and the task waiting for its first chunk."""
+
+    def __init__(self, stream: AsyncIterator[str]) -> None:
+        self.stream = stream
+        self.started = time.perf_counter()
+        self.first: asyncio.Task = asyncio.ensure_future(_first_chunk(stream))
+
+    async def close(self) -> None:
+        try:
+            if not self.first.done():
+                self.first.cancel()
+                try:
+                    await self.first
+                except asyncio.CancelledError:
+                    # 只吞掉本次请求自身的取消；调用方任务被取消时继续向上抛出
+                    current = asyncio.current_task()
+                    if current is not None and current.cancelling():
+                        raise
+                except Exception:
+                    pass
+        finally:
+            aclose = getattr(self.stream, "aclose", None)
+            if aclose is not None:
+                try:
+                    await aclose()
+                except Exception:  # pragma: no cover - best effort cleanup
+                    LOGGER.debug("Closing hedged stream failed", exc_info=True)
+
+
+async def _close_all(attempts: list[_Attempt]) -> None:
+    """Close every attempt; a cancellation of the caller is re-raised once all are closed."""
+
+    cancelled: Optional[asyncio.CancelledError] = None
+    for attempt in attempts:
+        try:
+            await attempt.close()
+        except asyncio.CancelledError as exc:
+            cancelled = cancelled or exc
+    if cancelled is not None:
+        raise cancelled
+
+
+async def _first_chunk(stream: AsyncIterator[str]) -> Optional[str]:
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def _first_to_start(attempts: list[_Attempt]) -> Tuple[_Attempt, Optional[str]]:
+    """Return the first attempt that produced a chunk (or ended cleanly).
+
+    A failing attempt is ignored while another one is still running; if all
+    of them fail the first error is raised.
+    """
+
+    pending = {attempt.first: attempt for attempt in attempts}
+    error: Optional[BaseException] = None
+    while pending:
+        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in sorted(done, key=lambda item: attempts.index(pending[item])):
+            attempt = pending.pop(task)
+            exc = task.exception()
+            if exc is None:
+                return attempt, task.result()
+            error = error or exc
+    assert error is not None
+    raise error
+
+
+__all__ = ["HedgedStreams", "StreamFactory"]
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from ..config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LLMPriority(IntEnum):
+    """Admission classes; lower values are served first."""
+
+    LIVE = 0  # policy decisions on the critical path of an interview turn
+    SETUP = 1  # outline generation for a session being created
+    BATCH = 2  # bulk / offline jobs
+
+
+class LLMQueueFullError(RuntimeError):
+    """Raised when the admission queue of a priority class is full."""
+
+
+class TokenBucket:
+    """Classic token bucket: ``rate`` tokens per second, up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class _ClassStats:
+    __slots__ = ("admitted", "rejected", "queued", "wait_total", "wait_max")
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.rejected = 0
+        self.queued = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_total / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 1),
+        }
+
+
+class _ModelQueue:
+    def __init__(self, bucket: TokenBucket, loop: asyncio.AbstractEventLoop) -> None:
+        self.bucket = bucket
+        self.loop = loop
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self.pump: Optional[asyncio.Task] = None
+
+
+class LLMAdmissionController:
+    """Process-wide admission control for Ark requests.
+
+    Every model id has its own token bucket. A request that cannot take a
+    token immediately waits in a priority queue (bounded per class) and the
+    highest-priority waiter is admitted as soon as the next token is
+    available, so a burst of outline or batch calls cannot delay live
+    policy decisions by more than one token interval.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[str, _ModelQueue] = {}
+        self._stats: Dict[LLMPriority, _ClassStats] = {priority: _ClassStats() for priority in LLMPriority}
+        self._seq = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.llm_rate_per_second > 0
+
+    async def acquire(self, model: str, priority: LLMPriority = LLMPriority.SETUP) -> float:
+        """Wait until a request to ``model`` may be sent; returns the time spent queued."""
+
+        stats = self._stats[priority]
+        if not self.enabled:
+            stats.admitted += 1
+            return 0.0
+        queue = self._queue(model)
+        if not queue.waiters and queue.bucket.try_take() == 0:
+            stats.admitted += 1
+            return 0.0
+        if stats.queued >= settings.llm_queue_size:
+            stats.rejected += 1
+            raise LLMQueueFullError(f"LLM admission queue full for {priority.name.lower()} requests")
+
+        started = time.perf_counter()
+        future: asyncio.Future = queue.loop.create_future()
+        heapq.heappush(queue.waiters, (int(priority), next(self._seq), future))
+        stats.queued += 1
+        if queue.pump is None or queue.pump.done():
+            queue.pump = asyncio.create_task(self._pump(queue))
+        try:
+            await future
+        finally:
+            stats.queued -= 1
+            if not future.done():
+                future.cancel()
+        waited = time.perf_counter() - started
+        stats.admitted += 1
+        stats.wait_total += waited
+        stats.wait_max = max(stats.wait_max, waited)
+        return waited
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {priority.name.lower(): self._stats[priority].snapshot() for priority in LLMPriority}
+
+    def _queue(self, model: str) -> _ModelQueue:
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(model)
+        if queue is None or queue.loop is not loop:
+            bucket = TokenBucket(settings.llm_rate_per_second, settings.llm_burst)
+            queue = self._queues[model] = _ModelQueue(bucket, loop)
+        return queue
+
+    async def _pump(self, queue: _ModelQueue) -> None:
+        while queue.waiters:
+            if queue.waiters[0][2].done():
+                # 等待方已取消
+                heapq.heappop(queue.waiters)
+                continue
+            wait = queue.bucket.try_take()
+            if wait > 0:
+                # 睡眠期间到达的更高优先级请求会排到队首
+                await asyncio.sleep(wait)
+                continue
+            _, _, future = heapq.heappop(queue.waiters)
+            if future.done():
+                queue.bucket.tokens += 1  # 已取消的等待方不消耗令牌
+                continue
+            future.set_result(None)
+
+
+llm_limiter = LLMAdmissionController()
+
+
+__all__ = ["LLMAdmissionController", "LLMPriority", "LLMQueueFullError", "TokenBucket", "llm_limiter"]
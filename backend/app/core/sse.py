@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+try:  # pragma: no cover - optional fast JSON backend
+    import orjson
+
+    def json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    JSONDecodeError: tuple[type[Exception], ...] = (orjson.JSONDecodeError, ValueError)
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover
+    def json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    JSONDecodeError = (json.JSONDecodeError, ValueError)
+    JSON_BACKEND = "json"
+
+
+@dataclass
+class SSEEvent:
+    data: bytes
+    event: Optional[str] = None
+    id: Optional[str] = None
+
+
+class SSEDecoder:
+    """Incremental Server-Sent Events decoder working on raw bytes.
+
+    Bytes can be fed in arbitrary slices (events and even ``\\r\\n`` pairs may
+    be split across reads). Multi-line ``data:`` fields are joined with
+    ``\\n``; comment lines (keep-alives) and ``retry`` fields are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._data: List[bytes] = []
+        self._event: Optional[str] = None
+        self._id: Optional[str] = None
+        self.comments = 0
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        buf = self._buffer + chunk if self._buffer else chunk
+        # 末尾的 \r 可能与下一块的 \n 组成一个换行，先保留
+        search_end = len(buf) - 1 if buf.endswith(b"\r") else len(buf)
+        cut = max(buf.rfind(b"\n", 0, search_end), buf.rfind(b"\r", 0, search_end))
+        if cut == -1:
+            self._buffer = buf
+            return []
+        self._buffer = buf[cut + 1 :]
+        events: List[SSEEvent] = []
+        for line in buf[: cut + 1].splitlines():
+            if not line:
+                if self._data:
+                    events.append(self._dispatch())
+                else:
+                    self._event = None
+                continue
+            self._handle_line(line)
+        return events
+
+    def close(self) -> List[SSEEvent]:
+        """Flush a trailing line/event left without a terminating blank line."""
+
+        if self._buffer:
+            self._handle_line(self._buffer.rstrip(b"\r"))
+            self._buffer = b""
+        if self._data:
+            return [self._dispatch()]
+        return []
+
+    def _handle_line(self, line: bytes) -> None:
+        if line[:1] == b":":
+            self.comments += 1
+            return
+        colon = line.find(b":")
+        if colon == -1:
+            field, value = line, b""
+        else:
+            field, value = line[:colon], line[colon + 1 :]
+            if value[:1] == b" ":
+                value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value.decode("utf-8", "replace")
+        elif field == b"id":
+            self._id = value.decode("utf-8", "replace")
+
+    def _dispatch(self) -> SSEEvent:
+        data = self._data[0] if len(self._data) == 1 else b"\n".join(self._data)
+        event = SSEEvent(data=data, event=self._event, id=self._id)
+        self._data = []
+        self._event = None
+        return event
+
+
+def decode_json_event(event: SSEEvent, loads: Callable[[bytes], Any] = json_loads) -> List[Any]:
+    """Decode an event's JSON payload.
+
+    Some upstreams omit the blank line between events, which makes several
+    ``data:`` lines collapse into one event; in that case each line is
+    decoded on its own. Undecodable fragments are dropped.
+    """
+
+    try:
+        return [loads(event.data)]
+    except JSONDecodeError:
+        if b"\n" not in event.data:
+            return []
+    parsed: List[Any] = []
+    for line in event.data.split(b"\n"):
+        try:
+            parsed.append(loads(line))
+        except JSONDecodeError:
+            continue
+    return parsed
+
+
+__all__ = ["JSON_BACKEND", "SSEDecoder", "SSEEvent", "decode_json_event", "json_loads"]
@@ -3,13 +3,16 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import contextlib
 import json
 import logging
 import os
-from typing import Optional
+import time
+from typing import AsyncIterator, Dict, Optional
 
 import aiohttp
 
+from .http_clients import http_clients
 from .ws_tts_manager import manager as ws_manager
 
 from typing import Tuple
@@ -79,28 +82,28 @@ async def synth_once(text: str) -> bytes:
     }
 
     chunks: list[bytes] = []
-    async with aiohttp.ClientSession() as session:
-        async with session.post(VOLC_TTS_URL, json=payload, headers=headers) as resp:
-            if resp.status != 200:
-                body = await resp.text()
-                raise RuntimeError(f"TTS HTTP {resp.status}: {body[:300]}")
-
-            # 有些版本返回多行 JSON
-            raw = await resp.text()
-            for line in raw.splitlines():
-                line = line.strip()
-                if not line:
-                    continue
+    session = http_clients.get("tts")
+    async with session.post(VOLC_TTS_URL, json=payload, headers=headers) as resp:
+        if resp.status != 200:
+            body = await resp.text()
+            raise RuntimeError(f"TTS HTTP {resp.status}: {body[:300]}")
+
+        # 有些版本返回多行 JSON
+        raw = await resp.text()
+        for line in raw.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            data_field = _extract_audio_field(obj)
+            if data_field:
                 try:
-                    obj = json.loads(line)
-                except Exception:
-                    continue
-                data_field = _extract_audio_field(obj)
-                if data_field:
-                    try:
-                        chunks.append(base64.b64decode(data_field))
-                    except Exception as e:
-                        LOGGER.warning(f"[tts] Base64 decode failed: {e}")
+                    chunks.append(base64.b64decode(data_field))
+                except Exception as e:
+                    LOGGER.warning(f"[tts] Base64 decode failed: {e}")
 
     if not chunks:
         raise RuntimeError("TTS 返回内容为空")
@@ -123,17 +126,173 @@ def _extract_audio_field(obj: dict) -> Optional[str]:
     return None
 
 
+# ==============================
+# 🔹 按句流式输入（LLM 边生成边播报）
+# ==============================
+SENTENCE_END = "。！？!?；;\n"
+
+
+class SentenceStream:
+    """把流式生成的文本按句切分，供 TTS 逐句合成"""
+
+    def __init__(self, min_chars: int = 4) -> None:
+        self.min_chars = min_chars
+        self.text = ""
+        self.closed = False
+        self.created_at = time.perf_counter()
+        self._pending = ""
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    @classmethod
+    def from_text(cls, text: str) -> "SentenceStream":
+        stream = cls()
+        stream.feed(text)
+        stream.close()
+        return stream
+
+    def feed(self, piece: str) -> None:
+        if self.closed or not piece:
+            return
+        self.text += piece
+        self._pending += piece
+        cut = -1
+        for idx, ch in enumerate(self._pending):
+            if ch in SENTENCE_END and idx + 1 >= self.min_chars:
+                cut = idx
+        if cut >= 0:
+            sentence, self._pending = self._pending[: cut + 1], self._pending[cut + 1 :]
+            if sentence.strip():
+                self._queue.put_nowait(sentence.strip())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        if self._pending.strip():
+            self._queue.put_nowait(self._pending.strip())
+        self._pending = ""
+        self.closed = True
+        self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while True:
+            sentence = await self._queue.get()
+            if sentence is None:
+                return
+            yield sentence
+
+
+def text_segments(text: str) -> list[str]:
+    """``stream_and_broadcast`` 对完整文本实际合成的分段（与 SentenceStream.from_text 一致）"""
+    stream = SentenceStream.from_text(text)
+    segments: list[str] = []
+    while (segment := stream._queue.get_nowait()) is not None:
+        segments.append(segment)
+    return segments
+
+
+# ==============================
+# 🔹 预合成：采访人说话期间提前合成候选问题的音频
+# ==============================
+class AudioPrefetcher:
+    """按会话缓存候选问题的预合成音频（以分段文本为键）"""
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, Dict[str, asyncio.Task]] = {}
+        self.prefetched = 0
+        self.hits = 0
+        self.wasted = 0
+
+    def prefetch(self, session_id: str, text: str) -> int:
+        """后台合成 ``text`` 的各分段，返回新发起的合成数"""
+        if not VOLC_TTS_KEY:
+            return 0
+        tasks = self._tasks.setdefault(session_id, {})
+        started = 0
+        for segment in text_segments(text):
+            if segment not in tasks:
+                tasks[segment] = asyncio.create_task(_synth_with_retry(segment))
+                started += 1
+        self.prefetched += started
+        return started
+
+    def take(self, session_id: str, segment: str) -> Optional[asyncio.Task]:
+        return self._tasks.get(session_id, {}).pop(segment, None)
+
+    def retain(self, session_id: str, texts: list[str]) -> None:
+        """只保留 ``texts`` 用得到的预合成，其余取消"""
+        keep = {segment for text in texts for segment in text_segments(text)}
+        tasks = self._tasks.get(session_id, {})
+        for segment in [s for s in tasks if s not in keep]:
+            self.wasted += 1
+            tasks.pop(segment).cancel()
+
+    def clear(self, session_id: str) -> None:
+        """会话结束：丢弃全部未用上的预合成"""
+        for task in self._tasks.pop(session_id, {}).values():
+            self.wasted += 1
+            task.cancel()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "prefetched": self.prefetched,
+            "hits": self.hits,
+            "wasted": self.wasted,
+            "hit_rate": round(self.hits / self.prefetched, 3) if self.prefetched else 0.0,
+        }
+
+
+audio_prefetcher = AudioPrefetcher()
+
+
+async def _synth_segment(session_id: str, segment: str) -> bytes:
+    task = audio_prefetcher.take(session_id, segment)
+    if task is not None:
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if not task.cancelled() and task.exception() is None and task.result():
+            audio_prefetcher.hits += 1
+            LOGGER.info(f"[tts] ♻️ prefetched audio used sid={session_id}, bytes={len(task.result())}")
+            return task.result()
+        LOGGER.warning(f"[tts] prefetched synth unusable, synthesizing inline sid={session_id}")
+    return await _synth_with_retry(segment)
+
+
+async def _synth_with_retry(text: str) -> bytes:
+    audio: bytes | None = None
+    # 生成音频（1 次重试）
+    for attempt in range(2):
+        try:
+            audio = await synth_once(text)
+            if audio:
+                break
+        except Exception as e:
+            LOGGER.warning(f"[tts] synth attempt {attempt+1} failed: {e}")
+            await asyncio.sleep(0.5)
+    if not audio:
+        raise RuntimeError("TTS 合成失败：返回音频为空")
+    return audio
+
+
 # ==============================
 # 🔹 主逻辑：TTS 生成并广播
 # ==============================
-async def stream_and_broadcast(session_id: str, text: str) -> None:
-    """合成并推流音频到 WebSocket 客户端（严格二进制帧 + 正确 MIME + 总发 tts_end）"""
+async def stream_and_broadcast(session_id: str, text: str | SentenceStream) -> None:
+    """合成并推流音频到 WebSocket 客户端（严格二进制帧 + 正确 MIME + 总发 tts_end）
+
+    ``text`` 也可以是 :class:`SentenceStream`：每凑齐一句就合成并推送，
+    首包音频不必等整段文本生成完毕。
+    """
     task = asyncio.current_task()
     token = ws_manager.start_stream(session_id, task)
-    LOGGER.info(f"[tts] 🚀 start TTS stream sid={session_id}, len={len(text)}")
+    segments = text if isinstance(text, SentenceStream) else SentenceStream.from_text(text)
+    LOGGER.info(f"[tts] 🚀 start TTS stream sid={session_id}, len={len(segments.text)}")
 
-    audio: bytes | None = None
     sent_end = False
+    ready_sent = False
+    total = 0
 
     try:
         # 等前端 ready（超时也继续，避免卡死）
@@ -143,39 +302,48 @@ async def stream_and_broadcast(session_id: str, text: str) -> None:
         except asyncio.TimeoutError:
             LOGGER.warning(f"[tts] ⚠️ websocket not ready after {WS_READY_TIMEOUT}s, continue sid={session_id}")
 
-        # 生成音频（1 次重试）
-        for attempt in range(2):
-            try:
-                audio = await synth_once(text)
-                if audio:
-                    break
-            except Exception as e:
-                LOGGER.warning(f"[tts] synth attempt {attempt+1} failed: {e}")
-                await asyncio.sleep(0.5)
-        if not audio:
-            raise RuntimeError("TTS 合成失败：返回音频为空")
+        cancelled = False
+        async for sentence in segments:
+            audio = await _synth_segment(session_id, sentence)
+
+            if not ready_sent:
+                # ⭕️ 嗅探容器类型，给前端一个“真实可解码”的 MIME
+                mime = _sniff_audio_mime(audio)
+                await ws_manager.send_tts_ready(session_id, mime=mime)
+                ready_sent = True
+                ttfa_ms = (time.perf_counter() - segments.created_at) * 1000
+                LOGGER.info(f"[tts] ▶️ ready sent with mime={mime}, bytes={len(audio)}, first audio after {ttfa_ms:.0f}ms")
 
-        # ⭕️ 嗅探容器类型，给前端一个“真实可解码”的 MIME
-        mime = _sniff_audio_mime(audio)
-        await ws_manager.send_tts_ready(session_id, mime=mime)
-        LOGGER.info(f"[tts] ▶️ ready sent with mime={mime}, bytes={len(audio)}")
-
-        # ⭕️ 用“二进制帧”分块发送
-        #    （确保 WebSocketManager 实现里用的是 ws.send_bytes(chunk)，而不是 send_text/base64）
-        total = len(audio)
-        chunk_size = CHUNK_SIZE
-        for i in range(0, total, chunk_size):
-            if token.is_cancelled() or ws_manager.is_cancelled(session_id):
-                LOGGER.info(f"[tts] 🔴 cancelled sid={session_id}")
+            # ⭕️ 用“二进制帧”分块发送
+            #    （确保 WebSocketManager 实现里用的是 ws.send_bytes(chunk)，而不是 send_text/base64）
+            chunk_size = CHUNK_SIZE
+            for i in range(0, len(audio), chunk_size):
+                if token.is_cancelled() or ws_manager.is_cancelled(session_id):
+                    LOGGER.info(f"[tts] 🔴 cancelled sid={session_id}")
+                    cancelled = True
+                    break
+                await ws_manager.send_audio_chunk(session_id, audio[i:i + chunk_size])
+                await asyncio.sleep(0.010)  # 平滑一点
+            total += len(audio)
+            if cancelled:
                 break
-            await ws_manager.send_audio_chunk(session_id, audio[i:i + chunk_size])
-            await asyncio.sleep(0.010)  # 平滑一点
+
+        if not ready_sent and not cancelled:
+            raise RuntimeError("TTS 合成失败：返回音频为空")
 
         # ✅ 正常完成，发 tts_end
         await ws_manager.send_tts_end(session_id)
         sent_end = True
         peers = len(ws_manager.active_peers.get(session_id, []))
-        LOGGER.info(f"[tts] ✅ broadcast done sid={session_id}, peers={peers}")
+        LOGGER.info(f"[tts] ✅ broadcast done sid={session_id}, bytes={total}, peers={peers}")
+
+    except asyncio.CancelledError:
+        # 🔴 被打断（barge-in）：通知前端停止播放后再向上抛出
+        LOGGER.info(f"[tts] 🔴 stream cancelled sid={session_id}")
+        if not sent_end:
+            with contextlib.suppress(Exception):
+                await ws_manager.send_tts_end(session_id)
+        raise
 
     except Exception as e:
         msg = str(e)
@@ -183,7 +351,7 @@ async def stream_and_broadcast(session_id: str, text: str) -> None:
         # 出错也通知前端（fallback 文本 + 模式切换）
         try:
             await ws_manager.send_tts_error(session_id, msg)
-            await ws_manager.send_tts_fallback(session_id, text, msg)
+            await ws_manager.send_tts_fallback(session_id, segments.text, msg)
         finally:
             # ⭕️ 确保前端能 finalize
             if not sent_end:
@@ -2,7 +2,8 @@
 from __future__ import annotations
 import asyncio
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 from fastapi import WebSocket
 
 
@@ -14,10 +15,12 @@ class TTSStreamToken:
     def __init__(self, task: asyncio.Task):
         self.task = task
         self._cancelled = False
+        self.cancelled_at: Optional[float] = None
 
     def cancel(self):
         if not self._cancelled:
             self._cancelled = True
+            self.cancelled_at = time.perf_counter()
             if not self.task.done():
                 self.task.cancel()
 
@@ -30,6 +33,7 @@ class TTSManager:
         self.active_peers: Dict[str, List[WebSocket]] = {}
         self.ready_events: Dict[str, asyncio.Event] = {}
         self.stream_tasks: Dict[str, asyncio.Task] = {}
+        self.stream_tokens: Dict[str, TTSStreamToken] = {}
 
     # ------------------------------
     # 注册 & 注销
@@ -142,8 +146,21 @@ class TTSManager:
     def start_stream(self, sid: str, task: asyncio.Task) -> TTSStreamToken:
         """注册 TTS 推流任务"""
         LOGGER.debug(f"[TTS] ▶️ start_stream sid={sid}")
+        previous = self.stream_tokens.get(sid)
+        if previous is not None and previous.task is not task:
+            previous.cancel()
         token = TTSStreamToken(task)
         self.stream_tasks[sid] = task
+        self.stream_tokens[sid] = token
+        return token
+
+    def cancel_stream(self, sid: str) -> Optional[TTSStreamToken]:
+        """打断当前推流（barge-in），返回被取消的 token"""
+        token = self.stream_tokens.get(sid)
+        if token is None or token.task.done():
+            return None
+        token.cancel()
+        LOGGER.info(f"[TTS] ⛔ cancel_stream sid={sid}")
         return token
 
     def is_cancelled(self, sid: str) -> bool:
@@ -155,6 +172,7 @@ class TTSManager:
         existing = self.stream_tasks.get(sid)
         if existing == task:
             self.stream_tasks.pop(sid, None)
+            self.stream_tokens.pop(sid, None)
             LOGGER.info(f"[TTS] 🏁 finish_stream sid={sid}")
 
 
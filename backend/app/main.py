@@ -1,11 +1,24 @@
 from __future__ import annotations
 import logging
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
+from .core import tts_client
+from .core.http_clients import http_clients
+from .core.llm_limiter import llm_limiter
 from .database import init_models, shutdown
 from .routers import demo_tts, http_api, ws_agent, ws_asr, ws_tts
+from .services.agent import agent_orchestrator
+from .services.branches import branch_stats
+from .services.extraction import extraction_stats
+from .services.outline import outline_builder
+from .services.policy import policy_hedger
+from .services.policy_gate import policy_gate
+from .services.policy_memo import policy_memo
+from .services.prompt_context import prompt_stats
+from .services.speculation import speculation_stats
 from .utils.ws_manager import WebSocketManager
 
 # ===========================================================
@@ -66,12 +79,27 @@ async def on_startup() -> None:
         logging.info("[startup] 🧩 Created new WebSocketManager")
     else:
         logging.info("[startup] ✅ Using existing WebSocketManager")
+    # 🌐 进程级共享连接池：Ark / TTS / ASR 复用 DNS、TCP、TLS
+    http_clients.register("ark", prewarm_url=settings.ark_base_url)
+    http_clients.register("tts", prewarm_url=tts_client.VOLC_TTS_URL)
+    # ASR 的 websocket 在整场访谈中占用一个连接，不能受连接数上限约束，否则第 21 路会阻塞在握手
+    http_clients.register(
+        "asr",
+        prewarm_url=os.getenv("VOLS_WS_URL", "wss://openspeech.bytedance.com/api/v2/asr"),
+        limit=0,
+        limit_per_host=0,
+    )
+    await http_clients.start(prewarm=settings.http_prewarm)
+    # 🧭 载入历史主题，近似主题可直接复用提纲
+    topics = await outline_builder.warm_index()
+    logging.info("[startup] 🧭 Outline topic index loaded: %d topics", topics)
     logging.info("[startup] ✅ Database initialized, app ready")
 
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     """关闭事件：释放连接资源"""
+    await http_clients.close()
     await shutdown()
     logging.info("[shutdown] 🛑 FastAPI shutdown complete")
 
@@ -86,4 +114,17 @@ async def health_check():
     return {
         "status": "ok",
         "active_sessions": mgr.active_sessions(),
+        "tts": mgr.tts_stats(),
+        "speculation": speculation_stats.snapshot(),
+        "http_pools": http_clients.stats(),
+        "outline_cache": outline_builder.stats(),
+        "policy_breaker": agent_orchestrator.policy_breaker.snapshot(),
+        "llm_admission": llm_limiter.stats(),
+        "policy_hedge": policy_hedger.stats(),
+        "policy_prompt": prompt_stats.snapshot(),
+        "policy_memo": policy_memo.stats(),
+        "hybrid_policy": policy_gate.snapshot(),
+        "branches": branch_stats.snapshot(),
+        "extraction": extraction_stats.snapshot(),
+        "tts_prefetch": tts_client.audio_prefetcher.stats(),
     }
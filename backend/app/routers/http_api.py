@@ -1,20 +1,51 @@
 from __future__ import annotations
 
 import io
-from typing import List
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
 from ..database import get_session
 from ..models import Note, Session, Turn
-from ..schemas import ExportRequest, PlanResponse, SessionCreate, SessionCreateResponse, SessionSchema
+from ..schemas import (
+    ExportRequest,
+    PlanBatchRequest,
+    PlanResponse,
+    PlanSection,
+    SessionCreate,
+    SessionCreateResponse,
+    SessionOutlineResponse,
+    SessionSchema,
+)
+from ..services.agent import agent_orchestrator
 from ..services.outline import outline_builder
 
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _ndjson(event: Dict[str, Any]) -> bytes:
+    return (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+async def _outline_events(topic: str) -> AsyncIterator[bytes]:
+    """``section`` lines as the outline is generated, then the final ``outline``."""
+
+    index = 0
+    async for item in outline_builder.stream(topic):
+        if isinstance(item, PlanSection):
+            yield _ndjson({"type": "section", "index": index, "section": item.model_dump()})
+            index += 1
+        else:
+            yield _ndjson({"type": "outline", "outline": item.model_dump()})
+
 
 @router.post("/sessions", response_model=SessionCreateResponse)
 async def create_session(payload: SessionCreate, db: AsyncSession = Depends(get_session)) -> SessionCreateResponse:
@@ -22,8 +53,27 @@ async def create_session(payload: SessionCreate, db: AsyncSession = Depends(get_
     db.add(session)
     await db.commit()
     await db.refresh(session)
-    outline = await outline_builder.build(payload.topic)
-    return SessionCreateResponse(session=session, outline=outline)
+    # 不在请求内等待 LLM：先返回缓存或默认提纲，生成完成后经 /ws/agent 推送（也可轮询）
+    job = await agent_orchestrator.start_outline(str(session.id), payload.topic)
+    return SessionCreateResponse(session=session, outline=job.outline, outline_status=job.status)
+
+
+@router.post("/sessions/stream")
+async def create_session_stream(payload: SessionCreate, db: AsyncSession = Depends(get_session)) -> StreamingResponse:
+    """Like ``POST /sessions`` but streams the outline as NDJSON after a ``session`` line."""
+
+    session = Session(topic=payload.topic, interviewer=payload.interviewer, interviewee=payload.interviewee)
+    db.add(session)
+    await db.commit()
+    await db.refresh(session)
+    session_payload = SessionSchema.model_validate(session).model_dump(mode="json")
+
+    async def events() -> AsyncIterator[bytes]:
+        yield _ndjson({"type": "session", "session": session_payload})
+        async for line in _outline_events(payload.topic):
+            yield line
+
+    return StreamingResponse(events(), media_type=NDJSON_MEDIA_TYPE)
 
 
 @router.get("/sessions", response_model=List[SessionSchema])
@@ -40,11 +90,70 @@ async def get_session_detail(session_id: int, db: AsyncSession = Depends(get_ses
     return session
 
 
+@router.get("/sessions/{session_id}/outline", response_model=SessionOutlineResponse)
+async def get_session_outline(session_id: int) -> SessionOutlineResponse:
+    job = agent_orchestrator.outline_job(str(session_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Outline not found")
+    return SessionOutlineResponse(session_id=session_id, status=job.status, outline=job.outline)
+
+
 @router.post("/plan", response_model=PlanResponse)
 async def generate_plan(payload: SessionCreate) -> PlanResponse:
     return await outline_builder.build(payload.topic)
 
 
+@router.post("/plan/stream")
+async def generate_plan_stream(payload: SessionCreate) -> StreamingResponse:
+    """Stream outline sections as NDJSON while the LLM is still generating."""
+
+    return StreamingResponse(_outline_events(payload.topic), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post("/plan/batch")
+async def generate_plan_batch(payload: PlanBatchRequest) -> StreamingResponse:
+    """Generate many outlines with bounded concurrency, streaming NDJSON results as they complete."""
+
+    async def events() -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        fallbacks = 0
+        async for index, outline, error in outline_builder.build_many(
+            payload.topics, settings.outline_batch_concurrency
+        ):
+            event: Dict[str, Any] = {
+                "type": "result",
+                "index": index,
+                "topic": payload.topics[index],
+                "status": "ok" if error is None else "fallback",
+                "outline": outline.model_dump(),
+            }
+            if error is not None:
+                fallbacks += 1
+                event["error"] = str(error)
+            yield _ndjson(event)
+        yield _ndjson({
+            "type": "done",
+            "total": len(payload.topics),
+            "fallbacks": fallbacks,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        })
+
+    return StreamingResponse(events(), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/plan/cache")
+async def outline_cache_stats() -> dict:
+    return outline_builder.stats()
+
+
+@router.delete("/plan/cache")
+async def invalidate_outline_cache(topic: Optional[str] = None) -> dict:
+    """Drop the cached outline for ``topic`` (or the whole cache when omitted)."""
+
+    removed = await outline_builder.invalidate(topic)
+    return {"topic": topic, "removed": removed}
+
+
 @router.post("/export")
 async def export_summary(payload: ExportRequest, db: AsyncSession = Depends(get_session)) -> StreamingResponse:
     session = await db.get(Session, payload.session_id)
@@ -4,9 +4,12 @@ import asyncio, contextlib, json, logging
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
+from ..config import settings
+from ..core.tts_client import SentenceStream, audio_prefetcher
 from ..utils.ws_manager import WebSocketManager
-from ..services.agent import agent_orchestrator
-from ..core.ws_tts_manager import manager as tts_manager
+from ..services.agent import AgentDecision, agent_orchestrator
+from ..services.speculation import PartialSpeculator
+from ..services.turn_debouncer import TurnDebouncer
 
 LOGGER = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,6 +25,83 @@ async def websocket_agent(websocket: WebSocket):
 
     ws_manager: WebSocketManager = getattr(websocket.app.state, "ws_manager", manager)
 
+    speculator: PartialSpeculator | None = None
+    if settings.speculative_policy_enabled and settings.llm_credentials_ready:
+        speculator = PartialSpeculator(
+            lambda text: agent_orchestrator.speculate(session_id, text),
+            stable_for=settings.speculative_stable_ms / 1000,
+            threshold=settings.speculative_match_threshold,
+            max_waste_ratio=settings.speculative_max_waste_ratio,
+        )
+
+    async def decide_turn(text: str) -> tuple[AgentDecision, SentenceStream | None]:
+        # 由 Orchestrator 决策下一问（合并后的整轮回答；命中则复用基于 partial 的预判）
+        speculation = speculator.take(text) if speculator else None
+        # 策略模型流式吐出 question 时逐句送进 TTS，首包音频跟随首 token
+        question_stream = SentenceStream()
+        started = False
+
+        def on_question(piece: str) -> None:
+            nonlocal started
+            if not started:
+                started = True
+                ws_manager.dispatch_tts(session_id, question_stream)
+            question_stream.feed(piece)
+
+        try:
+            decision = await agent_orchestrator.handle_user_turn(
+                session_id, text, speculation=speculation, on_question=on_question
+            )
+        except BaseException:
+            if started:
+                question_stream.close()
+                asyncio.create_task(ws_manager.cancel_tts(session_id))
+            raise
+        return decision, question_stream if started else None
+
+    def prefetch_branches(current: str) -> None:
+        # 🔮 当前问题播报期间：推演本地策略可直接作答的下一问并预合成音频
+        branches = agent_orchestrator.precompute_branches(session_id)
+        questions = [branch.decision.question for branch in branches]
+        audio_prefetcher.retain(session_id, [current, *questions])
+        for question in questions:
+            audio_prefetcher.prefetch(session_id, question)
+
+    async def deliver_turn(result: tuple[AgentDecision, SentenceStream | None]) -> None:
+        nonlocal barged_in
+        decision, question_stream = result
+        # 新一问开始播报：受访者下一次开口需要再次打断
+        barged_in = False
+        next_question = decision.question.strip()
+        await ws_manager.send_json(session_id, {
+            "type": "agent_reply",
+            "text": next_question,
+            "stage": decision.stage.value,
+        })
+        if decision.changed_notes:
+            await ws_manager.send_json(session_id, {
+                "type": "notes_delta",
+                "version": decision.notes_version,
+                "notes": decision.changed_notes,
+            })
+        if question_stream is not None:
+            question_stream.close()
+        if question_stream is not None and question_stream.text.strip() == next_question:
+            LOGGER.info(f"[agent] 🔊 streamed follow-up to TTS sid={session_id}")
+        else:
+            # 流式文本与最终问题不一致（如超时或 JSON 校验失败回退规则策略）：改播最终问题
+            ws_manager.dispatch_tts(session_id, next_question)
+            LOGGER.info(f"[agent] 🔊 dispatched follow-up to TTS sid={session_id} branch={decision.branch}")
+        prefetch_branches(next_question)
+        if decision.budget is not None:
+            decision.budget.mark("tts_dispatch")
+            LOGGER.info(f"[agent] ⏱️ turn budget sid={session_id}: {decision.budget.summary()}")
+
+    debouncer = TurnDebouncer(settings.turn_debounce_ms / 1000, decide_turn, deliver_turn)
+    outline_push: asyncio.Task | None = None
+    # 本段话是否已触发过打断（speech_start 或首个 partial），收到 final 或下发新问题后复位
+    barged_in = False
+
     try:
         # ✅ 接入管理器
         await ws_manager.connect(session_id, websocket)
@@ -29,6 +109,19 @@ async def websocket_agent(websocket: WebSocket):
 
         # ✅ Step 1: 初始化采访状态机与首轮问题
         machine = await agent_orchestrator.ensure_session(session_id, topic)
+        outline_job = agent_orchestrator.outline_job(session_id)
+        if outline_job is not None:
+            # 提纲在后台生成：就绪后推送给前端（状态机已自动替换，无需重启会话）
+            async def push_outline() -> None:
+                outline = await outline_job.wait()
+                await ws_manager.send_json(session_id, {
+                    "type": "outline",
+                    "status": outline_job.status,
+                    "payload": outline.model_dump(),
+                })
+                LOGGER.info(f"[agent] 🗂️ outline pushed sid={session_id}")
+
+            outline_push = asyncio.create_task(push_outline())
         decision = await agent_orchestrator.bootstrap_decision(session_id)
         first_question = decision.question.strip()
         LOGGER.info(f"[agent] 🎬 first question sid={session_id}: {first_question[:80]}...")
@@ -40,10 +133,10 @@ async def websocket_agent(websocket: WebSocket):
             "stage": decision.stage.value,
         })
 
-        # ✅ Step 3: 调用火山引擎 TTS 播报采访人开场白
-        await tts_manager.wait_until_ready(session_id)
-        await ws_manager.send_to_tts(session_id, first_question)
-        LOGGER.info(f"[agent] 🔊 sent first question to TTS sid={session_id}")
+        # ✅ Step 3: 调用火山引擎 TTS 播报采访人开场白（后台任务，不阻塞主循环）
+        ws_manager.dispatch_tts(session_id, first_question)
+        LOGGER.info(f"[agent] 🔊 dispatched first question to TTS sid={session_id}")
+        prefetch_branches(first_question)
 
         # 主循环：等受访者发 query
         while True:
@@ -71,25 +164,50 @@ async def websocket_agent(websocket: WebSocket):
             msg_type = data.get("type")
             LOGGER.info(f"[agent] 📩 recv {msg_type} sid={session_id}")
 
-            if msg_type == "query":
+            if msg_type == "speech_start":
+                # 🎙️ 受访者开口：立即打断正在播报的问题，并暂缓尚未提交的一轮
+                barged_in = True
+                await ws_manager.cancel_tts(session_id)
+                debouncer.touch()
+
+            elif msg_type == "partial":
+                # ASR 中间结果：本段话的首个 partial 即打断播报（客户端未发 speech_start 时兜底）
+                if not barged_in:
+                    barged_in = True
+                    await ws_manager.cancel_tts(session_id)
+                # 增量抽取笔记，稳定一段时间后预先发起策略决策
+                debouncer.touch()
+                transcript = agent_orchestrator.observe_partial(session_id, data.get("text", ""))
+                if speculator:
+                    # 以合并后的整轮文本预判，与去抖后提交的文本一致
+                    speculator.on_partial(transcript)
+
+            elif msg_type == "query":
                 query_text = data.get("text", "").strip()
                 if not query_text:
                     continue
+                await ws_manager.cancel_tts(session_id)
+                barged_in = False
                 await ws_manager.send_json(session_id, {"type": "agent_ack", "text": query_text})
-
-                # 由 Orchestrator 决策下一问
-                decision = await agent_orchestrator.handle_user_turn(session_id, query_text)
-                next_question = decision.question.strip()
-
+                # 停顿产生的多段 final 在窗口内合并为一轮
+                agent_orchestrator.observe_final(session_id, query_text)
+                debouncer.submit(query_text)
+
+            elif msg_type == "notes_resync":
+                # 客户端发现版本缺口：补发 since 之后变化的笔记（since<=0 为全量）
+                since = data.get("since")
+                version, notes = agent_orchestrator.notes_since(
+                    session_id, since if isinstance(since, int) else 0
+                )
                 await ws_manager.send_json(session_id, {
-                    "type": "agent_reply",
-                    "text": next_question,
-                    "stage": decision.stage.value,
+                    "type": "notes_snapshot",
+                    "version": version,
+                    "since": since if isinstance(since, int) else 0,
+                    "notes": notes,
                 })
-                await ws_manager.send_to_tts(session_id, next_question)
-                LOGGER.info(f"[agent] 🔊 sent follow-up to TTS sid={session_id}")
 
             elif msg_type == "stop":
+                await ws_manager.cancel_tts(session_id)
                 await ws_manager.send_json(session_id, {"type": "agent_stopped"})
                 break
 
@@ -102,6 +220,17 @@ async def websocket_agent(websocket: WebSocket):
             await websocket.close()
 
     finally:
+        with contextlib.suppress(Exception):
+            await debouncer.close()
+        if speculator:
+            speculator.close()
+        if outline_push is not None:
+            outline_push.cancel()
+        audio_prefetcher.clear(session_id)
+        agent_orchestrator.release_session(session_id)
+        LOGGER.info(f"[agent] 📊 turn stats sid={session_id}: {debouncer.stats}")
+        with contextlib.suppress(Exception):
+            await ws_manager.cancel_tts(session_id)
         await ws_manager.disconnect(session_id)
         if websocket.client_state != WebSocketState.DISCONNECTED:
             with contextlib.suppress(Exception):
@@ -6,6 +6,7 @@ import aiohttp
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
+from ..core.http_clients import http_clients
 from ..utils.ws_manager import WebSocketManager
 
 LOGGER = logging.getLogger(__name__)
@@ -146,86 +147,86 @@ async def _relay_to_volc(session_id: str, websocket: WebSocket, mgr: WebSocketMa
     frame.extend(len(payload).to_bytes(4, "big"))
     frame.extend(payload)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.ws_connect(
-            ws_url,
-            headers={"Authorization": f"Bearer; {token}"},
-            max_msg_size=10_000_000,
-        ) as ws_volc:
-            LOGGER.info(f"[ASR] 🌐 connecting volcengine sid={session_id}")
-
-            await ws_volc.send_bytes(frame)
-            LOGGER.info(f"[ASR] 🔧 full frame sent ({len(payload)} bytes)")
-
-            handshake = await ws_volc.receive()
-            if handshake.type == aiohttp.WSMsgType.BINARY:
-                parsed = parse_response(handshake.data)
-                LOGGER.info(f"[ASR] ✅ handshake ok {parsed}")
-                await mgr.send_json(session_id, {"type": "asr_handshake", "payload": parsed})
-            else:
-                LOGGER.warning(f"[ASR] ⚠️ unexpected handshake {handshake.type}")
-
-            await mgr.notify_ready(session_id, "asr")
-
-            # 🔁 volc 下行任务
-            async def volc_recv():
-                try:
-                    async for msg in ws_volc:
-                        if msg.type != aiohttp.WSMsgType.BINARY:
-                            continue
-                        parsed = parse_response(msg.data)
-                        payload_msg = parsed.get("payload_msg")
-                        if not payload_msg:
-                            continue
-
-                        result_list = payload_msg.get("result") or []
-                        if not result_list:
-                            continue
-
-                        for res in result_list:
-                            for utt in res.get("utterances", []):
-                                text = utt.get("text") or utt.get("normalized_text") or ""
-                                if not text:
-                                    continue
-                                definite = utt.get("definite") or utt.get("is_final")
-                                if not definite:
-                                    await mgr.send_json(session_id, {"type": "asr_partial", "text": text})
-                                else:
-                                    await mgr.send_json(session_id, {"type": "asr_final", "text": text})
-                                    await mgr.send_json(session_id, {"type": "query", "text": text})
-                except Exception:
-                    LOGGER.exception("[ASR] volc_recv failed")
-
-
-            recv_task = asyncio.create_task(volc_recv())
-
-            # 🔁 前端音频上传
+    session = http_clients.get("asr")
+    async with session.ws_connect(
+        ws_url,
+        headers={"Authorization": f"Bearer; {token}"},
+        max_msg_size=10_000_000,
+    ) as ws_volc:
+        LOGGER.info(f"[ASR] 🌐 connecting volcengine sid={session_id}")
+
+        await ws_volc.send_bytes(frame)
+        LOGGER.info(f"[ASR] 🔧 full frame sent ({len(payload)} bytes)")
+
+        handshake = await ws_volc.receive()
+        if handshake.type == aiohttp.WSMsgType.BINARY:
+            parsed = parse_response(handshake.data)
+            LOGGER.info(f"[ASR] ✅ handshake ok {parsed}")
+            await mgr.send_json(session_id, {"type": "asr_handshake", "payload": parsed})
+        else:
+            LOGGER.warning(f"[ASR] ⚠️ unexpected handshake {handshake.type}")
+
+        await mgr.notify_ready(session_id, "asr")
+
+        # 🔁 volc 下行任务
+        async def volc_recv():
             try:
-                while True:
-                    chunk = await websocket.receive()
-                    if chunk["type"] == "websocket.disconnect":
-                        LOGGER.info(f"[ASR] 🔴 client disconnect sid={session_id}")
-                        break
-
-                    if chunk.get("bytes"):
-                        pcm = chunk["bytes"]
-                        LOGGER.info(f"[ASR] 🔹 recv PCM {len(pcm)} bytes sid={session_id}")
-                        comp = gzip.compress(pcm)
-                        pkt = bytearray(generate_audio_default_header())
-                        pkt.extend(len(comp).to_bytes(4, "big"))
-                        pkt.extend(comp)
-                        await ws_volc.send_bytes(pkt)
-                    elif chunk.get("text", "").strip() in {"stop", '{"type":"stop"}'}:
-                        LOGGER.info(f"[ASR] 🟥 stop received sid={session_id}")
-                        comp = gzip.compress(b"")
-                        pkt = bytearray(generate_last_audio_default_header())
-                        pkt.extend(len(comp).to_bytes(4, "big"))
-                        pkt.extend(comp)
-                        await ws_volc.send_bytes(pkt)
-                        break
-            finally:
-                recv_task.cancel()
-                LOGGER.info(f"[ASR] 🧹 cleaned sid={session_id}")
+                async for msg in ws_volc:
+                    if msg.type != aiohttp.WSMsgType.BINARY:
+                        continue
+                    parsed = parse_response(msg.data)
+                    payload_msg = parsed.get("payload_msg")
+                    if not payload_msg:
+                        continue
+
+                    result_list = payload_msg.get("result") or []
+                    if not result_list:
+                        continue
+
+                    for res in result_list:
+                        for utt in res.get("utterances", []):
+                            text = utt.get("text") or utt.get("normalized_text") or ""
+                            if not text:
+                                continue
+                            definite = utt.get("definite") or utt.get("is_final")
+                            if not definite:
+                                await mgr.send_json(session_id, {"type": "asr_partial", "text": text})
+                            else:
+                                await mgr.send_json(session_id, {"type": "asr_final", "text": text})
+                                await mgr.send_json(session_id, {"type": "query", "text": text})
+            except Exception:
+                LOGGER.exception("[ASR] volc_recv failed")
+
+
+        recv_task = asyncio.create_task(volc_recv())
+
+        # 🔁 前端音频上传
+        try:
+            while True:
+                chunk = await websocket.receive()
+                if chunk["type"] == "websocket.disconnect":
+                    LOGGER.info(f"[ASR] 🔴 client disconnect sid={session_id}")
+                    break
+
+                if chunk.get("bytes"):
+                    pcm = chunk["bytes"]
+                    LOGGER.info(f"[ASR] 🔹 recv PCM {len(pcm)} bytes sid={session_id}")
+                    comp = gzip.compress(pcm)
+                    pkt = bytearray(generate_audio_default_header())
+                    pkt.extend(len(comp).to_bytes(4, "big"))
+                    pkt.extend(comp)
+                    await ws_volc.send_bytes(pkt)
+                elif chunk.get("text", "").strip() in {"stop", '{"type":"stop"}'}:
+                    LOGGER.info(f"[ASR] 🟥 stop received sid={session_id}")
+                    comp = gzip.compress(b"")
+                    pkt = bytearray(generate_last_audio_default_header())
+                    pkt.extend(len(comp).to_bytes(4, "big"))
+                    pkt.extend(comp)
+                    await ws_volc.send_bytes(pkt)
+                    break
+        finally:
+            recv_task.cancel()
+            LOGGER.info(f"[ASR] 🧹 cleaned sid={session_id}")
 
 # ===========================================================
 # === 🔌 WebSocket 路由入口 ===
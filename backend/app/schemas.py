@@ -56,6 +56,10 @@ class PlanResponse(BaseModel):
     sections: List[PlanSection]
 
 
+class PlanBatchRequest(BaseModel):
+    topics: List[str] = Field(min_length=1, max_length=200)
+
+
 class SessionCreate(BaseModel):
     topic: str
     interviewer: Optional[str] = None
@@ -65,6 +69,13 @@ class SessionCreate(BaseModel):
 class SessionCreateResponse(BaseModel):
     session: SessionSchema
     outline: PlanResponse
+    outline_status: str = "ready"
+
+
+class SessionOutlineResponse(BaseModel):
+    session_id: int
+    status: str
+    outline: PlanResponse
 
 
 class TranscriptAppendRequest(BaseModel):
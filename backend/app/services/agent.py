@@ -2,17 +2,28 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Callable, Dict, Optional
 
+from ..config import settings
 from ..models import Note, Session, Turn
 from ..schemas import PlanResponse
 from ..database import SessionLocal
-from .extraction import extractor
+from .branches import Branch, branch_stats, match_branch, precompute_branches, reusable_branch
+from .extraction import IncrementalExtractor, extractor
+from .notes import NoteIndex
 from .outline import outline_builder
-from .policy import PolicyDecision, PolicyError, decide_policy
+from .policy import PolicyBackpressureError, PolicyDecision, PolicyError, decide_policy
+from .policy_gate import policy_gate
+from .prompt_context import update_summary
+from .speculation import Speculation
 from .state_machine import InterviewStage, StateMachine
+from .turn_budget import CircuitBreaker, TurnBudget
 
+LOGGER = logging.getLogger(__name__)
 
 @dataclass
 class AgentDecision:
@@ -20,33 +31,143 @@ class AgentDecision:
     question: str
     stage: InterviewStage
     rationale: str
-    notes: list[dict] = field(default_factory=list)
+    changed_notes: list[dict] = field(default_factory=list)
     new_notes: list[dict] = field(default_factory=list)
+    notes_version: int = 0
+    budget: TurnBudget | None = None
+    branch: str | None = None
 
 
 
+@dataclass
+class OutlineJob:
+    """Outline of a session whose LLM version may still be generating."""
+
+    topic: str
+    outline: PlanResponse
+    ready: bool = False
+    task: Optional[asyncio.Task] = None
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+    finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        return "ready" if self.ready else "pending"
+
+    async def wait(self) -> PlanResponse:
+        await self.event.wait()
+        return self.outline
+
+
+@dataclass
+class LiveTurn:
+    """Extraction running on the answer while it is still being spoken.
+
+    ``finals`` are the ASR finals already submitted for this turn; the
+    debouncer joins them with spaces, so partials are fed after them.
+    """
+
+    extraction: IncrementalExtractor = field(default_factory=IncrementalExtractor)
+    finals: list[str] = field(default_factory=list)
+
+    def transcript(self, partial: str) -> str:
+        return " ".join([*self.finals, partial]) if partial else " ".join(self.finals)
+
+
 class AgentOrchestrator:
     """Coordinates interview turns and persistence."""
 
     def __init__(self) -> None:
         self._machines: Dict[str, StateMachine] = {}
-        self._note_cache: Dict[str, list[dict]] = {}
+        self._note_index: Dict[str, NoteIndex] = {}
+        self._persist_tails: Dict[str, asyncio.Task] = {}
+        self._outline_jobs: Dict[str, OutlineJob] = {}
+        # (完成时间, session_id)，按完成顺序过期淘汰
+        self._finished_jobs: deque[tuple[float, str]] = deque()
+        self._branches: Dict[str, list[Branch]] = {}
+        self._live_turns: Dict[str, LiveTurn] = {}
         self._lock = asyncio.Lock()
+        self.policy_breaker = CircuitBreaker(
+            settings.policy_breaker_failures,
+            settings.policy_breaker_reset_seconds,
+        )
+
+    def new_turn_budget(self) -> TurnBudget | None:
+        """Budget for a turn starting now (``None`` when TURN_BUDGET_MS is 0)."""
+
+        if settings.turn_budget_ms <= 0:
+            return None
+        return TurnBudget(
+            settings.turn_budget_ms / 1000,
+            tts_reserve=settings.turn_tts_reserve_ms / 1000,
+        )
 
     async def ensure_session(self, session_id: str, topic: str, outline: PlanResponse | None = None) -> StateMachine:
         async with self._lock:
             if session_id in self._machines:
                 return self._machines[session_id]
-            outline_obj = outline or await outline_builder.build(topic)
+            job = self._outline_jobs.get(session_id)
+            outline_obj = outline or (job.outline if job else None) or await outline_builder.build(topic)
             questions = [q.question for section in outline_obj.sections for q in section.questions]
             machine = StateMachine(session_id=session_id, topic=topic, outline_questions=questions)
             self._machines[session_id] = machine
-            self._note_cache[session_id] = []
+            self._note_index[session_id] = NoteIndex()
             return machine
 
+    async def start_outline(self, session_id: str, topic: str) -> OutlineJob:
+        """Return a usable outline now and generate the LLM outline in the background.
+
+        A cached (or near-duplicate) outline is ready immediately; otherwise
+        the session starts from ``DEFAULT_STAGES`` and the generated outline
+        is swapped into the state machine once available. Finished jobs are
+        kept for OUTLINE_JOB_TTL_SECONDS, independent of the agent socket.
+        """
+
+        self._evict_outline_jobs()
+        outline = await outline_builder.peek(topic)
+        job = OutlineJob(topic=topic, outline=outline or outline_builder.preliminary(topic))
+        self._outline_jobs[session_id] = job
+        if outline is not None:
+            self._finish_outline(session_id, job)
+        else:
+            job.task = asyncio.create_task(self._generate_outline(session_id, job))
+        return job
+
+    def outline_job(self, session_id: str) -> OutlineJob | None:
+        self._evict_outline_jobs()
+        return self._outline_jobs.get(session_id)
+
+    def _finish_outline(self, session_id: str, job: OutlineJob) -> None:
+        job.ready = True
+        job.task = None
+        job.finished_at = time.monotonic()
+        self._finished_jobs.append((job.finished_at, session_id))
+        job.event.set()
+
+    def _evict_outline_jobs(self) -> None:
+        deadline = time.monotonic() - settings.outline_job_ttl_seconds
+        while self._finished_jobs and self._finished_jobs[0][0] <= deadline:
+            finished_at, session_id = self._finished_jobs.popleft()
+            job = self._outline_jobs.get(session_id)
+            # 同一会话可能已重新生成提纲：只淘汰这条记录对应的那个任务
+            if job is not None and job.finished_at == finished_at:
+                del self._outline_jobs[session_id]
+
+    async def _generate_outline(self, session_id: str, job: OutlineJob) -> None:
+        try:
+            job.outline = await outline_builder.build(job.topic)
+        except Exception:
+            LOGGER.exception("Background outline generation failed for session %s", session_id)
+        finally:
+            machine = self._machines.get(session_id)
+            if machine is not None:
+                machine.replace_outline([q.question for section in job.outline.sections for q in section.questions])
+            self._finish_outline(session_id, job)
+
     async def bootstrap_decision(self, session_id: str) -> AgentDecision:
         machine = self._machines[session_id]
-        policy_decision = await self._decide_with_fallback(machine)
+        budget = self.new_turn_budget()
+        policy_decision = await self._decide_with_fallback(machine, budget=budget)
         self._sync_stage_with_action(machine, policy_decision.action)
         machine.apply_policy_decision(policy_decision)
         return AgentDecision(
@@ -54,22 +175,83 @@ class AgentOrchestrator:
             question=policy_decision.question,
             stage=machine.data.stage,
             rationale=policy_decision.rationale,
+            budget=budget,
         )
 
-    async def handle_user_turn(self, session_id: str, text: str, speaker: str = "user") -> AgentDecision:
-        machine = self._machines[session_id]
-        previous_stage = machine.data.stage
-        if previous_stage == InterviewStage.CLARIFY and machine.data.pending_clarifications:
-            machine.data.resolve_clarification(machine.data.pending_clarifications[0])
-        machine.transition_after_answer()
+    async def handle_user_turn(
+        self,
+        session_id: str,
+        text: str,
+        speaker: str = "user",
+        speculation: Speculation | None = None,
+        on_question: Optional[Callable[[str], None]] = None,
+        budget: TurnBudget | None = None,
+    ) -> AgentDecision:
+        """Run one interview turn.
 
-        extracted_notes = extractor.extract(text)
-        for note in extracted_notes:
-            if note.requires_clarification:
-                machine.register_clarification(note.content)
-        policy_decision = await self._decide_with_fallback(machine)
+        The policy call is the only suspension point before the turn is
+        committed; if the caller cancels it (e.g. the turn debouncer merging
+        more speech) the conversation state is rolled back, so the same text
+        can be handled again as part of a longer turn. Persistence runs in the
+        background, ordered per session.
+
+        A ``speculation`` started from an ASR partial is used instead of a new
+        policy call when it was computed from the same prepared state; a
+        branch precomputed while the question was spoken (see
+        :meth:`precompute_branches`) is used when the answer reached its state.
+        ``on_question`` receives the question text while the policy model is
+        still streaming it (see :func:`decide_policy`).
+
+        The policy call is bounded by ``budget`` (a fresh one from
+        TURN_BUDGET_MS when omitted): past its share the rule-based question
+        is used and the LLM call is cancelled.
+        """
+
+        machine = self._machines[session_id]
+        if budget is None:
+            budget = self.new_turn_budget()
+        checkpoint = machine.data.checkpoint()
+        # 决策提交前保留 LiveTurn：被去抖取消时已缓存的 final 和增量抽取状态不丢失
+        live = self._live_turns.get(session_id)
+        extracted_notes = self._prepare_turn(
+            machine, text, notes=live.extraction.fork().finish(text) if live is not None else None
+        )
+        if budget is not None:
+            budget.mark("extraction")
+        precomputed = reusable_branch(self._branches.get(session_id, []), machine)
+        try:
+            if precomputed is not None:
+                # 🔮 回答落在预先推演的分支上：直接复用其决策（音频已预合成）
+                if speculation is not None:
+                    speculation.discard()
+                if budget is not None:
+                    budget.mark("policy")
+                policy_decision = PolicyDecision(
+                    action=precomputed.decision.action,
+                    question=precomputed.decision.question,
+                    rationale=f"precomputed branch ({precomputed.kind}, {precomputed.reason})",
+                )
+            elif speculation is not None and speculation.fingerprint == machine.data.fingerprint():
+                policy_decision = await self._decide_with_fallback(
+                    machine, budget=budget, pending=speculation.accept()
+                )
+            else:
+                if speculation is not None:
+                    speculation.discard()
+                policy_decision = await self._decide_with_fallback(
+                    machine, on_question=on_question, budget=budget
+                )
+        except asyncio.CancelledError:
+            machine.data.restore(checkpoint)
+            raise
+        if live is not None and self._live_turns.get(session_id) is live:
+            del self._live_turns[session_id]
         self._sync_stage_with_action(machine, policy_decision.action)
         machine.apply_policy_decision(policy_decision)
+        self._schedule_summary(machine)
+        branch = match_branch(self._branches.pop(session_id, []), policy_decision.question)
+        if settings.precompute_branches_enabled:
+            branch_stats.record_turn(branch)
         note_payloads = [
             {
                 "category": note.category,
@@ -79,32 +261,220 @@ class AgentOrchestrator:
             }
             for note in extracted_notes
         ]
-        aggregate = self._note_cache.setdefault(session_id, [])
-        by_content = {item["content"]: item for item in aggregate}
-        for payload in note_payloads:
-            existing = by_content.get(payload["content"])
-            if existing:
-                existing["confidence"] = max(existing["confidence"], payload["confidence"])
-                existing["requires_clarification"] = existing["requires_clarification"] or payload["requires_clarification"]
-            else:
-                aggregate.append(payload.copy())
-                by_content[payload["content"]] = aggregate[-1]
+        index = self._note_index.setdefault(session_id, NoteIndex())
+        changed_notes = index.merge(note_payloads)
         decision = AgentDecision(
             action=policy_decision.action,
             question=policy_decision.question,
             stage=machine.data.stage,
-            notes=[{**item} for item in aggregate],
+            changed_notes=changed_notes,
             new_notes=note_payloads,
+            notes_version=index.version,
             rationale=policy_decision.rationale,
+            budget=budget,
+            branch=branch.kind if branch is not None else None,
         )
-        await self._persist_turn(session_id=session_id, speaker=speaker, text=text, decision=decision)
+        self._schedule_persist(session_id=session_id, speaker=speaker, text=text, decision=decision)
         return decision
 
-    async def _decide_with_fallback(self, machine: StateMachine) -> PolicyDecision:
+    def _schedule_persist(self, session_id: str, speaker: str, text: str, decision: AgentDecision) -> None:
+        previous = self._persist_tails.get(session_id)
+
+        async def _run() -> None:
+            if previous is not None:
+                await asyncio.wait({previous})
+            try:
+                await self._persist_turn(session_id=session_id, speaker=speaker, text=text, decision=decision)
+            except Exception:
+                LOGGER.exception("Failed to persist turn for session %s", session_id)
+
+        task = asyncio.create_task(_run())
+        self._persist_tails[session_id] = task
+
+        def _cleanup(done: asyncio.Task) -> None:
+            if self._persist_tails.get(session_id) is done:
+                self._persist_tails.pop(session_id, None)
+
+        task.add_done_callback(_cleanup)
+
+    def _schedule_summary(self, machine: StateMachine) -> None:
+        """Fold turns that fell out of the history into the rolling summary, after this turn."""
+
+        if machine.data.has_evicted_turns:
+            asyncio.get_running_loop().call_soon(update_summary, machine.data)
+
+    def precompute_branches(self, session_id: str) -> list[Branch]:
+        """Likely next decisions, computed while the current question is being spoken.
+
+        The caller pre-synthesizes the branch questions; when the real answer
+        leaves the session in a branch's state, the turn that follows reuses
+        that branch's decision instead of deciding again. Only branches the
+        hybrid gate would answer locally are kept, plus the follow-up on a
+        one-line answer: an LLM question practically never equals a
+        rule-based one, so synthesizing those would only waste TTS capacity.
+        """
+
+        machine = self._machines.get(session_id)
+        if machine is None or not settings.precompute_branches_enabled or not policy_gate.enabled:
+            return []
+        branches = [
+            branch
+            for branch in precompute_branches(machine, self._prepare_turn)
+            if branch.reason == "short_answer" or branch.confidence >= settings.hybrid_policy_min_confidence
+        ]
+        self._branches[session_id] = branches
+        branch_stats.precomputed += len(branches)
+        return branches
+
+    def observe_partial(self, session_id: str, text: str) -> str:
+        """Extract from an ASR partial of the answer being spoken (only its new suffix is scanned).
+
+        Returns the turn's transcript so far: the finals already submitted
+        followed by the partial, as the debouncer will deliver it.
+        """
+
+        live = self._live_turns.setdefault(session_id, LiveTurn())
+        transcript = live.transcript(text.strip())
+        live.extraction.feed(transcript)
+        return transcript
+
+    def observe_final(self, session_id: str, text: str) -> None:
+        """Record an ASR final that will be merged into the current turn."""
+
+        live = self._live_turns.setdefault(session_id, LiveTurn())
+        live.finals.append(text)
+        live.extraction.feed(live.transcript(""))
+
+    def release_session(self, session_id: str) -> None:
+        """Drop per-connection state when the session's agent socket closes."""
+
+        self._live_turns.pop(session_id, None)
+        self._branches.pop(session_id, None)
+
+    def speculate(self, session_id: str, text: str) -> Speculation | None:
+        """Start a policy decision for ``text`` on a detached copy of the session state."""
+
+        machine = self._machines.get(session_id)
+        if machine is None:
+            return None
+        shadow = machine.clone()
+        self._prepare_turn(shadow, text)
+        if policy_gate.confident(shadow) is not None:
+            # 该轮会由本地策略直接回答，无需预判
+            return None
+        task = asyncio.create_task(self._call_policy(shadow))
+        return Speculation(text, shadow.data.fingerprint(), task)
+
+    def _prepare_turn(self, machine: StateMachine, text: str, notes: list | None = None) -> list:
+        """Apply the answer to ``machine`` up to (not including) the policy call.
+
+        ``notes`` are the answer's extracted notes when they were already
+        computed from the ASR partials.
+        """
+
+        machine.record_user_turn(text)
+        if machine.data.stage == InterviewStage.CLARIFY and machine.data.pending_clarifications:
+            machine.data.resolve_clarification(machine.data.pending_clarifications[0])
+        # 回答顺带覆盖的其他提纲问题同样记为已答，避免重复提问
+        machine.credit_answer(text, settings.outline_coverage_threshold)
+        machine.transition_after_answer()
+        extracted_notes = extractor.extract(text) if notes is None else notes
+        for note in extracted_notes:
+            if note.requires_clarification:
+                machine.register_clarification(note.content)
+        return extracted_notes
+
+    def notes_since(self, session_id: str, version: int) -> tuple[int, list[dict]]:
+        """Return the current notes version and the notes changed after ``version``."""
+
+        index = self._note_index.setdefault(session_id, NoteIndex())
+        return index.version, index.since(version)
+
+    async def _decide_with_fallback(
+        self,
+        machine: StateMachine,
+        on_question: Optional[Callable[[str], None]] = None,
+        budget: TurnBudget | None = None,
+        pending: "asyncio.Task[PolicyDecision] | None" = None,
+    ) -> PolicyDecision:
+        """Policy decision within the turn budget; rule-based when the LLM is late or failing.
+
+        The budget bounds the time until the question starts streaming to
+        ``on_question``: once it is being spoken, the LLM is allowed to
+        finish rather than being cut off mid-sentence. ``pending`` is an
+        already running decision (an accepted speculation) to wait for
+        instead of starting a new call. With HYBRID_POLICY_ENABLED an
+        unambiguous rule-based decision is returned without calling the LLM.
+        """
+
+        if pending is None:
+            local = policy_gate.decide(machine)
+            if local is not None:
+                if budget is not None:
+                    budget.mark("policy")
+                return local
+        speaking = asyncio.Event()
+
+        def relay(piece: str) -> None:
+            speaking.set()
+            on_question(piece)
+
+        task = pending or asyncio.create_task(self._call_policy(machine, relay if on_question else None))
+        timeout = budget.policy_timeout() if budget is not None else None
+        try:
+            done, _ = await asyncio.wait({task}, timeout=timeout)
+            if not done and speaking.is_set():
+                # 🔊 问题已在播报：不再截断，等 LLM 把问题说完
+                done, _ = await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if budget is not None:
+            budget.mark("policy")
+        if not done:
+            # ⏱️ 超出本轮预算且尚未开始播报：改用规则问题，取消仍在进行的 LLM 调用
+            task.cancel()
+            self.policy_breaker.record_timeout()
+            LOGGER.warning("Policy call exceeded %.2fs budget, using rule-based question", timeout)
+            if budget is not None:
+                budget.fallback = "timeout"
+            return machine.rule_based_decision()
+        if task.cancelled():
+            return machine.rule_based_decision()
+        return task.result()
+
+    async def _call_policy(
+        self,
+        machine: StateMachine,
+        on_question: Optional[Callable[[str], None]] = None,
+    ) -> PolicyDecision:
+        breaker = self.policy_breaker
+        if not breaker.allow():
+            # 🔌 熔断中：LLM 近期持续失败或超时，直接走规则策略
+            return machine.rule_based_decision()
+        started = time.perf_counter()
         try:
-            return await decide_policy(machine.data)
+            decision = await decide_policy(machine.data, on_question=on_question)
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        except PolicyBackpressureError:
+            # 本地准入队列已满（如批量生成提纲）：不是上游故障，不计入熔断
+            breaker.abandon()
+            return machine.rule_based_decision()
         except PolicyError:
+            if settings.llm_credentials_ready:
+                breaker.record_failure()
+            else:
+                breaker.abandon()
             return machine.rule_based_decision()
+        except Exception as exc:
+            LOGGER.warning("Policy call failed, using rule-based question: %s", exc)
+            breaker.record_failure()
+            return machine.rule_based_decision()
+        breaker.record_success()
+        policy_gate.record_llm_latency(time.perf_counter() - started)
+        return decision
 
     def _sync_stage_with_action(self, machine: StateMachine, action: str) -> None:
         if action == "clarify":
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .policy import PolicyDecision
+from .policy_gate import assess_local, vague_sentence
+from .state_machine import StateMachine
+
+# 三类典型回答，用于在播报当前问题时推演下一步
+BRANCH_SAMPLES = {
+    "followup": "嗯，是的。",
+    "next": "这方面我们已经有一套比较成熟的做法。",
+    "clarify": "可能吧，具体我也不太确定。",
+}
+
+
+@dataclass
+class Branch:
+    kind: str
+    decision: PolicyDecision
+    confidence: float
+    reason: str
+    # 推演后状态的 fingerprint，真实回答落到同一状态时可直接复用该决策
+    fingerprint: tuple
+
+
+class BranchStats:
+    """Process-wide counters for precomputed next-question branches."""
+
+    def __init__(self) -> None:
+        self.turns = 0
+        self.precomputed = 0
+        self.hits = 0
+        self.hits_by_kind: Dict[str, int] = {}
+
+    def record_turn(self, branch: Optional[Branch]) -> None:
+        self.turns += 1
+        if branch is not None:
+            self.hits += 1
+            self.hits_by_kind[branch.kind] = self.hits_by_kind.get(branch.kind, 0) + 1
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "turns": self.turns,
+            "branches": self.precomputed,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.turns, 3) if self.turns else 0.0,
+            "hits_by_kind": dict(self.hits_by_kind),
+        }
+
+
+branch_stats = BranchStats()
+
+
+def precompute_branches(
+    machine: StateMachine,
+    prepare: Callable[[StateMachine, str], object],
+) -> List[Branch]:
+    """Likely next decisions for a short, an adequate and a vague answer.
+
+    Each sample answer is applied with ``prepare`` to a detached copy of the
+    session state and the local policy decides; branches that lead to the
+    same question are merged. A question quoting the sample answer itself
+    can never be asked for a real answer and is dropped.
+    """
+
+    branches: List[Branch] = []
+    seen = set()
+    for kind, sample in BRANCH_SAMPLES.items():
+        shadow = machine.clone()
+        prepare(shadow, sample)
+        assessment = assess_local(shadow)
+        question = assessment.decision.question
+        quote = vague_sentence(sample)
+        if question in seen or (quote and quote in question):
+            continue
+        seen.add(question)
+        branches.append(Branch(
+            kind, assessment.decision, assessment.confidence, assessment.reason, shadow.data.fingerprint()
+        ))
+    return branches
+
+
+def reusable_branch(branches: List[Branch], machine: StateMachine) -> Optional[Branch]:
+    """The branch precomputed for the state ``machine`` is in now, if any.
+
+    ``machine`` has the real answer applied; the branch is valid when the
+    state fingerprint is unchanged and the local policy still reaches the
+    same question (the fingerprint leaves out the answer text).
+    """
+
+    if not branches:
+        return None
+    fingerprint = machine.data.fingerprint()
+    candidates = [branch for branch in branches if branch.fingerprint == fingerprint]
+    if not candidates:
+        return None
+    question = assess_local(machine).decision.question
+    for branch in candidates:
+        if branch.decision.question == question:
+            return branch
+    return None
+
+
+def match_branch(branches: List[Branch], question: str) -> Optional[Branch]:
+    """The precomputed branch whose question is the one actually asked, if any."""
+
+    question = question.strip()
+    for branch in branches:
+        if branch.decision.question == question:
+            return branch
+    return None
+
+
+__all__ = [
+    "BRANCH_SAMPLES",
+    "Branch",
+    "BranchStats",
+    "branch_stats",
+    "match_branch",
+    "precompute_branches",
+    "reusable_branch",
+]
@@ -2,14 +2,20 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Iterable, List
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
+from ..config import settings
 from ..schemas import NoteSchema
 
 
 FUZZY_MARKERS = {"可能", "大概", "不确定", "暂时"}
 NUMBER_PATTERN = re.compile(r"(?P<value>\d+(?:\.\d+)?)(?P<unit>[%万亿万件人小时元人民币]*)")
 
+# 数字匹配结束后还要再看到的字符数才算定型（"12." 可能续成 "12.5"）
+_NUMBER_LOOKAHEAD = 2
+# 批量抽取时拼接各条回答的分隔符，不会出现在任何匹配中
+_BATCH_SEPARATOR = "\n"
+
 
 @dataclass
 class ExtractedNote:
@@ -19,40 +25,281 @@ class ExtractedNote:
     requires_clarification: bool = False
 
 
-class InformationExtractor:
-    """A lightweight rule-based extractor used for the MVP."""
+def _literal_regex(words: Iterable[str]) -> str:
+    """Alternation of ``words`` factored into a prefix tree (longest match first)."""
+
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # 更长的词优先，词在此结束时后续可选
+        return f"(?:{body})?" if "" in node else body
+
+    return render(trie)
+
+
+class ExtractionEngine:
+    """Every extraction rule compiled into one regular expression.
+
+    Numbers with units, fuzzy markers and domain keywords are alternatives
+    of a single pattern (literals as a prefix tree), so an utterance is
+    scanned once whatever the number of rules. At any position a number
+    wins over a marker and a marker over a keyword; matches do not overlap,
+    so a marker starting inside a longer match (``大概`` in keyword ``最大``
+    + ``概率``) is looked up separately by :meth:`marker_spans`.
+    """
+
+    def __init__(self, markers: Iterable[str] = FUZZY_MARKERS, keywords: Iterable[str] = ()) -> None:
+        self.markers = tuple(sorted({marker for marker in markers if marker}))
+        self.keywords = tuple(sorted({word for word in keywords if word and _BATCH_SEPARATOR not in word}))
+        parts = [NUMBER_PATTERN.pattern]
+        if self.markers:
+            parts.append(f"(?P<marker>{_literal_regex(self.markers)})")
+        if self.keywords:
+            parts.append(f"(?P<keyword>{_literal_regex(self.keywords)})")
+        # 先用首字符集合快速跳过不可能开始匹配的位置
+        starts = "".join(sorted({re.escape(word[0]) for word in self.markers + self.keywords}))
+        self.pattern = re.compile(rf"(?=[\d{starts}])(?:{'|'.join(parts)})")
+        self._marker_pattern = re.compile(_literal_regex(self.markers)) if self.markers else None
+        self._longest_marker = max((len(marker) for marker in self.markers), default=0)
+        longest = max((len(word) for word in self.markers + self.keywords), default=0)
+        # 匹配结束后至少再看到这么多字符，才能确定它不会被更长的匹配取代
+        self.lookahead = max(_NUMBER_LOOKAHEAD, longest)
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[re.Match]:
+        return self.pattern.finditer(text, pos)
+
+    def marker_spans(self, matches: Iterable[re.Match]) -> Iterator[Tuple[int, int]]:
+        """Spans of the fuzzy markers, in order, given the ``matches`` of a scan.
+
+        Besides the marker matches this finds the first marker starting
+        inside each number or keyword match, which the single pattern hides.
+        Spans are relative to the scanned string (``match.string``; for a
+        batch that is the joined utterances).
+        """
+
+        for match in matches:
+            if match.lastgroup == "marker":
+                yield match.span()
+            elif self._marker_pattern is not None:
+                start, end = match.span()
+                scanned = match.string
+                hidden = self._marker_pattern.search(scanned, start, min(len(scanned), end + self._longest_marker - 1))
+                if hidden is not None and hidden.start() < end:
+                    yield hidden.span()
+
+    def notes(self, utterance: str, matches: Iterable[re.Match]) -> List[ExtractedNote]:
+        numbers: list[Tuple[str, str]] = []
+        keywords: dict = {}
+        matches = list(matches)
+        for match in matches:
+            kind = match.lastgroup
+            if kind == "keyword":
+                keywords.setdefault(match.group("keyword"), None)
+            elif kind != "marker":
+                numbers.append((match.group("value"), match.group("unit")))
+        vague = next(self.marker_spans(matches), None) is not None
+        return build_notes(utterance, numbers, vague, keywords)
 
     def extract(self, utterance: str) -> List[ExtractedNote]:
-        notes: list[ExtractedNote] = []
-        numbers = NUMBER_PATTERN.findall(utterance)
-        for value, unit in numbers:
-            notes.append(
-                ExtractedNote(
-                    category="数字",
-                    content=f"{value}{unit}",
-                    confidence=0.95,
-                    requires_clarification=False,
-                )
+        return self.notes(utterance, self.finditer(utterance))
+
+    def extract_batch(self, utterances: Sequence[str]) -> List[List[ExtractedNote]]:
+        """Extract from many utterances with a single scan over their concatenation."""
+
+        if any(_BATCH_SEPARATOR in utterance for utterance in utterances):
+            return [self.extract(utterance) for utterance in utterances]
+        results: List[List[ExtractedNote]] = []
+        matches: List[re.Match] = []
+        index = 0
+        end = len(utterances[0]) if utterances else 0
+        for match in self.finditer(_BATCH_SEPARATOR.join(utterances)):
+            while match.start() > end:
+                results.append(self.notes(utterances[index], matches))
+                matches = []
+                index += 1
+                end += len(_BATCH_SEPARATOR) + len(utterances[index])
+            matches.append(match)
+        for utterance in utterances[index:]:
+            results.append(self.notes(utterance, matches))
+            matches = []
+        return results
+
+
+def build_notes(
+    utterance: str,
+    numbers: Iterable[Tuple[str, str]],
+    vague: bool,
+    keywords: Iterable[str] = (),
+) -> List[ExtractedNote]:
+    notes: list[ExtractedNote] = []
+    for value, unit in numbers:
+        notes.append(
+            ExtractedNote(
+                category="数字",
+                content=f"{value}{unit}",
+                confidence=0.95,
+                requires_clarification=False,
+            )
+        )
+    for keyword in keywords:
+        notes.append(
+            ExtractedNote(
+                category="关键词",
+                content=keyword,
+                confidence=0.8,
+                requires_clarification=False,
             )
-        if any(marker in utterance for marker in FUZZY_MARKERS):
-            notes.append(
-                ExtractedNote(
-                    category="澄清",
-                    content="回答含糊，需要追问",
-                    confidence=0.6,
-                    requires_clarification=True,
-                )
+        )
+    if vague:
+        notes.append(
+            ExtractedNote(
+                category="澄清",
+                content="回答含糊，需要追问",
+                confidence=0.6,
+                requires_clarification=True,
             )
-        if not notes:
-            notes.append(
-                ExtractedNote(
-                    category="观点",
-                    content=utterance.strip(),
-                    confidence=0.75,
-                    requires_clarification=False,
-                )
+        )
+    if not notes:
+        notes.append(
+            ExtractedNote(
+                category="观点",
+                content=utterance.strip(),
+                confidence=0.75,
+                requires_clarification=False,
             )
-        return notes
+        )
+    return notes
+
+
+class InformationExtractor:
+    """A lightweight rule-based extractor used for the MVP."""
+
+    def __init__(self, engine: ExtractionEngine | None = None) -> None:
+        self.engine = engine or ExtractionEngine(keywords=settings.extraction_keywords)
+
+    def extract(self, utterance: str) -> List[ExtractedNote]:
+        return self.engine.extract(utterance)
+
+    def extract_batch(self, utterances: Sequence[str]) -> List[List[ExtractedNote]]:
+        return self.engine.extract_batch(utterances)
 
 
 extractor = InformationExtractor()
+
+
+class ExtractionStats:
+    """Process-wide counters for extraction done ahead of the final transcript."""
+
+    def __init__(self) -> None:
+        self.turns = 0
+        self.prefilled = 0
+        self.revised = 0
+        self.final_chars = 0
+        self.rescanned_chars = 0
+
+    def record_turn(self, incremental: "IncrementalExtractor", final_chars: int, rescanned: int, prefix: int) -> None:
+        self.turns += 1
+        self.final_chars += final_chars
+        self.rescanned_chars += rescanned
+        if incremental.partials:
+            self.prefilled += 1
+            if prefix < incremental.partial_chars:
+                self.revised += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "turns": self.turns,
+            "prefilled": self.prefilled,
+            "revised": self.revised,
+            "final_scan_ratio": round(self.rescanned_chars / self.final_chars, 3) if self.final_chars else 0.0,
+        }
+
+
+extraction_stats = ExtractionStats()
+
+
+class IncrementalExtractor:
+    """Extraction state of one turn, fed with its growing ASR partials.
+
+    Every :meth:`feed` scans only the text after the last point where earlier
+    matches can no longer change, so by the time the final transcript arrives
+    :meth:`finish` has at most a few characters left to look at. When a
+    partial or the final rewrites earlier words, matches after the first
+    changed character are dropped and that part is scanned again; the result
+    of :meth:`finish` is always what ``extract(final)`` returns.
+    """
+
+    def __init__(self, engine: ExtractionEngine | None = None) -> None:
+        self.engine = engine or extractor.engine
+        self.text = ""
+        self.partials = 0
+        self.partial_chars = 0
+        self.scanned = 0
+        self._matches: List[re.Match] = []
+        self._resume = 0
+
+    def feed(self, text: str) -> None:
+        self.partials += 1
+        self._scan(text, final=False)
+        self.partial_chars = len(text)
+
+    def fork(self) -> "IncrementalExtractor":
+        """A copy to :meth:`finish` while this one keeps following the partials."""
+
+        clone = IncrementalExtractor(self.engine)
+        clone.text, clone.partials, clone.partial_chars = self.text, self.partials, self.partial_chars
+        clone.scanned, clone._resume = self.scanned, self._resume
+        clone._matches = list(self._matches)
+        return clone
+
+    def finish(self, text: str, stats: ExtractionStats = extraction_stats) -> List[ExtractedNote]:
+        before = self.scanned
+        prefix = _common_prefix(self.text, text)
+        self._scan(text, final=True)
+        stats.record_turn(self, len(text), self.scanned - before, prefix)
+        return self.engine.notes(text, self._matches)
+
+    def _scan(self, text: str, final: bool) -> None:
+        prefix = _common_prefix(self.text, text)
+        if prefix < len(self.text):
+            self._rollback(prefix)
+        self.text = text
+        size = len(text)
+        lookahead = self.engine.lookahead
+        self.scanned += max(0, size - self._resume)
+        pending = None
+        for match in self.engine.finditer(text, self._resume):
+            if not final and match.end() + lookahead > size:
+                pending = match.start()
+                break
+            self._matches.append(match)
+        if final:
+            self._resume = size
+        elif pending is not None:
+            self._resume = pending
+        else:
+            self._resume = max(self._matches[-1].end() if self._matches else 0, size - lookahead)
+
+    def _rollback(self, prefix: int) -> None:
+        lookahead = self.engine.lookahead
+        kept = [match for match in self._matches if match.end() + lookahead <= prefix]
+        if len(kept) < len(self._matches):
+            self._resume = min(self._resume, self._matches[len(kept)].start())
+        self._matches = kept
+        self._resume = min(self._resume, max(kept[-1].end() if kept else 0, prefix - lookahead))
+
+
+def _common_prefix(left: str, right: str) -> int:
+    for index, (a, b) in enumerate(zip(left, right)):
+        if a != b:
+            return index
+    return min(len(left), len(right))
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+
+class NoteIndex:
+    """Per-session note aggregate keyed by content, updated in place.
+
+    Every merge that adds or changes a note bumps ``version``; each entry
+    remembers the version it last changed at so clients that missed a delta
+    can resync with :meth:`since`.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[str, dict] = {}
+        self._changed_at: Dict[str, int] = {}
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def merge(self, payloads: Iterable[dict]) -> List[dict]:
+        """Merge ``payloads`` and return copies of the notes that changed."""
+
+        changed: Dict[str, dict] = {}
+        for payload in payloads:
+            content = payload["content"]
+            existing = self._items.get(content)
+            if existing is None:
+                self._items[content] = payload.copy()
+                changed[content] = self._items[content]
+                continue
+            confidence = max(existing["confidence"], payload["confidence"])
+            requires_clarification = existing["requires_clarification"] or payload["requires_clarification"]
+            if confidence != existing["confidence"] or requires_clarification != existing["requires_clarification"]:
+                existing["confidence"] = confidence
+                existing["requires_clarification"] = requires_clarification
+                changed[content] = existing
+        if changed:
+            self.version += 1
+            for content in changed:
+                self._changed_at[content] = self.version
+        return [{**item} for item in changed.values()]
+
+    def since(self, version: int) -> List[dict]:
+        """Return notes changed after ``version`` (all notes for ``version <= 0``)."""
+
+        if version <= 0:
+            return self.snapshot()
+        return [{**item} for content, item in self._items.items() if self._changed_at[content] > version]
+
+    def snapshot(self) -> List[dict]:
+        return [{**item} for item in self._items.values()]
+
+
+__all__ = ["NoteIndex"]
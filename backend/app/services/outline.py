@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Iterable, Any
+from typing import Any, AsyncIterator, Callable, Iterable
 
 from ..config import settings
 from ..core import llm
+from ..core.json_stream import JsonObjectStream, iter_json_values
 
 from ..schemas import PlanQuestion, PlanResponse, PlanSection
+from .outline_cache import OutlineCache
+from .topic_index import TopicIndex, np
 
 
 LOGGER = logging.getLogger(__name__)
@@ -19,81 +23,300 @@ DEFAULT_STAGES = [
     ("结论", ["下一步的关键计划是什么？", "还需要哪些外部支持？"]),
 ]
 
+# 修改提纲 prompt 时递增，旧缓存自动失效
+PROMPT_VERSION = "v1"
+
 
 class OutlineBuilder:
     """Generate structured three-level outlines."""
 
+    def __init__(self, cache: OutlineCache | None = None) -> None:
+        self.cache = cache or OutlineCache(
+            ttl=settings.outline_cache_ttl_seconds,
+            memory_size=settings.outline_cache_memory_size,
+        )
+        self._indexes: dict[tuple[str, str], TopicIndex] = {}
+        self.llm_calls_saved = 0
+
+    @property
+    def model(self) -> str:
+        return settings.ark_outline_model_id or settings.ark_model_id
+
+    def cache_key(self, topic: str) -> str:
+        return OutlineCache.make_key(topic, self.model, PROMPT_VERSION)
+
     async def build(
         self,
         topic: str,
         seeds: Iterable[tuple[str, list[str]]] | None = None,
+        on_section: Callable[[PlanSection], None] | None = None,
+        priority: llm.LLMPriority = llm.LLMPriority.SETUP,
     ) -> PlanResponse:
-        blueprint: list[tuple[str, list[str]]] | None = None
-        if settings.llm_credentials_ready:
-            messages = [
-                {
-                    "role": "system",
-                    "content": (
-                        "你是采访提纲助手，请基于主题生成三级递进的访谈提纲。"
-                        "确保问题覆盖背景、细节、指标与行动项，回答 JSON 数组。"
-                    ),
-                },
-                {
-                    "role": "user",
-                    "content": json.dumps(
-                        {
-                            "topic": topic,
-                            "format": [
-                                {"stage": "背景", "questions": []},
-                                {"stage": "细节", "questions": []},
-                                {"stage": "结论", "questions": []},
-                            ],
-                        },
-                        ensure_ascii=False,
-                    ),
-                },
-            ]
-            buffer: list[str] = []
-            try:
-                async for chunk in llm.chat_stream(
-                    messages,
-                    model=settings.ark_outline_model_id or settings.ark_model_id,
-                ):
-                    buffer.append(chunk)
-                raw = "".join(buffer).strip()
-                if raw:
-                    payload = _coerce_outline_payload(raw)
-                    if payload:
-                        blueprint = []
-                        for section in payload:
-                            stage = section.get("stage")
-                            questions = section.get("questions") or []
-                            if not stage or not isinstance(questions, list):
-                                continue
-                            normalized = [
-                                str(question).strip()
-                                for question in questions
-                                if str(question).strip()
-                            ]
-                            if normalized:
-                                blueprint.append((str(stage), normalized))
-            except (llm.LLMNotConfiguredError, json.JSONDecodeError, TypeError, ValueError) as exc:
-                LOGGER.warning("Ark outline generation failed, falling back to defaults: %s", exc)
-                blueprint = None
-        if blueprint is None:
-            blueprint = list(seeds or DEFAULT_STAGES)
-            
-        sections = [
-            PlanSection(
-                stage=stage,
-                questions=[PlanQuestion(question=q) for q in questions],
+        """Return the outline for ``topic``.
+
+        ``on_section`` is called with each section as soon as its JSON object
+        is complete in the LLM stream; it is not called when the outline comes
+        from the cache or the defaults. ``priority`` is the admission class of
+        the LLM request; a ``BATCH`` request shed by the admission queue raises
+        :class:`~app.core.llm.LLMQueueFullError` instead of returning defaults.
+        """
+
+        if not settings.llm_credentials_ready:
+            return _to_plan(topic, list(seeds or DEFAULT_STAGES))
+
+        key = self.cache_key(topic)
+
+        async def create() -> tuple[PlanResponse, bool]:
+            similar = await self._similar_outline(topic)
+            if similar is not None:
+                return similar, True
+            blueprint = await self._generate(topic, on_section, priority)
+            if blueprint is None:
+                return _to_plan(topic, list(seeds or DEFAULT_STAGES)), False
+            if blueprint:
+                index = self._index()
+                if index is not None:
+                    index.add(key, topic)
+            return _to_plan(topic, blueprint), bool(blueprint)
+
+        try:
+            outline = await self.cache.get_or_create(
+                key,
+                create,
+                topic=topic,
+                model=self.model,
+                prompt_version=PROMPT_VERSION,
             )
-            for stage, questions in blueprint
+        except llm.LLMQueueFullError as exc:
+            # 按各自优先级处理：批量请求交给调用方报告 fallback，交互请求退回默认提纲
+            if priority == llm.LLMPriority.BATCH:
+                raise
+            LOGGER.warning("Ark outline generation shed by admission queue, falling back to defaults: %s", exc)
+            return _to_plan(topic, list(seeds or DEFAULT_STAGES))
+        if outline.topic != topic:
+            outline = outline.model_copy(update={"topic": topic})
+        return outline
+
+    async def peek(self, topic: str) -> PlanResponse | None:
+        """Return an outline for ``topic`` only if it is available without an LLM call."""
+
+        if not settings.llm_credentials_ready:
+            return _to_plan(topic, list(DEFAULT_STAGES))
+        outline = await self.cache.get(self.cache_key(topic))
+        if outline is None:
+            outline = await self._similar_outline(topic)
+        if outline is not None and outline.topic != topic:
+            outline = outline.model_copy(update={"topic": topic})
+        return outline
+
+    def preliminary(self, topic: str) -> PlanResponse:
+        """The default-stage outline used while the real one is being generated."""
+
+        return _to_plan(topic, list(DEFAULT_STAGES))
+
+    async def build_many(
+        self,
+        topics: Iterable[str],
+        concurrency: int,
+    ) -> AsyncIterator[tuple[int, PlanResponse, Exception | None]]:
+        """Build outlines for ``topics`` and yield ``(index, outline, error)`` as each completes.
+
+        At most ``concurrency`` outlines are generated at once; duplicate
+        topics share one generation through the cache. A failing item (also
+        one shed by the LLM admission queue) yields the default outline
+        together with the error instead of aborting.
+        """
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(index: int, topic: str) -> tuple[int, PlanResponse, Exception | None]:
+            async with semaphore:
+                try:
+                    # 生成在缓存的独立任务中进行：批量请求被取消时仍会完成并写入缓存
+                    outline = await self.build(topic, priority=llm.LLMPriority.BATCH)
+                    return index, outline, None
+                except Exception as exc:
+                    LOGGER.warning("Batch outline failed for %r, using defaults: %s", topic, exc)
+                    return index, _to_plan(topic, list(DEFAULT_STAGES)), exc
+
+        tasks = [asyncio.create_task(run(index, topic)) for index, topic in enumerate(topics)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream(
+        self,
+        topic: str,
+        seeds: Iterable[tuple[str, list[str]]] | None = None,
+    ) -> AsyncIterator[PlanSection | PlanResponse]:
+        """Yield sections as they are generated, then the final validated outline.
+
+        The final :class:`PlanResponse` is authoritative; sections streamed
+        before it are a preview. Cached outlines are replayed section by section.
+        """
+
+        queue: asyncio.Queue[PlanSection | None] = asyncio.Queue()
+        # 客户端断开时不取消生成：结果仍会写入缓存，合并等待的请求也不受影响
+        task = asyncio.create_task(self.build(topic, seeds, on_section=queue.put_nowait))
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        streamed = 0
+        while (section := await queue.get()) is not None:
+            streamed += 1
+            yield section
+        outline = await task
+        if not streamed:
+            for section in outline.sections:
+                yield section
+        yield outline
+
+    async def invalidate(self, topic: str | None = None) -> int:
+        if topic is None:
+            for index in self._indexes.values():
+                index.clear()
+            return await self.cache.invalidate(None)
+        key = self.cache_key(topic)
+        for index in self._indexes.values():
+            index.remove(key)
+        return await self.cache.invalidate(key)
+
+    async def warm_index(self) -> int:
+        """Load previously generated topics into the similarity index."""
+
+        index = self._index()
+        if index is None:
+            return 0
+        for key, topic in await self.cache.stored_topics(self.model, PROMPT_VERSION):
+            index.add(key, topic)
+        return len(index)
+
+    def stats(self) -> dict:
+        index = self._indexes.get((self.model, PROMPT_VERSION))
+        return {
+            "cache": self.cache.stats(),
+            "topic_index": index.stats() if index is not None else None,
+            "llm_calls_saved": self.llm_calls_saved,
+        }
+
+    def _index(self) -> TopicIndex | None:
+        if np is None or settings.outline_topic_match_threshold > 1:
+            return None
+        namespace = (self.model, PROMPT_VERSION)
+        index = self._indexes.get(namespace)
+        if index is None:
+            index = self._indexes[namespace] = TopicIndex()
+        return index
+
+    async def _similar_outline(self, topic: str) -> PlanResponse | None:
+        """Reuse the outline of a near-duplicate topic seen before, if any."""
+
+        index = self._index()
+        if index is None:
+            return None
+        match = index.query(topic, settings.outline_topic_match_threshold)
+        if match is None:
+            return None
+        outline = await self.cache.get(match.key)
+        if outline is None:
+            # 缓存已过期或被淘汰，索引项随之作废
+            index.remove(match.key)
+            return None
+        self.llm_calls_saved += 1
+        LOGGER.info("Reusing outline of %r for %r (score=%.2f)", match.topic, topic, match.score)
+        return outline.model_copy(update={"topic": topic})
+
+    async def _generate(
+        self,
+        topic: str,
+        on_section: Callable[[PlanSection], None] | None = None,
+        priority: llm.LLMPriority = llm.LLMPriority.SETUP,
+    ) -> list[tuple[str, list[str]]] | None:
+        messages = [
+            {
+                "role": "system",
+                "content": (
+                    "你是采访提纲助手，请基于主题生成三级递进的访谈提纲。"
+                    "确保问题覆盖背景、细节、指标与行动项，回答 JSON 数组。"
+                ),
+            },
+            {
+                "role": "user",
+                "content": json.dumps(
+                    {
+                        "topic": topic,
+                        "format": [
+                            {"stage": "背景", "questions": []},
+                            {"stage": "细节", "questions": []},
+                            {"stage": "结论", "questions": []},
+                        ],
+                    },
+                    ensure_ascii=False,
+                ),
+            },
         ]
-        return PlanResponse(topic=topic, sections=sections)
+        buffer: list[str] = []
+        blueprint: list[tuple[str, list[str]]] | None = None
+        objects = JsonObjectStream() if on_section is not None else None
+        try:
+            async for chunk in llm.chat_stream(messages, model=self.model, priority=priority):
+                buffer.append(chunk)
+                if objects is not None:
+                    for value in objects.feed(chunk):
+                        section = _normalize_section(value)
+                        if section is not None:
+                            on_section(_to_section(*section))
+            raw = "".join(buffer).strip()
+            if raw:
+                payload = _coerce_outline_payload(raw)
+                if payload:
+                    blueprint = []
+                    for section in payload:
+                        normalized = _normalize_section(section)
+                        if normalized is not None:
+                            blueprint.append(normalized)
+        except (llm.LLMNotConfiguredError, json.JSONDecodeError, TypeError, ValueError) as exc:
+            LOGGER.warning("Ark outline generation failed, falling back to defaults: %s", exc)
+            return None
+        return blueprint
+
+
+def _normalize_section(section: Any) -> tuple[str, list[str]] | None:
+    if not isinstance(section, dict):
+        return None
+    stage = section.get("stage")
+    questions = section.get("questions") or []
+    if not stage or not isinstance(questions, list):
+        return None
+    normalized = [
+        str(question).strip()
+        for question in questions
+        if str(question).strip()
+    ]
+    if not normalized:
+        return None
+    return str(stage), normalized
+
+
+def _to_section(stage: str, questions: list[str]) -> PlanSection:
+    return PlanSection(
+        stage=stage,
+        questions=[PlanQuestion(question=q) for q in questions],
+    )
 
 
-outline_builder = OutlineBuilder()
+def _to_plan(topic: str, blueprint: list[tuple[str, list[str]]]) -> PlanResponse:
+    return PlanResponse(topic=topic, sections=[_to_section(stage, questions) for stage, questions in blueprint])
+
+
+outline_builder = OutlineBuilder(
+    OutlineCache(
+        ttl=settings.outline_cache_ttl_seconds,
+        memory_size=settings.outline_cache_memory_size,
+        persistent=True,
+    )
+)
 
 def _coerce_outline_payload(raw: str) -> list[dict[str, Any]] | None:
     """Attempt to extract a list of section payloads from ``raw`` text."""
@@ -123,15 +346,8 @@ def _coerce_outline_payload(raw: str) -> list[dict[str, Any]] | None:
         if normalized is not None:
             return normalized
 
-    decoder = json.JSONDecoder()
-    idx = 0
-    while idx < len(cleaned):
-        try:
-            value, next_idx = decoder.raw_decode(cleaned, idx)
-        except json.JSONDecodeError:
-            idx += 1
-            continue
-        idx = max(next_idx, idx + 1)
+    # 单遍括号匹配找出候选片段，只对候选做 JSON 解码（避免逐字符 raw_decode 的平方开销）
+    for value in iter_json_values(cleaned):
         normalized = _normalize(value)
         if normalized is not None:
             return normalized
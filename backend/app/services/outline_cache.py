@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from ..schemas import PlanResponse
+
+LOGGER = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\r\n.,;:!?。，、；：！？·…-—\"'“”‘’()（）[]【】《》"
+
+
+def normalize_topic(topic: str) -> str:
+    """Canonical form used for cache keys: NFKC, lower case, collapsed whitespace."""
+
+    text = unicodedata.normalize("NFKC", topic).lower()
+    text = _WHITESPACE.sub(" ", text)
+    return text.strip(_EDGE_PUNCTUATION)
+
+
+class OutlineCache:
+    """Outline cache with an LRU memory tier and an optional database tier.
+
+    Entries are keyed by normalized topic, model id and prompt version and
+    expire after ``ttl`` seconds. Concurrent misses on the same key share a
+    single generation.
+    """
+
+    def __init__(self, *, ttl: float, memory_size: int, persistent: bool = False) -> None:
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.persistent = persistent
+        self._memory: "OrderedDict[str, Tuple[float, PlanResponse]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[PlanResponse]"] = {}
+        self._counters: Dict[str, float] = {
+            "memory_hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "generation_ms": 0.0,
+            "lookup_ms": 0.0,
+            "lookups": 0,
+        }
+
+    @staticmethod
+    def make_key(topic: str, model: str, prompt_version: str) -> str:
+        raw = "\x1f".join((normalize_topic(topic), model, prompt_version))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get_or_create(
+        self,
+        key: str,
+        create: Callable[[], Awaitable[Tuple[PlanResponse, bool]]],
+        *,
+        topic: str = "",
+        model: str = "",
+        prompt_version: str = "",
+    ) -> PlanResponse:
+        """Return the cached outline for ``key`` or generate it once.
+
+        ``create`` returns ``(outline, cacheable)``; fallbacks (e.g. default
+        stages after an LLM error) should be returned with ``cacheable=False``.
+
+        Generation runs in a detached task shared by every concurrent caller:
+        cancelling one caller (e.g. a disconnected client) only stops its
+        wait, never the generation the others are waiting for.
+        """
+
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["misses"] += 1
+            pending = asyncio.create_task(
+                self._generate(key, create, topic=topic, model=model, prompt_version=prompt_version)
+            )
+            # 无人等待时避免 "exception was never retrieved"
+            pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._inflight[key] = pending
+        return await asyncio.shield(pending)
+
+    async def _generate(
+        self,
+        key: str,
+        create: Callable[[], Awaitable[Tuple[PlanResponse, bool]]],
+        *,
+        topic: str,
+        model: str,
+        prompt_version: str,
+    ) -> PlanResponse:
+        started = time.perf_counter()
+        try:
+            outline, cacheable = await create()
+            self._counters["generation_ms"] += (time.perf_counter() - started) * 1000
+            if cacheable:
+                await self.put(key, outline, topic=topic, model=model, prompt_version=prompt_version)
+            return outline
+        finally:
+            self._inflight.pop(key, None)
+
+    async def get(self, key: str) -> Optional[PlanResponse]:
+        started = time.perf_counter()
+        try:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, outline = entry
+                if time.time() - stored_at <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return outline
+                self._memory.pop(key, None)
+            if self.persistent:
+                stored = await self._load(key)
+                if stored is not None:
+                    stored_at, outline = stored
+                    self._remember(key, outline, stored_at)
+                    self._counters["store_hits"] += 1
+                    return outline
+            return None
+        finally:
+            self._counters["lookups"] += 1
+            self._counters["lookup_ms"] += (time.perf_counter() - started) * 1000
+
+    async def put(self, key: str, outline: PlanResponse, *, topic: str, model: str, prompt_version: str) -> None:
+        self._remember(key, outline, time.time())
+        if not self.persistent:
+            return
+        try:
+            from ..database import SessionLocal
+            from ..models import OutlineCacheEntry
+
+            async with SessionLocal() as db:
+                await db.merge(
+                    OutlineCacheEntry(
+                        key=key,
+                        topic=topic[:255],
+                        model=model,
+                        prompt_version=prompt_version,
+                        payload=outline.model_dump(),
+                        created_at=datetime.utcnow(),
+                    )
+                )
+                await db.commit()
+        except Exception as exc:
+            LOGGER.warning("Outline cache write failed: %s", exc)
+
+    async def invalidate(self, key: str | None = None) -> int:
+        """Drop one entry (or everything when ``key`` is None); returns memory entries removed."""
+
+        if key is None:
+            removed = len(self._memory)
+            self._memory.clear()
+        else:
+            removed = 1 if self._memory.pop(key, None) is not None else 0
+        if self.persistent:
+            try:
+                from ..database import SessionLocal
+                from ..models import OutlineCacheEntry
+
+                async with SessionLocal() as db:
+                    stmt = delete(OutlineCacheEntry)
+                    if key is not None:
+                        stmt = stmt.where(OutlineCacheEntry.key == key)
+                    await db.execute(stmt)
+                    await db.commit()
+            except Exception as exc:
+                LOGGER.warning("Outline cache invalidation failed: %s", exc)
+        return removed
+
+    async def stored_topics(self, model: str, prompt_version: str) -> List[Tuple[str, str]]:
+        """``(key, topic)`` pairs of unexpired persistent entries for one model/prompt."""
+
+        if not self.persistent:
+            return [(key, outline.topic) for key, (_, outline) in self._memory.items()]
+        try:
+            from ..database import SessionLocal
+            from ..models import OutlineCacheEntry
+
+            cutoff = datetime.utcnow() - timedelta(seconds=self.ttl)
+            async with SessionLocal() as db:
+                rows = await db.execute(
+                    select(OutlineCacheEntry.key, OutlineCacheEntry.topic).where(
+                        OutlineCacheEntry.model == model,
+                        OutlineCacheEntry.prompt_version == prompt_version,
+                        OutlineCacheEntry.created_at >= cutoff,
+                    )
+                )
+                return [(key, topic) for key, topic in rows.all()]
+        except Exception as exc:
+            LOGGER.warning("Outline cache scan failed: %s", exc)
+            return []
+
+    def stats(self) -> Dict[str, float]:
+        c = self._counters
+        hits = c["memory_hits"] + c["store_hits"]
+        total = hits + c["misses"] + c["coalesced"]
+        return {
+            "entries": len(self._memory),
+            "memory_hits": int(c["memory_hits"]),
+            "store_hits": int(c["store_hits"]),
+            "misses": int(c["misses"]),
+            "coalesced": int(c["coalesced"]),
+            "hit_rate": round((hits + c["coalesced"]) / total, 3) if total else 0.0,
+            "avg_lookup_ms": round(c["lookup_ms"] / c["lookups"], 3) if c["lookups"] else 0.0,
+            "avg_generation_ms": round(c["generation_ms"] / c["misses"], 1) if c["misses"] else 0.0,
+        }
+
+    def _remember(self, key: str, outline: PlanResponse, stored_at: float) -> None:
+        self._memory[key] = (stored_at, outline)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    async def _load(self, key: str) -> Optional[Tuple[float, PlanResponse]]:
+        try:
+            from ..database import SessionLocal
+            from ..models import OutlineCacheEntry
+
+            async with SessionLocal() as db:
+                entry = await db.get(OutlineCacheEntry, key)
+                if entry is None:
+                    return None
+                if datetime.utcnow() - entry.created_at > timedelta(seconds=self.ttl):
+                    await db.delete(entry)
+                    await db.commit()
+                    return None
+                stored_at = entry.created_at.replace(tzinfo=timezone.utc).timestamp()
+                return stored_at, PlanResponse.model_validate(entry.payload)
+        except Exception as exc:
+            LOGGER.warning("Outline cache read failed: %s", exc)
+            return None
+
+
+__all__ = ["OutlineCache", "normalize_topic"]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+from .topic_index import np, topic_ngrams
+
+# 提问的套话不代表问题内容，向量化前去掉
+_QUESTION_FILLER = re.compile(
+    r"请问|请|您|你们|你|能否|能不能|可以|可不可以|一下|谈谈|说说|讲讲|介绍|具体|"
+    r"如何|怎么样|怎么|怎样|什么|哪些|哪个|是否|有没有|多少|吗|呢|吧|"
+    r"目前|当前|现在|这个|那个|情况|方面|的|了|与|和|及"
+)
+
+
+def question_ngrams(text: str):
+    return topic_ngrams(_QUESTION_FILLER.sub(" ", text))
+
+
+class OutlineVectors:
+    """TF-IDF character n-gram vectors of every outline question, built once per outline.
+
+    Stored in the same flat sparse layout as :class:`TopicIndex` (question
+    id, vocabulary column, weight), with each question vector L2-normalised.
+    :meth:`scores` returns, for every question at once, the share of its
+    squared TF-IDF mass whose n-grams occur in the answer: 1.0 means every
+    content n-gram of the question was mentioned. Unlike cosine similarity
+    this does not penalise long answers that also talk about other things.
+    """
+
+    def __init__(self, questions: Tuple[str, ...]) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for OutlineVectors")
+        self.size = len(questions)
+        vocab: dict = {}
+        docs: List[int] = []
+        cols: List[int] = []
+        counts: List[float] = []
+        for qid, question in enumerate(questions):
+            for gram, count in question_ngrams(question).items():
+                docs.append(qid)
+                cols.append(vocab.setdefault(gram, len(vocab)))
+                counts.append(float(count))
+        self.vocab = vocab
+        doc_arr = np.asarray(docs, dtype=np.int64)
+        col_arr = np.asarray(cols, dtype=np.int64)
+        df = np.bincount(col_arr, minlength=len(vocab)).astype(np.float32)
+        idf = (np.log((1.0 + self.size) / (1.0 + df)) + 1.0).astype(np.float32)
+        weights = np.asarray(counts, dtype=np.float32) * idf[col_arr]
+        norms = np.sqrt(np.bincount(doc_arr, weights=weights * weights, minlength=self.size))
+        norms[norms == 0] = 1.0
+        normalized = weights / norms[doc_arr]
+        self._doc_arr = doc_arr
+        self._col_arr = col_arr
+        self._mass = (normalized * normalized).astype(np.float32)
+
+    def scores(self, answer: str):
+        """Coverage score of every question by ``answer`` (array of length ``size``)."""
+
+        present = np.zeros(len(self.vocab), dtype=np.float32)
+        for gram in question_ngrams(answer):
+            col = self.vocab.get(gram)
+            if col is not None:
+                present[col] = 1.0
+        return np.bincount(self._doc_arr, weights=self._mass * present[self._col_arr], minlength=self.size)
+
+
+@lru_cache(maxsize=512)
+def outline_vectors(questions: Tuple[str, ...]) -> OutlineVectors:
+    return OutlineVectors(questions)
+
+
+def covered_questions(questions: Tuple[str, ...], answer: str, threshold: float) -> List[int]:
+    """Ids of the outline questions that ``answer`` covers at or above ``threshold``."""
+
+    if np is None or not questions or threshold > 1 or not answer.strip():
+        return []
+    scores = outline_vectors(questions).scores(answer)
+    return [int(qid) for qid in np.flatnonzero(scores >= threshold - 1e-6)]
+
+
+__all__ = ["OutlineVectors", "covered_questions", "outline_vectors", "question_ngrams"]
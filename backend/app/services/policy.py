@@ -2,10 +2,16 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Optional
 
 from ..config import settings
 from ..core import llm
+from ..core.json_stream import JsonStringFieldExtractor
+from ..core.llm_hedge import HedgedStreams
+from .policy_memo import policy_memo
+from .prompt_context import build_policy_payload, estimate_tokens, prompt_budget, prompt_stats, uncapped_tokens
 from .state_machine import ConversationState
 
 LOGGER = logging.getLogger(__name__)
@@ -22,35 +28,90 @@ class PolicyError(RuntimeError):
     """Raised when policy decision generation fails."""
 
 
-async def decide_policy(state: ConversationState) -> PolicyDecision:
+class PolicyBackpressureError(PolicyError):
+    """The local LLM admission queue rejected the call; the upstream was never asked."""
+
+
+# 策略调用的对冲请求：首 token 慢于近期 P90 时再发一份，先出 token 者胜
+policy_hedger = HedgedStreams(
+    percentile=settings.policy_hedge_percentile,
+    max_ratio=settings.policy_hedge_max_ratio,
+    min_delay=settings.policy_hedge_min_delay_ms / 1000,
+)
+
+
+async def decide_policy(
+    state: ConversationState,
+    *,
+    on_question: Optional[Callable[[str], None]] = None,
+) -> PolicyDecision:
+    """Ask the policy model for the next action.
+
+    When ``on_question`` is given it receives the ``question`` text piece by
+    piece while the response is still streaming; the complete response is
+    validated as before once the stream ends. With ``POLICY_HEDGE_ENABLED``
+    a slow-starting request is hedged by :data:`policy_hedger`, and for
+    models listed in ``POLICY_MEMO_MODELS`` an identical prompt seen before
+    is answered from :data:`policy_memo` without calling the LLM.
+
+    The prompt is built within the model's token budget (see
+    :func:`build_policy_payload`); older turns reach the model through the
+    rolling summary.
+    """
+
     if not settings.llm_credentials_ready:
         raise PolicyError("Ark credentials missing")
 
-    payload = {
-        "topic": state.topic,
-        "stage": state.stage.value,
-        "coverage": round(state.coverage(), 3),
-        "pending_clarifications": list(state.pending_clarifications),
-        "recent_turns": state.recent_turns(),
-    }
+    model = settings.ark_policy_model_id or settings.ark_model_id
     system_prompt = (
         "你是采访策略助手，需要根据最近的对话、提纲覆盖率和待澄清事项，"
         "选择下一步行动（ask/followup/clarify/regress/close），并给出追问。"
         "返回 JSON：{\"action\":..., \"question\":..., \"rationale\":...}。"
     )
+    payload, payload_tokens = build_policy_payload(state, prompt_budget(model) - estimate_tokens(system_prompt))
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": json.dumps(payload, ensure_ascii=False)},
     ]
+    memo_key = policy_memo.make_key(model, system_prompt, payload) if policy_memo.enabled_for(model) else None
+    if memo_key is not None:
+        cached = policy_memo.get(memo_key)
+        if cached is not None:
+            if on_question is not None:
+                on_question(cached.question)
+            return cached
     chunks: list[str] = []
-    try:
-        async for part in llm.chat_stream(
+    question_stream = JsonStringFieldExtractor("question") if on_question else None
+
+    def request() -> AsyncIterator[str]:
+        return llm.chat_stream(
             messages,
-            model=settings.ark_policy_model_id or settings.ark_model_id,
-        ):
+            model=model,
+            priority=llm.LLMPriority.LIVE,
+        )
+
+    stream = policy_hedger.stream(request) if settings.policy_hedge_enabled else request()
+    started = time.perf_counter()
+    ttft: Optional[float] = None
+    try:
+        async for part in stream:
+            if ttft is None:
+                ttft = time.perf_counter() - started
             chunks.append(part)
+            if question_stream is not None:
+                piece = question_stream.feed(part)
+                if piece:
+                    on_question(piece)
     except llm.LLMNotConfiguredError as exc:
         raise PolicyError("Ark credentials missing") from exc
+    except llm.LLMQueueFullError as exc:
+        raise PolicyBackpressureError("LLM admission queue full") from exc
+    finally:
+        prompt_stats.record(
+            estimate_tokens(system_prompt) + payload_tokens,
+            uncapped_tokens(state, system_prompt),
+            ttft,
+        )
     raw = "".join(chunks).strip()
     if not raw:
         raise PolicyError("Empty response from policy model")
@@ -67,7 +128,10 @@ async def decide_policy(state: ConversationState) -> PolicyDecision:
     if action not in {"ask", "followup", "clarify", "regress", "close"}:
         LOGGER.debug("Unexpected action '%s' from policy, defaulting to ask", action)
         action = "ask"
-    return PolicyDecision(action=action, question=question, rationale=rationale)
+    decision = PolicyDecision(action=action, question=question, rationale=rationale)
+    if memo_key is not None:
+        policy_memo.put(memo_key, decision)
+    return decision
 
 
-__all__ = ["PolicyDecision", "PolicyError", "decide_policy"]
\ No newline at end of file
+__all__ = ["PolicyBackpressureError", "PolicyDecision", "PolicyError", "decide_policy", "policy_hedger"]
\ No newline at end of file
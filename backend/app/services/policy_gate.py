@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..config import settings
+from .extraction import extractor
+from .policy import PolicyDecision
+from .state_machine import InterviewStage, StateMachine
+
+# 回答中出现这些词时往往有值得追问的转折或隐情，交给 LLM 判断
+FOLLOWUP_CUES = ("但是", "不过", "然而", "其实", "问题是", "没想到", "原因")
+MIN_ANSWER_CHARS = 8
+MAX_ANSWER_CHARS = 150
+FOLLOWUP_QUESTION = "能结合一个具体的例子再展开说说吗？"
+# 追问时引用的含糊原话不超过该长度，否则交给 LLM 组织问题
+MAX_QUOTE_CHARS = 30
+_SENTENCE_END = re.compile(r"[。！？!?；;\n]")
+_TRAILING_PUNCT = "，,、。！？!?；;：: "
+
+
+@dataclass
+class LocalAssessment:
+    decision: PolicyDecision
+    confidence: float
+    reason: str
+
+
+def vague_sentence(answer: str) -> Optional[str]:
+    """The sentence of ``answer`` containing the first fuzzy marker, if short enough to quote."""
+
+    engine = extractor.engine
+    for marker_start, marker_end in engine.marker_spans(engine.finditer(answer)):
+        starts = [m.end() for m in _SENTENCE_END.finditer(answer, 0, marker_start)]
+        end = _SENTENCE_END.search(answer, marker_end)
+        sentence = answer[starts[-1] if starts else 0 : end.start() if end else len(answer)]
+        sentence = sentence.strip().rstrip(_TRAILING_PUNCT)
+        return sentence if len(sentence) <= MAX_QUOTE_CHARS else None
+    return None
+
+
+def assess_local(machine: StateMachine) -> LocalAssessment:
+    """Rule-based decision for the current state and how sure we are the LLM would agree.
+
+    A pending clarification is confident only when the question can quote
+    the vague sentence of the last answer, and the closing question only
+    the first time it is asked; moving to the next outline question is
+    only confident when the last answer was neither a one-liner nor a long
+    answer with a turn worth following up on. A one-line answer gets a
+    generic follow-up.
+    """
+
+    data = machine.data
+    decision = machine.rule_based_decision()
+    last = data.turn_history[-1] if data.turn_history else None
+    answer = last["content"] if last is not None and last["role"] == "user" else None
+    if data.pending_clarifications:
+        quote = vague_sentence(answer) if answer else None
+        if quote is None:
+            return LocalAssessment(decision, 0.5, "pending_clarification")
+        clarify = PolicyDecision(
+            action="clarify",
+            question=f"您提到“{quote}”，能再具体说明一下吗？",
+            rationale="rule-based clarify",
+        )
+        return LocalAssessment(clarify, 0.95, "pending_clarification")
+    if data.stage == InterviewStage.CLOSING:
+        asked = decision.question in data.summary or any(
+            turn["role"] == "assistant" and turn["content"] == decision.question for turn in data.turn_history
+        )
+        return LocalAssessment(decision, 0.3 if asked else 0.9, "closing")
+    if data.next_unanswered() is None:
+        return LocalAssessment(decision, 0.3, "outline_exhausted")
+    if answer is None:
+        return LocalAssessment(decision, 0.6, "no_answer")
+    if len(answer) < MIN_ANSWER_CHARS:
+        followup = PolicyDecision(action="followup", question=FOLLOWUP_QUESTION, rationale="rule-based followup")
+        return LocalAssessment(followup, 0.5, "short_answer")
+    if len(answer) > MAX_ANSWER_CHARS or any(cue in answer for cue in FOLLOWUP_CUES):
+        return LocalAssessment(decision, 0.6, "open_ended")
+    return LocalAssessment(decision, 0.9, "next_question")
+
+
+class PolicyGate:
+    """Answer turns locally when the rule-based decision is unambiguous.
+
+    Only decisions whose confidence reaches HYBRID_POLICY_MIN_CONFIDENCE are
+    taken locally; everything else still goes to the policy LLM. Latency
+    saved is estimated from the observed LLM decision time.
+    """
+
+    def __init__(self) -> None:
+        self.local = 0
+        self.remote = 0
+        self.reasons: Dict[str, int] = {}
+        self.llm_seconds = 0.0
+        self.llm_timed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.hybrid_policy_enabled
+
+    def decide(self, machine: StateMachine) -> Optional[PolicyDecision]:
+        """The local decision, or ``None`` when the LLM should be consulted."""
+
+        if not self.enabled:
+            return None
+        assessment = self.confident(machine)
+        if assessment is None:
+            self.remote += 1
+            return None
+        self.local += 1
+        self.reasons[assessment.reason] = self.reasons.get(assessment.reason, 0) + 1
+        decision = assessment.decision
+        return PolicyDecision(
+            action=decision.action,
+            question=decision.question,
+            rationale=f"local policy ({assessment.reason}, confidence={assessment.confidence:.2f})",
+        )
+
+    def confident(self, machine: StateMachine) -> Optional[LocalAssessment]:
+        if not self.enabled:
+            return None
+        assessment = assess_local(machine)
+        if assessment.confidence < settings.hybrid_policy_min_confidence:
+            return None
+        return assessment
+
+    def record_llm_latency(self, seconds: float) -> None:
+        self.llm_seconds += seconds
+        self.llm_timed += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        total = self.local + self.remote
+        avg_llm = self.llm_seconds / self.llm_timed if self.llm_timed else 0.0
+        return {
+            "enabled": self.enabled,
+            "local": self.local,
+            "llm": self.remote,
+            "local_ratio": round(self.local / total, 3) if total else 0.0,
+            "reasons": dict(self.reasons),
+            "avg_llm_ms": round(avg_llm * 1000, 1),
+            "saved_ms_estimate": round(self.local * avg_llm * 1000, 1),
+        }
+
+
+policy_gate = PolicyGate()
+
+
+__all__ = ["FOLLOWUP_QUESTION", "LocalAssessment", "PolicyGate", "assess_local", "policy_gate", "vague_sentence"]
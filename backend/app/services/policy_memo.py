@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from ..config import settings
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .policy import PolicyDecision
+
+# 覆盖率按 0.1 分桶：0.42 与 0.44 的会话在策略上几乎没有区别
+COVERAGE_BUCKET = 0.1
+
+
+class PolicyMemo:
+    """Memoize policy decisions by a canonical hash of the prompt.
+
+    The key covers the model, the system prompt and the whole payload
+    (coverage bucketed to :data:`COVERAGE_BUCKET`), so entries only match
+    when stage, pending clarifications, summary and ``recent_turns`` are all
+    identical. Entries expire after ``ttl`` seconds; at most ``max_size``
+    are kept (least recently used evicted first).
+    """
+
+    def __init__(self, *, ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, PolicyDecision]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    @staticmethod
+    def enabled_for(model: Optional[str]) -> bool:
+        models = settings.policy_memo_models
+        return "*" in models or (model or "") in models
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, payload: Dict[str, object]) -> str:
+        canonical = dict(payload)
+        coverage = canonical.get("coverage")
+        if isinstance(coverage, (int, float)):
+            # 先按 6 位小数取整再向下取整：0.3 / 0.1 == 2.9999999999999996 也落在 0.3 这一档
+            canonical["coverage"] = round(math.floor(round(coverage / COVERAGE_BUCKET, 6)) * COVERAGE_BUCKET, 3)
+        raw = json.dumps(
+            {"model": model, "system": system_prompt, "payload": canonical},
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional["PolicyDecision"]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, decision = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return replace(decision)
+
+    def put(self, key: str, decision: "PolicyDecision") -> None:
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (time.monotonic(), replace(decision))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+policy_memo = PolicyMemo(ttl=settings.policy_memo_ttl_seconds, max_size=settings.policy_memo_size)
+
+
+__all__ = ["COVERAGE_BUCKET", "PolicyMemo", "policy_memo"]
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config import settings
+from .state_machine import ConversationState
+
+_CJK = re.compile(r"[\u2e80-\u9fff\u3000-\u303f\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+_SPACE = re.compile(r"\s")
+_SENTENCE_END = re.compile(r"(?<=[。！？!?；;\n])")
+_DIGITS = re.compile(r"\d")
+
+# 每条对话在 JSON 中的固定开销（role 字段、引号、括号）
+_TURN_OVERHEAD = 8
+_ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: one token per CJK character, ~4 characters per token otherwise."""
+
+    if not text:
+        return 0
+    cjk = len(_CJK.findall(text))
+    other = len(text) - cjk - len(_SPACE.findall(text))
+    return cjk + (other + 3) // 4
+
+
+def clip_text(text: str, max_tokens: int) -> str:
+    """Shorten ``text`` to about ``max_tokens``, keeping its head and tail."""
+
+    tokens = estimate_tokens(text)
+    if tokens <= max_tokens:
+        return text
+    keep = max(1, len(text) * max(max_tokens, 1) // tokens - 1)
+    head = keep * 2 // 3 or 1
+    tail = keep - head
+    return text[:head] + _ELLIPSIS + (text[-tail:] if tail > 0 else "")
+
+
+def key_sentences(text: str, max_tokens: int) -> str:
+    """The most informative sentences of an answer (figures first), in original order."""
+
+    sentences = [part.strip() for part in _SENTENCE_END.split(text) if part.strip()]
+    if len(sentences) <= 1:
+        return clip_text(text.strip(), max_tokens)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda i: (bool(_DIGITS.search(sentences[i])), i == 0, -i),
+        reverse=True,
+    )
+    chosen: List[int] = []
+    used = 0
+    for i in ranked:
+        cost = estimate_tokens(sentences[i])
+        if chosen and used + cost > max_tokens:
+            continue
+        chosen.append(i)
+        used += cost
+    return clip_text("".join(sentences[i] for i in sorted(chosen)), max_tokens)
+
+
+def summarize_turns(summary: str, turns: Iterable[dict], max_tokens: int) -> str:
+    """Fold ``turns`` into the rolling ``summary`` (one line per question/answer pair).
+
+    The summary is extractive, so updating it costs no LLM call; when it
+    outgrows ``max_tokens`` the oldest lines are dropped.
+    """
+
+    lines = summary.splitlines() if summary else []
+    question: Optional[str] = None
+    for turn in turns:
+        content = turn["content"]
+        if turn["role"] == "assistant":
+            if question is not None:
+                lines.append(f"问：{question}")
+            question = clip_text(content, 40)
+            continue
+        answer = key_sentences(content, 60)
+        lines.append(f"问：{question} 答：{answer}" if question else f"答：{answer}")
+        question = None
+    if question is not None:
+        lines.append(f"问：{question}")
+    return _trim_lines(lines, max_tokens)
+
+
+def update_summary(state: ConversationState, max_tokens: Optional[int] = None) -> bool:
+    """Fold turns evicted from the history into ``state.summary``; returns whether it changed."""
+
+    turns = state.take_evicted_turns()
+    if not turns:
+        return False
+    limit = settings.conversation_summary_tokens if max_tokens is None else max_tokens
+    state.summary = summarize_turns(state.summary, turns, limit)
+    return True
+
+
+def prompt_budget(model: Optional[str]) -> int:
+    """Prompt token budget for ``model`` (PROMPT_TOKEN_BUDGETS overrides POLICY_PROMPT_TOKENS)."""
+
+    return settings.prompt_token_budgets.get(model or "", settings.policy_prompt_tokens)
+
+
+def build_policy_payload(state: ConversationState, max_tokens: int) -> Tuple[Dict[str, object], int]:
+    """Policy prompt payload that fits in ``max_tokens``; returns it with its estimated size.
+
+    Topic, stage, coverage and pending clarifications are always sent.
+    Turns are added newest first (each clipped to a quarter of the budget,
+    the newest one always kept) until the budget is used up; the rolling
+    summary of older turns gets whatever is left, newest lines first.
+    """
+
+    payload: Dict[str, object] = {
+        "topic": state.topic,
+        "stage": state.stage.value,
+        "coverage": round(state.coverage(), 3),
+        "pending_clarifications": list(state.pending_clarifications),
+    }
+    used = _json_tokens(payload) + _TURN_OVERHEAD
+    turn_cap = max(32, max_tokens // 4)
+    turns: List[dict] = []
+    for turn in reversed(state.turn_history):
+        content = clip_text(turn["content"], turn_cap)
+        cost = estimate_tokens(content) + _TURN_OVERHEAD
+        if turns and used + cost > max_tokens:
+            break
+        turns.append({"role": turn["role"], "content": content})
+        used += cost
+    turns.reverse()
+    if state.summary:
+        summary = _trim_lines(state.summary.splitlines(), max_tokens - used - _TURN_OVERHEAD)
+        if summary:
+            payload["summary"] = summary
+            used += estimate_tokens(summary) + _TURN_OVERHEAD
+    payload["recent_turns"] = turns
+    return payload, used
+
+
+class PromptStats:
+    """Process-wide policy prompt size and time-to-first-token counters."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.uncapped_tokens = 0
+        self.ttft_total = 0.0
+        self.ttft_count = 0
+
+    def record(self, prompt_tokens: int, uncapped_tokens: int, ttft: Optional[float]) -> None:
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.uncapped_tokens += uncapped_tokens
+        if ttft is not None:
+            self.ttft_total += ttft
+            self.ttft_count += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.calls, 1) if self.calls else 0.0,
+            "avg_uncapped_tokens": round(self.uncapped_tokens / self.calls, 1) if self.calls else 0.0,
+            "avg_ttft_ms": round(self.ttft_total / self.ttft_count * 1000, 1) if self.ttft_count else 0.0,
+        }
+
+
+prompt_stats = PromptStats()
+
+
+def uncapped_tokens(state: ConversationState, system_prompt: str) -> int:
+    """Size the prompt would have without a budget (all recent turns verbatim)."""
+
+    payload = {
+        "topic": state.topic,
+        "stage": state.stage.value,
+        "coverage": round(state.coverage(), 3),
+        "pending_clarifications": list(state.pending_clarifications),
+        "recent_turns": state.recent_turns(),
+    }
+    return estimate_tokens(system_prompt) + _json_tokens(payload)
+
+
+def _json_tokens(value: object) -> int:
+    return estimate_tokens(json.dumps(value, ensure_ascii=False))
+
+
+def _trim_lines(lines: List[str], max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    kept: List[str] = []
+    used = 0
+    for line in reversed(lines):
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(reversed(kept))
+
+
+__all__ = [
+    "PromptStats",
+    "build_policy_payload",
+    "clip_text",
+    "estimate_tokens",
+    "key_sentences",
+    "prompt_budget",
+    "prompt_stats",
+    "summarize_turns",
+    "uncapped_tokens",
+    "update_summary",
+]
+
@@ -0,0 +1,233 @@
+"""Rebuild the stored notes of past sessions with the current extraction rules.
+
+User turns are read in keyset-paginated chunks (ordered by session, on
+the ``ix_turns_session_id_id`` index), extracted in a process pool and
+each session's notes are replaced in one transaction. The id of the last rewritten session is written to
+``--checkpoint`` so an interrupted run continues where it stopped.
+
+Run from ``backend/``::
+
+    python -m app.services.reextraction [--chunk-size 2000] [--workers 4] [--checkpoint reextract.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from ..models import Note, Turn
+from .extraction import extractor
+
+LOGGER = logging.getLogger(__name__)
+
+# (turn id, session id, created_at)
+TurnKey = Tuple[int, int, datetime]
+
+
+@dataclass
+class ReextractionReport:
+    sessions: int = 0
+    turns: int = 0
+    notes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.turns / self.seconds if self.seconds > 0 else 0.0
+
+
+def extract_chunk(transcripts: Sequence[str]) -> List[List[tuple]]:
+    """Process-pool worker: notes of every transcript as plain tuples."""
+
+    return [
+        [(note.category, note.content, note.confidence, note.requires_clarification) for note in notes]
+        for notes in extractor.extract_batch(transcripts)
+    ]
+
+
+def load_checkpoint(path: Optional[Path]) -> int:
+    if path is None or not path.exists():
+        return 0
+    return int(json.loads(path.read_text(encoding="utf-8"))["session_id"])
+
+
+def save_checkpoint(path: Optional[Path], session_id: int) -> None:
+    if path is None:
+        return
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"session_id": session_id}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+async def fetch_chunk(
+    session_factory: async_sessionmaker[AsyncSession],
+    after: Tuple[int, Optional[int]],
+    size: int,
+) -> Tuple[List[TurnKey], List[str]]:
+    """The next ``size`` user turns after ``(session_id, turn_id)`` (``turn_id=None``: after the whole session).
+
+    Live extraction only runs on the interviewee's answers, so other
+    speakers never produce notes.
+    """
+
+    session_id, turn_id = after
+    condition = Turn.session_id > session_id
+    if turn_id is not None:
+        condition = or_(condition, and_(Turn.session_id == session_id, Turn.id > turn_id))
+    stmt = (
+        select(Turn.id, Turn.session_id, Turn.created_at, Turn.transcript)
+        .where(condition, Turn.speaker == "user")
+        .order_by(Turn.session_id, Turn.id)
+        .limit(size)
+    )
+    async with session_factory() as db:
+        rows = (await db.execute(stmt)).all()
+    return [(row.id, row.session_id, row.created_at) for row in rows], [row.transcript or "" for row in rows]
+
+
+async def ensure_keyset_index(engine: AsyncEngine) -> None:
+    """Create the ``(session_id, id)`` index on databases whose ``turns`` table predates it."""
+
+    index = next(index for index in Turn.__table__.indexes if index.name == "ix_turns_session_id_id")
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+
+
+async def replace_notes(
+    session_factory: async_sessionmaker[AsyncSession],
+    session_id: int,
+    rows: List[dict],
+) -> None:
+    async with session_factory() as db:
+        async with db.begin():
+            await db.execute(delete(Note).where(Note.session_id == session_id))
+            if rows:
+                await db.execute(insert(Note), rows)
+
+
+async def reextract_notes(
+    session_factory: async_sessionmaker[AsyncSession],
+    chunk_size: int = 2000,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 2,
+    checkpoint: Optional[Path] = None,
+    dry_run: bool = False,
+    report_every: float = 5.0,
+) -> ReextractionReport:
+    """Replace the notes of every session after the checkpoint; see the module docstring.
+
+    Without an ``executor`` extraction runs inline. Up to ``max_in_flight``
+    chunks are extracted while the next ones are read.
+    """
+
+    loop = asyncio.get_running_loop()
+    report = ReextractionReport()
+    started = time.perf_counter()
+    last_report = started
+    cursor: Tuple[int, Optional[int]] = (load_checkpoint(checkpoint), None)
+    if cursor[0]:
+        LOGGER.info("Resuming after session %s", cursor[0])
+    pending: Deque[Tuple[List[TurnKey], asyncio.Future]] = deque()
+    current: Optional[int] = None
+    rows: List[dict] = []
+    exhausted = False
+
+    async def flush() -> None:
+        if current is None:
+            return
+        if not dry_run:
+            await replace_notes(session_factory, current, rows)
+            save_checkpoint(checkpoint, current)
+        report.sessions += 1
+        report.notes += len(rows)
+
+    while pending or not exhausted:
+        while not exhausted and len(pending) < max(1, max_in_flight):
+            keys, transcripts = await fetch_chunk(session_factory, cursor, chunk_size)
+            if not keys:
+                exhausted = True
+                break
+            cursor = (keys[-1][1], keys[-1][0])
+            if executor is None:
+                future = loop.create_future()
+                future.set_result(extract_chunk(transcripts))
+            else:
+                future = loop.run_in_executor(executor, extract_chunk, transcripts)
+            pending.append((keys, future))
+        if not pending:
+            break
+        keys, future = pending.popleft()
+        for (_, session_id, created_at), notes in zip(keys, await future):
+            if session_id != current:
+                await flush()
+                current, rows = session_id, []
+            for category, content, confidence, requires_clarification in notes:
+                rows.append({
+                    "session_id": session_id,
+                    "category": category,
+                    "content": content,
+                    "confidence": confidence,
+                    "requires_clarification": requires_clarification,
+                    "created_at": created_at,
+                })
+        report.turns += len(keys)
+        now = time.perf_counter()
+        if now - last_report >= report_every:
+            last_report = now
+            rate = report.turns / (now - started)
+            LOGGER.info("turns=%s sessions=%s rows/s=%.0f", report.turns, report.sessions, rate)
+    await flush()
+    report.seconds = time.perf_counter() - started
+    if checkpoint is not None and not dry_run and checkpoint.exists():
+        # 全部完成后删除断点，规则再次变化时从头重建
+        checkpoint.unlink()
+    return report
+
+
+async def main() -> None:
+    from ..database import SessionLocal, engine, shutdown
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--chunk-size", type=int, default=2000, help="turns read and extracted per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="extraction processes (0: inline)")
+    parser.add_argument("--checkpoint", type=Path, help="resume file, removed once the run completes")
+    parser.add_argument("--dry-run", action="store_true", help="extract and count without writing notes")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # create_all 不会给已存在的表补建索引
+    await ensure_keyset_index(engine)
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 0 else None
+    try:
+        report = await reextract_notes(
+            SessionLocal,
+            chunk_size=args.chunk_size,
+            executor=pool,
+            max_in_flight=max(2, args.workers * 2),
+            checkpoint=args.checkpoint,
+            dry_run=args.dry_run,
+        )
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        await shutdown()
+    print(
+        f"sessions={report.sessions} turns={report.turns} notes={report.notes} "
+        f"seconds={report.seconds:.1f} rows/s={report.rows_per_second:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
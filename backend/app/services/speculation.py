@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from difflib import SequenceMatcher
+from typing import Callable, Dict, Optional
+
+from .policy import PolicyDecision
+
+LOGGER = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def text_similarity(left: str, right: str) -> float:
+    """Similarity of two transcripts, ignoring whitespace and punctuation."""
+
+    a = _NON_WORD.sub("", left)
+    b = _NON_WORD.sub("", right)
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class SpeculationStats:
+    """Process-wide counters for speculative policy decisions."""
+
+    def __init__(self) -> None:
+        self.turns = 0
+        self.launched = 0
+        self.hits = 0
+        self.saved_ms = 0.0
+
+    @property
+    def wasted(self) -> int:
+        return self.launched - self.hits
+
+    def allow(self, max_waste_ratio: float) -> bool:
+        """Cap extra LLM spend: discarded speculations per handled turn."""
+
+        return self.wasted <= max_waste_ratio * self.turns + 1
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "turns": self.turns,
+            "launched": self.launched,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.launched, 3) if self.launched else 0.0,
+            "extra_calls_per_turn": round(self.wasted / self.turns, 3) if self.turns else 0.0,
+            "saved_ms_total": round(self.saved_ms, 1),
+            "saved_ms_avg": round(self.saved_ms / self.hits, 1) if self.hits else 0.0,
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+class Speculation:
+    """A policy decision started from a partial transcript."""
+
+    def __init__(
+        self,
+        text: str,
+        fingerprint: tuple,
+        task: "asyncio.Task[PolicyDecision]",
+        stats: SpeculationStats = speculation_stats,
+    ) -> None:
+        self.text = text
+        self.fingerprint = fingerprint
+        self.task = task
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.stats = stats
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, _: asyncio.Task) -> None:
+        self.finished_at = time.perf_counter()
+
+    def accept(self) -> "asyncio.Task[PolicyDecision]":
+        """Record a hit; the saved latency is the LLM time that overlapped the speech."""
+
+        end = self.finished_at or time.perf_counter()
+        self.stats.hits += 1
+        self.stats.saved_ms += (end - self.started_at) * 1000
+        return self.task
+
+    def discard(self) -> None:
+        if not self.task.done():
+            self.task.cancel()
+
+
+class PartialSpeculator:
+    """Start a speculative policy decision once an ASR partial stops changing.
+
+    ``launch`` builds the speculation for a given text (or returns ``None`` when
+    the session cannot speculate). At most one speculation is in flight; a
+    partial that diverges from it discards it, and :meth:`take` hands it to the
+    final transcript only when the texts match above ``threshold``.
+    """
+
+    def __init__(
+        self,
+        launch: Callable[[str], Optional[Speculation]],
+        *,
+        stable_for: float,
+        threshold: float,
+        max_waste_ratio: float,
+        stats: SpeculationStats = speculation_stats,
+    ) -> None:
+        self._launch = launch
+        self.stable_for = stable_for
+        self.threshold = threshold
+        self.max_waste_ratio = max_waste_ratio
+        self.stats = stats
+        self._last_partial = ""
+        self._timer: Optional[asyncio.Task] = None
+        self._current: Optional[Speculation] = None
+
+    def on_partial(self, text: str) -> None:
+        text = text.strip()
+        if not text or text == self._last_partial:
+            return
+        self._last_partial = text
+        self._cancel_timer()
+        current = self._current
+        if current is not None and text_similarity(current.text, text) < self.threshold:
+            current.discard()
+            self._current = None
+        self._timer = asyncio.create_task(self._launch_when_stable(text))
+
+    def take(self, final_text: str) -> Optional[Speculation]:
+        """Return the speculation matching ``final_text`` (discarding any other)."""
+
+        self._cancel_timer()
+        self._last_partial = ""
+        self.stats.turns += 1
+        current, self._current = self._current, None
+        if current is None:
+            return None
+        similarity = text_similarity(current.text, final_text)
+        if similarity < self.threshold:
+            LOGGER.info("[speculation] miss similarity=%.2f", similarity)
+            current.discard()
+            return None
+        return current
+
+    def close(self) -> None:
+        self._cancel_timer()
+        if self._current is not None:
+            self._current.discard()
+            self._current = None
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        self._timer = None
+
+    async def _launch_when_stable(self, text: str) -> None:
+        await asyncio.sleep(self.stable_for)
+        if self._current is not None and self._current.text == text:
+            return
+        if not self.stats.allow(self.max_waste_ratio):
+            LOGGER.debug("[speculation] skipped, waste cap reached")
+            return
+        if self._current is not None:
+            self._current.discard()
+        self._current = self._launch(text)
+        if self._current is not None:
+            self._current.stats = self.stats
+            self.stats.launched += 1
+
+
+__all__ = ["PartialSpeculator", "Speculation", "SpeculationStats", "speculation_stats", "text_similarity"]
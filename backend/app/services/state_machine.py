@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import struct
 from enum import Enum
-from typing import TYPE_CHECKING, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Tuple
 
 if TYPE_CHECKING:  # pragma: no cover
     from .policy import PolicyDecision
@@ -15,58 +16,484 @@ class InterviewStage(str, Enum):
     CLOSING = "Closing"
 
 
-@dataclass
+class QuestionIndex:
+    """Interned outline: question text <-> integer id, shared by sessions with the same outline."""
+
+    __slots__ = ("questions", "ids")
+
+    def __init__(self, questions: Iterable[str]):
+        self.ids: Dict[str, int] = {}
+        for question in questions:
+            self.ids.setdefault(question, len(self.ids))
+        self.questions: Tuple[str, ...] = tuple(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+@lru_cache(maxsize=4096)
+def intern_outline(questions: Tuple[str, ...]) -> QuestionIndex:
+    return QuestionIndex(questions)
+
+
+class _AnsweredView:
+    """List-like view over the answered bitset plus off-outline answered questions."""
+
+    __slots__ = ("_state",)
+
+    def __init__(self, state: "ConversationState"):
+        self._state = state
+
+    def __contains__(self, question: object) -> bool:
+        return self._state.is_answered(question)  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        state = self._state
+        bits = state._answered_bits
+        for qid, question in enumerate(state._index.questions):
+            if bits >> qid & 1:
+                yield question
+        yield from state._extra_answered
+
+    def __len__(self) -> int:
+        return self._state._answered_count + len(self._state._extra_answered)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, _AnsweredView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def append(self, question: str) -> None:
+        self._state.mark_answered(question)
+
+    def extend(self, questions: Iterable[str]) -> None:
+        for question in questions:
+            self._state.mark_answered(question)
+
+
+class _PendingView:
+    """List-like view over the ordered set of pending clarifications."""
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Dict[str, None]):
+        self._items = items
+
+    def __contains__(self, content: object) -> bool:
+        return content in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __getitem__(self, position: int) -> str:
+        if position == 0 and self._items:
+            return next(iter(self._items))
+        return list(self._items)[position]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, _PendingView)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self._items))
+
+    def append(self, content: str) -> None:
+        self._items.setdefault(content, None)
+
+    def extend(self, contents: Iterable[str]) -> None:
+        for content in contents:
+            self._items.setdefault(content, None)
+
+    def remove(self, content: str) -> None:
+        del self._items[content]
+
+
+_SNAPSHOT_MAGIC = b"CS"
+_SNAPSHOT_VERSION = 1
+_STAGES: Tuple[InterviewStage, ...] = tuple(InterviewStage)
+_ROLES: Tuple[str, ...] = ("user", "assistant")
+_HEADER = struct.Struct("<2sBBH")
+
+
+def _pack_str(out: bytearray, value: str) -> None:
+    raw = value.encode("utf-8")
+    out += struct.pack("<I", len(raw))
+    out += raw
+
+
+def _unpack_str(data: memoryview, offset: int) -> Tuple[str, int]:
+    (length,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    return bytes(data[offset : offset + length]).decode("utf-8"), offset + length
+
+
+def _pack_turn(out: bytearray, turn: dict) -> None:
+    role = turn["role"]
+    out += struct.pack("<B", _ROLES.index(role) if role in _ROLES else 255)
+    if role not in _ROLES:
+        _pack_str(out, role)
+    _pack_str(out, turn["content"])
+
+
+def _unpack_turn(data: memoryview, offset: int) -> Tuple[dict, int]:
+    (role_idx,) = struct.unpack_from("<B", data, offset)
+    offset += 1
+    if role_idx == 255:
+        role, offset = _unpack_str(data, offset)
+    else:
+        role = _ROLES[role_idx]
+    content, offset = _unpack_str(data, offset)
+    return {"role": role, "content": content}, offset
+
+
 class ConversationState:
-    session_id: str
-    topic: str
-    outline_questions: List[str]
-    answered_questions: List[str] = field(default_factory=list)
-    stage: InterviewStage = InterviewStage.OPENING
-    pending_clarifications: List[str] = field(default_factory=list)
-    last_question: str | None = None
-    turn_history: List[dict] = field(default_factory=list)
+    """Per-session interview state.
+
+    Outline questions are interned to integer ids (shared across sessions
+    with the same outline); answered state is a bitset, pending
+    clarifications an insertion-ordered set, and coverage is kept as
+    running counters so every query is O(1).
+
+    ``turn_history`` keeps the last ``MAX_TURNS`` turns; older turns wait in
+    a backlog until they are folded into the rolling ``summary``.
+    """
+
+    MAX_TURNS = 10
+
+    __slots__ = (
+        "session_id",
+        "topic",
+        "stage",
+        "last_question",
+        "turn_history",
+        "summary",
+        "_evicted",
+        "_index",
+        "_answered_bits",
+        "_answered_count",
+        "_extra_answered",
+        "_pending",
+    )
+
+    def __init__(
+        self,
+        session_id: str,
+        topic: str,
+        outline_questions: Iterable[str],
+        answered_questions: Iterable[str] | None = None,
+        stage: InterviewStage = InterviewStage.OPENING,
+        pending_clarifications: Iterable[str] | None = None,
+        last_question: str | None = None,
+        turn_history: List[dict] | None = None,
+        summary: str = "",
+    ):
+        self.session_id = session_id
+        self.topic = topic
+        self.stage = stage
+        self.last_question = last_question
+        self.turn_history: List[dict] = list(turn_history or [])
+        self.summary = summary
+        self._evicted: List[dict] = []
+        self._index = intern_outline(tuple(outline_questions))
+        self._answered_bits = 0
+        self._answered_count = 0
+        self._extra_answered: Dict[str, None] = {}
+        self._pending: Dict[str, None] = dict.fromkeys(pending_clarifications or ())
+        for question in answered_questions or ():
+            self.mark_answered(question)
+
+    @property
+    def outline_questions(self) -> Tuple[str, ...]:
+        return self._index.questions
+
+    @property
+    def answered_questions(self) -> _AnsweredView:
+        return _AnsweredView(self)
+
+    @property
+    def pending_clarifications(self) -> _PendingView:
+        return _PendingView(self._pending)
 
     def coverage(self) -> float:
-        if not self.outline_questions:
+        if not self._index.questions:
             return 1.0
-        return len(self.answered_questions) / len(self.outline_questions)
+        return (self._answered_count + len(self._extra_answered)) / len(self._index.questions)
+
+    def is_answered(self, question: str) -> bool:
+        qid = self._index.ids.get(question)
+        if qid is None:
+            return question in self._extra_answered
+        return bool(self._answered_bits >> qid & 1)
+
+    def next_unanswered(self) -> str | None:
+        """Return the first outline question not yet answered (lowest clear bit)."""
+
+        bits = self._answered_bits
+        qid = ((bits + 1) & ~bits).bit_length() - 1
+        if qid < len(self._index.questions):
+            return self._index.questions[qid]
+        return None
 
     def mark_answered(self, question: str) -> None:
-        if question not in self.answered_questions:
-            self.answered_questions.append(question)
+        qid = self._index.ids.get(question)
+        if qid is None:
+            self._extra_answered.setdefault(question, None)
+            return
+        mask = 1 << qid
+        if not self._answered_bits & mask:
+            self._answered_bits |= mask
+            self._answered_count += 1
 
     def mark_last_answered(self) -> None:
         if self.last_question:
             self.mark_answered(self.last_question)
             self.last_question = None
 
+    def replace_outline(self, outline_questions: Iterable[str]) -> None:
+        """Swap in a new outline mid-session.
+
+        Answers to questions that also appear in the new outline stay
+        answered; answers to dropped outline questions are forgotten, while
+        off-outline answers, clarifications and history are kept.
+        """
+
+        answered = [q for q in self._index.questions if self.is_answered(q)]
+        self._index = intern_outline(tuple(outline_questions))
+        self._remap_answers(answered, self._extra_answered)
+
+    def _remap_answers(self, answered: Iterable[str], extra_answered: Dict[str, None]) -> None:
+        self._answered_bits = 0
+        self._answered_count = 0
+        self._extra_answered = extra_answered
+        for question in answered:
+            if question in self._index.ids:
+                self.mark_answered(question)
+        for question in [q for q in extra_answered if q in self._index.ids]:
+            del extra_answered[question]
+            self.mark_answered(question)
+
     def add_clarification(self, content: str) -> None:
-        if content not in self.pending_clarifications:
-            self.pending_clarifications.append(content)
+        self._pending.setdefault(content, None)
 
     def resolve_clarification(self, content: str) -> None:
-        if content in self.pending_clarifications:
-            self.pending_clarifications.remove(content)
-    
+        self._pending.pop(content, None)
+
     def add_turn(self, role: str, content: str) -> None:
         text = content.strip()
         if not text:
             return
         payload = {"role": role, "content": text}
         self.turn_history.append(payload)
-        if len(self.turn_history) > 10:
-            del self.turn_history[0 : len(self.turn_history) - 10]
+        excess = len(self.turn_history) - self.MAX_TURNS
+        if excess > 0:
+            self._evicted.extend(self.turn_history[:excess])
+            del self.turn_history[:excess]
 
     def recent_turns(self, limit: int = 8) -> List[dict]:
         if limit <= 0:
             return []
         return self.turn_history[-limit:]
 
+    @property
+    def has_evicted_turns(self) -> bool:
+        return bool(self._evicted)
+
+    def take_evicted_turns(self) -> List[dict]:
+        """Hand over the turns dropped from ``turn_history`` since the last call."""
+
+        evicted, self._evicted = self._evicted, []
+        return evicted
+
+    def checkpoint(self) -> tuple:
+        """Cheap copy of the mutable fields, for rolling back a cancelled turn.
+
+        The outline is not part of the rollback (see :meth:`restore`).
+        """
+
+        return (
+            self._index,
+            self.stage,
+            self.last_question,
+            self._answered_bits,
+            self._answered_count,
+            dict(self._extra_answered),
+            dict(self._pending),
+            list(self.turn_history),
+            self.summary,
+            list(self._evicted),
+        )
+
+    def restore(self, checkpoint: tuple) -> None:
+        """Roll back to ``checkpoint``, keeping the current outline.
+
+        An outline swapped in after the checkpoint (the LLM outline landing
+        while the turn awaited the policy) stays; the checkpointed answers
+        are mapped onto it as in :meth:`replace_outline`.
+        """
+
+        (
+            index,
+            self.stage,
+            self.last_question,
+            answered_bits,
+            answered_count,
+            extra_answered,
+            self._pending,
+            self.turn_history,
+            self.summary,
+            self._evicted,
+        ) = checkpoint
+        if index is self._index:
+            self._answered_bits = answered_bits
+            self._answered_count = answered_count
+            self._extra_answered = extra_answered
+            return
+        answered = [q for qid, q in enumerate(index.questions) if answered_bits >> qid & 1]
+        self._remap_answers(answered, extra_answered)
+
+    def clone(self) -> "ConversationState":
+        """Detached copy sharing the interned outline (used for speculative turns)."""
+
+        copy = ConversationState.__new__(ConversationState)
+        copy.session_id = self.session_id
+        copy.topic = self.topic
+        copy._index = self._index
+        copy.restore(self.checkpoint())
+        return copy
+
+    def fingerprint(self) -> tuple:
+        """Everything the policy payload depends on, for validating precomputed decisions.
+
+        The text of a trailing user answer is left out: speculation matches it
+        against the final transcript by similarity instead.
+        """
+
+        turns = self.turn_history[-3:]
+        if turns and turns[-1]["role"] == "user":
+            recent = tuple((turn["role"], turn["content"]) for turn in turns[:-1]) + (("user", None),)
+        else:
+            recent = tuple((turn["role"], turn["content"]) for turn in turns)
+        return (
+            self._index,
+            self.stage,
+            self._answered_bits,
+            tuple(self._extra_answered),
+            tuple(self._pending),
+            self.summary,
+            recent,
+        )
+
+    # ------------------------------------------------------------------
+    # Compact binary snapshot
+    # ------------------------------------------------------------------
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary snapshot (see :meth:`from_bytes`)."""
+
+        questions = self._index.questions
+        out = bytearray(
+            _HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, _STAGES.index(self.stage), len(self.turn_history))
+        )
+        _pack_str(out, self.session_id)
+        _pack_str(out, self.topic)
+        _pack_str(out, self.last_question or "")
+        out += struct.pack("<B", self.last_question is not None)
+        out += struct.pack("<I", len(questions))
+        for question in questions:
+            _pack_str(out, question)
+        out += self._answered_bits.to_bytes((len(questions) + 7) // 8, "little")
+        for group in (self._extra_answered, self._pending):
+            out += struct.pack("<I", len(group))
+            for item in group:
+                _pack_str(out, item)
+        for turn in self.turn_history:
+            _pack_turn(out, turn)
+        _pack_str(out, self.summary)
+        out += struct.pack("<I", len(self._evicted))
+        for turn in self._evicted:
+            _pack_turn(out, turn)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ConversationState":
+        view = memoryview(data)
+        magic, version, stage_idx, turn_count = _HEADER.unpack_from(view, 0)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise ValueError("Unsupported ConversationState snapshot")
+        offset = _HEADER.size
+        session_id, offset = _unpack_str(view, offset)
+        topic, offset = _unpack_str(view, offset)
+        last_question, offset = _unpack_str(view, offset)
+        (has_last,) = struct.unpack_from("<B", view, offset)
+        offset += 1
+        (question_count,) = struct.unpack_from("<I", view, offset)
+        offset += 4
+        questions = []
+        for _ in range(question_count):
+            question, offset = _unpack_str(view, offset)
+            questions.append(question)
+        width = (question_count + 7) // 8
+        bits = int.from_bytes(view[offset : offset + width], "little")
+        offset += width
+        groups: List[List[str]] = []
+        for _ in range(2):
+            (count,) = struct.unpack_from("<I", view, offset)
+            offset += 4
+            items = []
+            for _ in range(count):
+                item, offset = _unpack_str(view, offset)
+                items.append(item)
+            groups.append(items)
+        turns: List[dict] = []
+        for _ in range(turn_count):
+            turn, offset = _unpack_turn(view, offset)
+            turns.append(turn)
+        summary, offset = _unpack_str(view, offset)
+        (evicted_count,) = struct.unpack_from("<I", view, offset)
+        offset += 4
+        evicted: List[dict] = []
+        for _ in range(evicted_count):
+            turn, offset = _unpack_turn(view, offset)
+            evicted.append(turn)
+
+        state = cls(
+            session_id=session_id,
+            topic=topic,
+            outline_questions=questions,
+            stage=_STAGES[stage_idx],
+            pending_clarifications=groups[1],
+            last_question=last_question if has_last else None,
+            turn_history=turns,
+            summary=summary,
+        )
+        state._evicted = evicted
+        state._answered_bits = bits
+        state._answered_count = bin(bits).count("1")
+        state._extra_answered = dict.fromkeys(groups[0])
+        return state
+
 
 class StateMachine:
     def __init__(self, session_id: str, topic: str, outline_questions: List[str]):
         self.data = ConversationState(session_id=session_id, topic=topic, outline_questions=outline_questions)
 
+    def clone(self) -> "StateMachine":
+        machine = StateMachine.__new__(StateMachine)
+        machine.data = self.data.clone()
+        return machine
+
+    def replace_outline(self, outline_questions: List[str]) -> None:
+        self.data.replace_outline(outline_questions)
+
     def transition_after_answer(self) -> None:
         self.data.mark_last_answered()
         coverage = self.data.coverage()
@@ -79,6 +506,20 @@ class StateMachine:
         else:
             self.data.stage = InterviewStage.EXPLORATION
 
+    def credit_answer(self, text: str, threshold: float) -> List[str]:
+        """Mark every outline question that ``text`` covers as answered; returns the new ones."""
+
+        from .outline_coverage import covered_questions
+
+        questions = self.data.outline_questions
+        credited = []
+        for qid in covered_questions(questions, text, threshold):
+            question = questions[qid]
+            if not self.data.is_answered(question):
+                self.data.mark_answered(question)
+                credited.append(question)
+        return credited
+
     def record_user_turn(self, text: str) -> None:
         self.data.add_turn("user", text)
 
@@ -91,7 +532,7 @@ class StateMachine:
 
     def rule_based_decision(self) -> "PolicyDecision":
         from .policy import PolicyDecision
-        unanswered = [q for q in self.data.outline_questions if q not in self.data.answered_questions]
+        next_question = self.data.next_unanswered()
         rationale = "rule-based fallback"
         if self.data.pending_clarifications:
             target = self.data.pending_clarifications[0]
@@ -100,8 +541,8 @@ class StateMachine:
         if self.data.stage == InterviewStage.CLOSING:
             question = "感谢分享，我们来做个小结：还有哪些重点没有提到？"
             return PolicyDecision(action="close", question=question, rationale=rationale)
-        if unanswered:
-            question = unanswered[0]
+        if next_question is not None:
+            question = next_question
             return PolicyDecision(action="ask", question=question, rationale=rationale)
         question = "能否补充一个具体数据或案例，帮助我们理解？"
         return PolicyDecision(action="ask", question=question, rationale=rationale)
@@ -110,4 +551,4 @@ class StateMachine:
         self.data.add_clarification(content)
 
 
-__all__ = ["InterviewStage", "ConversationState", "StateMachine"]
+__all__ = ["InterviewStage", "ConversationState", "QuestionIndex", "StateMachine", "intern_outline"]
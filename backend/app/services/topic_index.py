@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+from .outline_cache import normalize_topic
+
+_TOKEN_SPLIT = re.compile(r"[\W_]+", re.UNICODE)
+# 虚词不算主题内容的差异
+_FUNCTION_CHARS = frozenset("的在与和及之对")
+# 双方各有对方没有的实词字符且都超过该 IDF 质量占比时，视为换了主题（教育 → 医疗）
+MAX_SUBSTITUTED_MASS = 0.02
+
+
+def topic_ngrams(topic: str, ngram_range: Tuple[int, int] = (1, 2)) -> Counter:
+    """Character n-grams of the topic with whitespace and punctuation removed.
+
+    Unigrams plus bigrams keep reordered or lightly reworded Chinese topics
+    ("新能源车 供应链" / "新能源汽车供应链") close while unrelated topics that
+    share a single word stay apart.
+    """
+
+    low, high = ngram_range
+    text = "".join(_TOKEN_SPLIT.split(normalize_topic(topic)))
+    grams: Counter = Counter()
+    for n in range(low, high + 1):
+        for start in range(len(text) - n + 1):
+            grams[text[start : start + n]] += 1
+    return grams
+
+
+@dataclass
+class TopicMatch:
+    key: str
+    topic: str
+    score: float
+
+
+class TopicIndex:
+    """TF-IDF cosine index over character n-grams of previously seen topics.
+
+    Documents are stored as a flat sparse layout (document id, vocabulary
+    column, term count) so a lookup is a couple of vectorised passes over
+    the non-zero entries. Weights are rebuilt lazily after additions;
+    removed topics are compacted away after ``compact_after`` removals.
+
+    A match also has to pass a substitution check: topics built from the
+    same template with a different subject ("人工智能在教育行业的应用" /
+    "人工智能在医疗行业的应用") score high on shared n-grams, but each side
+    has content characters the other lacks.
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 2), compact_after: int = 64) -> None:
+        if np is None:
+            raise RuntimeError("numpy is required for TopicIndex")
+        self.ngram_range = ngram_range
+        self.compact_after = compact_after
+        self._removed = 0
+        self._vocab: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._topics: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._alive: List[bool] = []
+        self._doc_ids: List[int] = []
+        self._cols: List[int] = []
+        self._counts: List[float] = []
+        self._dirty = False
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._doc_arr = np.zeros(0, dtype=np.int64)
+        self._col_arr = np.zeros(0, dtype=np.int64)
+        self._weights = np.zeros(0, dtype=np.float32)
+        self.lookups = 0
+        self.matches = 0
+        self.lookup_ms = 0.0
+
+    def __len__(self) -> int:
+        return sum(self._alive)
+
+    def add(self, key: str, topic: str) -> None:
+        if key in self._rows and self._alive[self._rows[key]]:
+            return
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._topics.append(topic)
+        self._alive.append(True)
+        self._rows[key] = doc
+        for gram, count in topic_ngrams(topic, self.ngram_range).items():
+            col = self._vocab.setdefault(gram, len(self._vocab))
+            self._doc_ids.append(doc)
+            self._cols.append(col)
+            self._counts.append(float(count))
+        self._dirty = True
+
+    def remove(self, key: str) -> bool:
+        doc = self._rows.pop(key, None)
+        if doc is None:
+            return False
+        self._alive[doc] = False
+        self._dirty = True
+        self._removed += 1
+        if self._removed >= self.compact_after:
+            self._compact()
+        return True
+
+    def clear(self) -> None:
+        self._vocab.clear()
+        self._keys.clear()
+        self._topics.clear()
+        self._rows.clear()
+        self._alive.clear()
+        self._doc_ids.clear()
+        self._cols.clear()
+        self._counts.clear()
+        self._removed = 0
+        self._dirty = True
+
+    def query(self, topic: str, threshold: float) -> Optional[TopicMatch]:
+        started = time.perf_counter()
+        try:
+            match = self._query(topic)
+            if match is not None and match.score >= threshold and not self._substituted(topic, match.topic):
+                self.matches += 1
+                return match
+            return None
+        finally:
+            self.lookups += 1
+            self.lookup_ms += (time.perf_counter() - started) * 1000
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "topics": len(self),
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "avg_lookup_ms": round(self.lookup_ms / self.lookups, 3) if self.lookups else 0.0,
+        }
+
+    def _query(self, topic: str) -> Optional[TopicMatch]:
+        if not self._rows:
+            return None
+        if self._dirty:
+            self._rebuild()
+        grams = topic_ngrams(topic, self.ngram_range)
+        if not grams:
+            return None
+        alive_docs = len(self._rows)
+        unseen_idf = math.log(1 + alive_docs) + 1.0
+        query = np.zeros(len(self._vocab), dtype=np.float32)
+        norm = 0.0
+        for gram, count in grams.items():
+            col = self._vocab.get(gram)
+            weight = count * (float(self._idf[col]) if col is not None else unseen_idf)
+            norm += weight * weight
+            if col is not None:
+                query[col] = weight
+        if norm == 0.0:
+            return None
+        query /= math.sqrt(norm)
+        scores = np.bincount(
+            self._doc_arr,
+            weights=self._weights * query[self._col_arr],
+            minlength=len(self._keys),
+        )
+        scores[~np.asarray(self._alive, dtype=bool)] = -1.0
+        best = int(np.argmax(scores))
+        if scores[best] <= 0:
+            return None
+        return TopicMatch(key=self._keys[best], topic=self._topics[best], score=float(scores[best]))
+
+    def _substituted(self, topic: str, candidate: str) -> bool:
+        """Whether both topics carry IDF mass on content characters the other lacks."""
+
+        unseen_idf = math.log(1 + len(self._rows)) + 1.0
+        mine = topic_ngrams(topic, self.ngram_range)
+        theirs = topic_ngrams(candidate, self.ngram_range)
+
+        def share(grams: Counter, other: Counter) -> float:
+            total = 0.0
+            differing = 0.0
+            for gram, count in grams.items():
+                col = self._vocab.get(gram)
+                weight = (count * (float(self._idf[col]) if col is not None else unseen_idf)) ** 2
+                total += weight
+                if len(gram) == 1 and gram not in other and gram not in _FUNCTION_CHARS:
+                    differing += weight
+            return differing / total if total else 0.0
+
+        return min(share(mine, theirs), share(theirs, mine)) > MAX_SUBSTITUTED_MASS
+
+    def _compact(self) -> None:
+        live = [(key, topic) for key, topic, alive in zip(self._keys, self._topics, self._alive) if alive]
+        self.clear()
+        for key, topic in live:
+            self.add(key, topic)
+
+    def _rebuild(self) -> None:
+        doc_arr = np.asarray(self._doc_ids, dtype=np.int64)
+        col_arr = np.asarray(self._cols, dtype=np.int64)
+        counts = np.asarray(self._counts, dtype=np.float32)
+        alive = np.asarray(self._alive, dtype=bool)
+        live = alive[doc_arr]
+        df = np.bincount(col_arr[live], minlength=len(self._vocab)).astype(np.float32)
+        n_docs = float(alive.sum())
+        # 平滑 IDF，与 sklearn 的 smooth_idf 一致
+        self._idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+        weights = counts * self._idf[col_arr]
+        norms = np.sqrt(np.bincount(doc_arr, weights=weights * weights, minlength=len(self._keys)))
+        norms[norms == 0] = 1.0
+        self._doc_arr = doc_arr
+        self._col_arr = col_arr
+        self._weights = (weights / norms[doc_arr]).astype(np.float32)
+        self._dirty = False
+
+
+__all__ = ["TopicIndex", "TopicMatch", "topic_ngrams"]
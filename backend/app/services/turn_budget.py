@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional
+
+
+class TurnBudget:
+    """Latency budget of one interview turn, measured from when the turn starts.
+
+    Stages (extraction, policy, TTS dispatch) record their elapsed time with
+    :meth:`mark`; the policy call gets whatever is left after reserving
+    ``tts_reserve`` seconds for speech synthesis to start.
+    """
+
+    def __init__(
+        self,
+        total: float,
+        *,
+        tts_reserve: float = 0.0,
+        min_policy: float = 0.2,
+        started_at: Optional[float] = None,
+    ) -> None:
+        self.total = total
+        self.tts_reserve = tts_reserve
+        self.min_policy = min_policy
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.stages: Dict[str, float] = {}
+        self.fallback: Optional[str] = None
+        self._last_mark = self.started_at
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def remaining(self) -> float:
+        return self.total - self.elapsed()
+
+    def policy_timeout(self) -> float:
+        return max(self.min_policy, self.remaining() - self.tts_reserve)
+
+    def mark(self, stage: str) -> float:
+        """Record the time spent since the previous mark under ``stage``."""
+
+        now = time.perf_counter()
+        spent = now - self._last_mark
+        self._last_mark = now
+        self.stages[stage] = self.stages.get(stage, 0.0) + spent
+        return spent
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "budget_ms": round(self.total * 1000),
+            "elapsed_ms": round(self.elapsed() * 1000, 1),
+            "over_budget": self.remaining() < 0,
+            "fallback": self.fallback,
+            **{f"{stage}_ms": round(spent * 1000, 1) for stage, spent in self.stages.items()},
+        }
+
+
+class CircuitBreaker:
+    """Skip the policy LLM while it is failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens for
+    ``reset_after`` seconds; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the breaker. Calls cut
+    off by a turn budget are counted apart as timeouts: a slow but healthy
+    upstream must not disable the LLM for every session.
+    """
+
+    def __init__(self, failure_threshold: int, reset_after: float) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.skipped = 0
+        self.trips = 0
+        self.timeouts = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        self.skipped += 1
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+            self.trips += 1
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def record_timeout(self) -> None:
+        """The allowed call outlived the caller's turn budget; not an upstream failure."""
+
+        self.timeouts += 1
+        self.trial_in_flight = False
+
+    def abandon(self) -> None:
+        """The allowed call was cancelled by the caller; neither outcome is recorded."""
+
+        self.trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "skipped_calls": self.skipped,
+            "budget_timeouts": self.timeouts,
+        }
+
+
+__all__ = ["CircuitBreaker", "TurnBudget"]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TurnDebouncer:
+    """Merge ASR finals that arrive close together into a single turn.
+
+    Each final is buffered and a timer of ``window`` seconds is (re)started.
+    When the timer fires the merged text goes to ``decide``; if more speech
+    arrives while ``decide`` is still running it is cancelled and the text is
+    decided again together with the new speech. Once ``decide`` returns the
+    turn is committed and ``deliver`` runs to completion; speech arriving
+    then starts the next turn.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        decide: Callable[[str], Awaitable[Any]],
+        deliver: Callable[[Any], Awaitable[None]],
+    ) -> None:
+        self.window = max(window, 0.0)
+        self._decide = decide
+        self._deliver = deliver
+        self._parts: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self._committed = False
+        self._deciding = False
+        self._delivery: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"finals": 0, "turns": 0, "cancelled_decisions": 0}
+
+    def submit(self, text: str) -> None:
+        """Buffer an ASR final and (re)start the debounce window."""
+
+        text = text.strip()
+        if not text:
+            return
+        self._parts.append(text)
+        self.stats["finals"] += 1
+        self._restart()
+
+    def touch(self) -> None:
+        """More speech is coming (speech start / partial): hold the pending turn."""
+
+        if self._parts:
+            self._restart()
+
+    async def flush(self) -> None:
+        """Wait for the pending turn (if any) and its delivery to finish."""
+
+        for task in (self._task, self._delivery):
+            if task is not None and not task.done():
+                await asyncio.wait({task})
+
+    async def close(self) -> None:
+        for task in (self._task, self._delivery):
+            if task is not None and not task.done():
+                task.cancel()
+                await asyncio.wait({task})
+        self._parts.clear()
+
+    def _restart(self) -> None:
+        task = self._task
+        if task is not None and not task.done() and not self._committed:
+            task.cancel()
+            if self._deciding:
+                self.stats["cancelled_decisions"] += 1
+        self._deciding = False
+        self._committed = False
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.window)
+        if self._delivery is not None and not self._delivery.done():
+            await asyncio.wait({self._delivery})
+        text = " ".join(self._parts)
+        self._deciding = True
+        try:
+            result = await self._decide(text)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            LOGGER.exception("[debounce] turn handling failed, dropping %d final(s)", len(self._parts))
+            self._parts.clear()
+            return
+        finally:
+            self._deciding = False
+        # ✅ committed：之后到达的语音属于下一轮
+        self._committed = True
+        merged = len(self._parts)
+        self._parts.clear()
+        self.stats["turns"] += 1
+        if merged > 1:
+            LOGGER.info("[debounce] merged %d finals into one turn", merged)
+        self._delivery = asyncio.create_task(self._deliver(result))
+        await asyncio.wait({self._delivery})
+
+
+__all__ = ["TurnDebouncer"]
@@ -4,18 +4,25 @@ import asyncio
 import contextlib
 import logging
 import time
-from typing import Dict, List, Optional
+from collections import deque
+from typing import Deque, Dict, List, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 import aiohttp, base64, json, os, asyncio
-from app.core.tts_client import stream_and_broadcast
+from app.core.tts_client import SentenceStream, stream_and_broadcast
+from app.core.ws_tts_manager import manager as tts_manager
 LOGGER = logging.getLogger(__name__)
 
+# 打断时等待旧 TTS 任务退出的上限（秒）
+TTS_CANCEL_WAIT = 0.5
+
 class WebSocketManager:
     """统一管理 Agent / ASR / TTS 的 WebSocket 会话"""
     def __init__(self):
         self._lock = asyncio.Lock()
         self._connections: Dict[str, List[WebSocket]] = {}
         self._ready: Dict[str, Dict[str, asyncio.Event]] = {}
+        self._tts_tasks: Dict[str, asyncio.Task] = {}
+        self._tts_cancel_latency_ms: Deque[float] = deque(maxlen=200)
 
     # ============================================================
     # 🔹 基础连接管理
@@ -115,16 +122,66 @@ class WebSocketManager:
     def active_sessions(self) -> Dict[str, int]:
         return {sid: len(peers) for sid, peers in self._connections.items()}
 
+    def tts_stats(self) -> Dict[str, float]:
+        samples = sorted(self._tts_cancel_latency_ms)
+        if not samples:
+            return {"active_tts_tasks": len(self._tts_tasks), "cancel_count": 0}
+        return {
+            "active_tts_tasks": len(self._tts_tasks),
+            "cancel_count": len(samples),
+            "cancel_p50_ms": round(samples[len(samples) // 2], 3),
+            "cancel_max_ms": round(samples[-1], 3),
+        }
+
     # ============================================================
     # 🔹 TTS：火山引擎语音合成 + WebSocket 推送
     # ============================================================
-    async def send_to_tts(self, session_id: str, text: str) -> None:
-        if not text or not text.strip():
-            return
+    async def send_to_tts(self, session_id: str, text: str | SentenceStream) -> None:
+        if isinstance(text, str):
+            if not text.strip():
+                return
+            text = text.strip()
         try:
             # 直接 await，出错能打到后台日志
-            await stream_and_broadcast(session_id, text.strip())
+            await stream_and_broadcast(session_id, text)
         except asyncio.CancelledError:
             raise
         except Exception as e:
-            LOGGER.exception(f"[ws_manager] send_to_tts failed sid={session_id}: {e}")
\ No newline at end of file
+            LOGGER.exception(f"[ws_manager] send_to_tts failed sid={session_id}: {e}")
+
+    def dispatch_tts(self, session_id: str, text: str | SentenceStream) -> Optional[asyncio.Task]:
+        """后台播报：立即返回，不阻塞 agent 主循环；同一会话只保留最新一路
+
+        传入 SentenceStream 时边生成边逐句播报。
+        """
+        if isinstance(text, str) and not text.strip():
+            return None
+        previous = self._tts_tasks.get(session_id)
+        if previous is not None and not previous.done():
+            tts_manager.cancel_stream(session_id)
+            previous.cancel()
+        task = asyncio.create_task(self.send_to_tts(session_id, text))
+        self._tts_tasks[session_id] = task
+
+        def _cleanup(done: asyncio.Task) -> None:
+            if self._tts_tasks.get(session_id) is done:
+                self._tts_tasks.pop(session_id, None)
+
+        task.add_done_callback(_cleanup)
+        return task
+
+    async def cancel_tts(self, session_id: str) -> Optional[float]:
+        """打断当前 TTS（barge-in），返回从发出取消到任务退出的耗时（毫秒）"""
+        task = self._tts_tasks.get(session_id)
+        if task is None or task.done():
+            return None
+        started = time.perf_counter()
+        token = tts_manager.cancel_stream(session_id)
+        if token is not None and token.cancelled_at is not None:
+            started = token.cancelled_at
+        task.cancel()
+        await asyncio.wait({task}, timeout=TTS_CANCEL_WAIT)
+        latency_ms = (time.perf_counter() - started) * 1000
+        self._tts_cancel_latency_ms.append(latency_ms)
+        LOGGER.info(f"[ws_manager] ⛔ TTS cancelled sid={session_id} in {latency_ms:.2f}ms")
+        return latency_ms
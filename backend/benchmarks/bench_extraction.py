@@ -0,0 +1,102 @@
+"""Microbenchmark: compiled extraction engine on a large transcript corpus.
+
+Extracts notes from every utterance of a synthetic corpus (or ``--input``,
+one utterance per line) with 0 to 500 domain keywords. The baseline is the
+previous per-rule approach: ``NUMBER_PATTERN.findall`` plus one substring
+scan per fuzzy marker and per keyword. The engine is timed per utterance and
+in batch mode (``extract_batch`` over chunks of ``--batch`` utterances).
+
+Run from ``backend/``::
+
+    python benchmarks/bench_extraction.py [--input transcripts.txt] [--size 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.services.extraction import FUZZY_MARKERS, NUMBER_PATTERN, ExtractionEngine, build_notes  # noqa: E402
+
+FRAGMENTS = [
+    "我们团队目前有{n}人",
+    "去年营收大概{n}万元",
+    "这个项目可能还要{n}个月",
+    "客户主要集中在{kw}",
+    "我们在{kw}上投入比较多",
+    "具体数字我暂时不确定",
+    "增长率大约是{n}%",
+    "这块主要靠{kw}来推动",
+    "其实我们也在考虑换个方向",
+    "整体来说进展还算顺利",
+]
+DOMAINS = ["供应链", "数据中台", "私域", "出海", "复购", "渠道", "算力", "合规", "品牌", "直播"]
+
+
+def keywords(count: int) -> List[str]:
+    words = [f"{domain}{suffix}" for suffix in ("", "建设", "运营", "团队", "成本") for domain in DOMAINS]
+    words += [f"{domain}方案{index}" for index in range(count) for domain in DOMAINS[:1]]
+    return words[:count]
+
+
+def corpus(size: int, words: Sequence[str]) -> List[str]:
+    rng = random.Random(11)
+    vocabulary = list(words) or DOMAINS
+    lines = []
+    for _ in range(size):
+        parts = [
+            rng.choice(FRAGMENTS).format(n=rng.randint(1, 5000), kw=rng.choice(vocabulary))
+            for _ in range(rng.randint(1, 4))
+        ]
+        lines.append("，".join(parts) + "。")
+    return lines
+
+
+def per_rule(utterance: str, words: Sequence[str]) -> list:
+    numbers = NUMBER_PATTERN.findall(utterance)
+    vague = any(marker in utterance for marker in FUZZY_MARKERS)
+    return build_notes(utterance, numbers, vague, [word for word in words if word in utterance])
+
+
+def timed(run: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--input", type=Path, help="text file, one utterance per line (default: synthetic)")
+    parser.add_argument("--size", type=int, default=100_000, help="synthetic corpus size")
+    parser.add_argument("--batch", type=int, default=1000, help="utterances per extract_batch call")
+    args = parser.parse_args()
+    given = None
+    if args.input:
+        given = [line.strip() for line in args.input.open(encoding="utf-8") if line.strip()]
+
+    print(f"{'keywords':>8}  {'utterances':>10}  {'per_rule/s':>11}  {'engine/s':>10}  {'batch/s':>10}  {'speedup':>7}")
+    for count in (0, 10, 50, 500):
+        words = keywords(count)
+        lines = given or corpus(args.size, words)
+        engine = ExtractionEngine(keywords=words)
+        baseline = timed(lambda: [per_rule(line, words) for line in lines])
+        single = timed(lambda: [engine.extract(line) for line in lines])
+        batched = timed(
+            lambda: [engine.extract_batch(lines[i : i + args.batch]) for i in range(0, len(lines), args.batch)]
+        )
+        total = len(lines)
+        print(
+            f"{count:>8}  {total:>10}  {total / baseline:>11.0f}  {total / single:>10.0f}"
+            f"  {total / batched:>10.0f}  {baseline / batched:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
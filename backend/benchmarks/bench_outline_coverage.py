@@ -0,0 +1,72 @@
+"""Microbenchmark: semantic outline coverage on large outlines.
+
+Times building ``OutlineVectors`` (once per outline) and scoring one answer
+against every question of outlines with 10 to 5000 questions. The baseline
+is a per-question Python loop that re-extracts each question's n-grams for
+every answer (no precomputation, unweighted).
+
+Run from ``backend/``::
+
+    python benchmarks/bench_outline_coverage.py
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.services.outline_coverage import OutlineVectors, question_ngrams  # noqa: E402
+
+SUBJECTS = ["团队规模", "核心指标", "业务背景", "融资计划", "供应链", "用户增长", "成本结构", "技术架构", "组织分工", "市场竞争"]
+ASPECTS = ["现状", "挑战", "目标", "复盘", "风险", "投入", "节奏", "协作", "数据", "案例"]
+FORMS = ["请介绍一下{}的{}", "{}方面的{}如何？", "{}的{}有哪些？", "能谈谈{}在{}上的经验吗？"]
+ANSWER = "我们团队有二十个人，核心指标是复购率，去年在供应链成本结构上做了很多复盘，主要挑战是数据打不通。"
+
+
+def outline(size: int) -> tuple[str, ...]:
+    combos = [form.format(s, a) for form, s, a in itertools.product(FORMS, SUBJECTS, ASPECTS)]
+    random.Random(5).shuffle(combos)
+    while len(combos) < size:
+        combos.extend(f"{q}（{len(combos)}）" for q in combos[: size - len(combos)])
+    return tuple(combos[:size])
+
+
+def loop_scores(questions: tuple[str, ...], answer: str) -> list[float]:
+    grams = set(question_ngrams(answer))
+    scores = []
+    for question in questions:
+        counts = question_ngrams(question)
+        total = sum(c * c for c in counts.values()) or 1
+        scores.append(sum(c * c for g, c in counts.items() if g in grams) / total)
+    return scores
+
+
+def main() -> None:
+    for size in (10, 100, 1000, 5000):
+        questions = outline(size)
+        started = time.perf_counter()
+        vectors = OutlineVectors(questions)
+        build_ms = (time.perf_counter() - started) * 1000
+        rounds = 200
+        started = time.perf_counter()
+        for _ in range(rounds):
+            vectors.scores(ANSWER)
+        vector_ms = (time.perf_counter() - started) * 1000 / rounds
+        started = time.perf_counter()
+        for _ in range(max(1, rounds // 20)):
+            loop_scores(questions, ANSWER)
+        loop_ms = (time.perf_counter() - started) * 1000 / max(1, rounds // 20)
+        print(
+            f"questions={size:>5}  build={build_ms:8.2f} ms  "
+            f"vectorized={vector_ms:7.3f} ms/answer  python loop={loop_ms:8.3f} ms/answer"
+        )
+
+
+if __name__ == "__main__":
+    main()
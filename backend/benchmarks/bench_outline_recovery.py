@@ -0,0 +1,80 @@
+"""Microbenchmark: outline JSON recovery on malformed model output.
+
+Compares the single-pass bracket scanner behind ``_coerce_outline_payload``
+with the previous implementation, which called ``JSONDecoder.raw_decode`` at
+every character offset, on inputs where the outline is buried in junk.
+
+Run from ``backend/``::
+
+    python benchmarks/bench_outline_recovery.py
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.services.outline import _coerce_outline_payload, _strip_code_fence  # noqa: E402
+
+OUTLINE = json.dumps(
+    [
+        {"stage": "背景", "questions": ["请介绍一下业务背景", "团队规模如何？"]},
+        {"stage": "细节", "questions": ["核心指标是什么？", "遇到了什么挑战？"]},
+        {"stage": "结论", "questions": ["下一步计划是什么？"]},
+    ],
+    ensure_ascii=False,
+)
+
+
+def legacy_coerce(raw: str):
+    cleaned = _strip_code_fence(raw.strip())
+    decoder = json.JSONDecoder()
+    idx = 0
+    while idx < len(cleaned):
+        try:
+            value, next_idx = decoder.raw_decode(cleaned, idx)
+        except json.JSONDecodeError:
+            idx += 1
+            continue
+        idx = max(next_idx, idx + 1)
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            return value
+    return None
+
+
+def cases() -> dict[str, str]:
+    reasoning = "让我先想一想这个主题的背景：{需要覆盖指标}，[行动项] 以及 \"风险\"。\n"
+    truncated = OUTLINE[: len(OUTLINE) // 2]
+    return {
+        "clean": OUTLINE,
+        "prose+outline": "好的，以下是提纲：\n" + OUTLINE + "\n希望有帮助！",
+        "2KB junk": reasoning * 40 + OUTLINE,
+        "20KB junk": reasoning * 400 + OUTLINE,
+        "truncated+retry": (truncated + "\n") * 50 + OUTLINE,
+        "20KB brackets": "[{" * 10000,
+    }
+
+
+def timed(fn, raw: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(raw)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main() -> None:
+    print(f"{'case':<18}{'bytes':>8}{'legacy ms':>12}{'scanner ms':>12}{'speedup':>9}")
+    for name, raw in cases().items():
+        repeat = 3 if len(raw) > 10000 else 50
+        legacy = timed(legacy_coerce, raw, repeat)
+        scanner = timed(_coerce_outline_payload, raw, repeat)
+        print(f"{name:<18}{len(raw.encode()):>8}{legacy:>12.3f}{scanner:>12.3f}{legacy / scanner:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Microbenchmark: policy prompt size with and without the token budget.
+
+Plays a synthetic interview with long answers through ``ConversationState``
+and, at each turn, compares the old payload (the last eight turns verbatim)
+with ``build_policy_payload`` under the default POLICY_PROMPT_TOKENS budget.
+Time-to-first-token is modelled as ``base + prefill * tokens``; live TTFT is
+reported under ``policy_prompt`` in ``/health``.
+
+Run from ``backend/``::
+
+    python benchmarks/bench_policy_prompt.py
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.config import settings  # noqa: E402
+from app.services.prompt_context import (  # noqa: E402
+    build_policy_payload,
+    estimate_tokens,
+    uncapped_tokens,
+    update_summary,
+)
+from app.services.state_machine import ConversationState  # noqa: E402
+
+SYSTEM_PROMPT = "你是采访策略助手，需要根据最近的对话、提纲覆盖率和待澄清事项，选择下一步行动。"
+SENTENCES = [
+    "我们团队去年把交付周期从六周缩短到了三周。",
+    "当时最大的问题其实是跨部门沟通，很多需求在流转中丢失了。",
+    "核心指标是月活和留存，留存大概提升了 12%。",
+    "后来我们引入了每周一次的复盘机制，大家会把问题都摊开来讲。",
+    "预算方面今年追加了 300 万，主要投入在数据平台上。",
+    "说实话这个过程挺辛苦的，但是整体方向是对的。",
+]
+BASE_TTFT_MS = 300.0
+PREFILL_MS_PER_TOKEN = 0.4
+
+
+def answer(rng: random.Random) -> str:
+    return "".join(rng.choice(SENTENCES) for _ in range(rng.randint(4, 30)))
+
+
+def main() -> None:
+    rng = random.Random(3)
+    budget = settings.policy_prompt_tokens - estimate_tokens(SYSTEM_PROMPT)
+    state = ConversationState("bench", "数字化转型复盘", [f"Q{i}" for i in range(12)])
+    old_total = new_total = 0
+    build_ms = 0.0
+    turns = 40
+    for turn in range(turns):
+        state.add_turn("assistant", f"第 {turn} 个问题：能具体讲讲这一块吗？")
+        state.add_turn("user", answer(rng))
+        update_summary(state)
+        old_total += uncapped_tokens(state, SYSTEM_PROMPT)
+        started = time.perf_counter()
+        _, tokens = build_policy_payload(state, budget)
+        build_ms += (time.perf_counter() - started) * 1000
+        new_total += tokens + estimate_tokens(SYSTEM_PROMPT)
+    old_avg = old_total / turns
+    new_avg = new_total / turns
+    print(f"turns={turns}  budget={settings.policy_prompt_tokens} tokens")
+    print(f"prompt tokens   verbatim={old_avg:8.0f}  budgeted={new_avg:8.0f}  ({new_avg / old_avg:.0%})")
+    print(
+        f"modelled TTFT   verbatim={BASE_TTFT_MS + PREFILL_MS_PER_TOKEN * old_avg:8.0f} ms"
+        f"  budgeted={BASE_TTFT_MS + PREFILL_MS_PER_TOKEN * new_avg:8.0f} ms"
+    )
+    print(f"payload build   {build_ms / turns:.3f} ms/turn  summary={estimate_tokens(state.summary)} tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Microbenchmark: byte-level SSE decoding vs the previous line-based parser.
+
+Replays the recorded Ark stream in ``tests/data/ark_chat_stream.sse``
+(repeated to a long response) in fixed-size reads, as ``iter_any`` would
+deliver them, and reports the per-event decoding cost of both parsers.
+
+Run from ``backend/``::
+
+    python benchmarks/bench_sse.py
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.core.sse import JSON_BACKEND, SSEDecoder, decode_json_event  # noqa: E402
+
+RECORDED = (BACKEND_PATH / "tests" / "data" / "ark_chat_stream.sse").read_bytes()
+BODY = RECORDED.replace(b"data: [DONE]\n\n", b"")
+
+
+def legacy_parse(lines: list[bytes]) -> int:
+    """The pre-decoder implementation: decode, splitlines and json.loads per line."""
+
+    count = 0
+    for line in lines:
+        if not line:
+            continue
+        for chunk in line.decode("utf-8").splitlines():
+            if not chunk or not chunk.startswith("data:"):
+                continue
+            data = chunk.removeprefix("data:").strip()
+            if data == "[DONE]":
+                return count
+            try:
+                parsed = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            for choice in parsed.get("choices") or []:
+                if (choice.get("delta") or {}).get("content"):
+                    count += 1
+    return count
+
+
+def decoder_parse(chunks: list[bytes]) -> int:
+    count = 0
+    decoder = SSEDecoder()
+    for raw in chunks:
+        for event in decoder.feed(raw):
+            if event.data == b"[DONE]":
+                return count
+            for parsed in decode_json_event(event):
+                for choice in parsed.get("choices") or []:
+                    if (choice.get("delta") or {}).get("content"):
+                        count += 1
+    return count
+
+
+def _bench(fn, arg, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(repeat: int = 500, read_size: int = 1024, rounds: int = 7) -> None:
+    stream = BODY * repeat + b"data: [DONE]\n\n"
+    chunks = [stream[i : i + read_size] for i in range(0, len(stream), read_size)]
+    lines = stream.splitlines(keepends=True)
+    events = stream.count(b"\n\n")
+
+    assert legacy_parse(lines) == decoder_parse(chunks)
+    legacy = _bench(legacy_parse, lines, rounds)
+    new = _bench(decoder_parse, chunks, rounds)
+    print(f"stream: {len(stream) / 1024:.0f} KiB, {events} events, {read_size}B reads, json backend={JSON_BACKEND}")
+    print(f"legacy line parser : {legacy * 1000:8.2f} ms  ({legacy / events * 1e6:.2f} us/event)")
+    print(f"byte SSE decoder   : {new * 1000:8.2f} ms  ({new / events * 1e6:.2f} us/event)")
+    print(f"speedup            : {legacy / new:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Microbenchmark: near-duplicate topic lookup latency at different index sizes.
+
+Builds synthetic topic corpora by combining industry / subject / aspect
+words, then times ``TopicIndex.query`` for reworded variants of indexed
+topics. Compare the per-lookup cost with a single outline LLM call
+(typically several seconds).
+
+Run from ``backend/``::
+
+    python benchmarks/bench_topic_index.py
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.services.topic_index import TopicIndex  # noqa: E402
+
+INDUSTRIES = ["新能源车", "金融", "跨境电商", "医疗", "教育", "半导体", "物流", "零售", "游戏", "文旅"]
+SUBJECTS = ["供应链", "大模型应用", "出海", "数字化转型", "成本控制", "用户增长", "合规", "组织管理", "品牌建设", "AI Agent"]
+ASPECTS = ["2023", "2024", "复盘", "趋势", "挑战", "最佳实践", "案例", "策略", "落地", "展望"]
+
+
+def corpus(size: int) -> list[str]:
+    combos = list(itertools.product(INDUSTRIES, SUBJECTS, ASPECTS))
+    random.Random(7).shuffle(combos)
+    topics = [" ".join(parts) for parts in combos]
+    while len(topics) < size:
+        topics.extend(f"{topic} {len(topics)}" for topic in topics[: size - len(topics)])
+    return topics[:size]
+
+
+def main() -> None:
+    for size in (100, 1000, 10000):
+        topics = corpus(size)
+        index = TopicIndex()
+        started = time.perf_counter()
+        for i, topic in enumerate(topics):
+            index.add(str(i), topic)
+        index.query(topics[0], threshold=1.1)  # trigger the lazy weight rebuild
+        build_ms = (time.perf_counter() - started) * 1000
+        queries = ["".join(reversed(topic.split(" "))) for topic in random.Random(1).sample(topics, min(200, size))]
+        started = time.perf_counter()
+        for query in queries:
+            index.query(query, threshold=0.7)
+        per_query = (time.perf_counter() - started) * 1000 / len(queries)
+        print(f"topics={size:>6}  build={build_ms:8.1f} ms  lookup={per_query:7.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Offline comparison of the local (rule-based) policy with LLM decisions.
+
+Replays recorded interviews turn by turn. At every turn the local policy's
+decision and confidence (``assess_local``) are compared with the LLM's
+action, then the state is advanced with the LLM's decision. For a range of
+HYBRID_POLICY_MIN_CONFIDENCE values it prints how many turns would be
+answered locally, how often those local answers agree with the LLM, and the
+policy latency that would be saved.
+
+Sources:
+
+* default: the ``turns`` table of DATABASE_URL (recorded ``llm_action``;
+  turns that were already answered by a fallback or the local policy are
+  skipped);
+* ``--input FILE``: JSONL, one session per line:
+  ``{"topic": ..., "questions": [...], "turns": [{"text": ..., "action": ..., "question": ...}]}``.
+
+``--live`` asks the policy LLM again for every turn (needs Ark credentials)
+and uses its measured latency; otherwise ``--llm-ms`` is assumed per call.
+
+Run from ``backend/``::
+
+    python benchmarks/compare_hybrid_policy.py [--input sessions.jsonl] [--live]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+BACKEND_PATH = Path(__file__).resolve().parents[1]
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.services.agent import AgentOrchestrator  # noqa: E402
+from app.services.outline import outline_builder  # noqa: E402
+from app.services.policy import PolicyDecision, PolicyError, decide_policy  # noqa: E402
+from app.services.policy_gate import assess_local  # noqa: E402
+from app.services.state_machine import StateMachine  # noqa: E402
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95)
+NON_LLM_RATIONALES = ("rule-based", "local policy")
+
+
+@dataclass
+class RecordedSession:
+    topic: str
+    questions: List[str]
+    turns: List[dict]
+
+
+@dataclass
+class Comparison:
+    confidence: float
+    reason: str
+    agrees: bool
+    llm_seconds: float
+
+
+def load_jsonl(path: Path) -> List[RecordedSession]:
+    sessions = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                raw = json.loads(line)
+                sessions.append(RecordedSession(raw["topic"], list(raw.get("questions") or []), raw["turns"]))
+    return sessions
+
+
+async def load_database() -> List[RecordedSession]:
+    from sqlalchemy import select
+
+    from app.database import SessionLocal
+    from app.models import Session, Turn
+
+    sessions = []
+    async with SessionLocal() as db:
+        for session_obj in (await db.execute(select(Session).order_by(Session.id))).scalars():
+            rows = (
+                await db.execute(select(Turn).where(Turn.session_id == session_obj.id).order_by(Turn.id))
+            ).scalars()
+            turns = [
+                {
+                    "text": row.transcript,
+                    "action": row.llm_action,
+                    "recorded_by_llm": not (row.llm_rationale or "").startswith(NON_LLM_RATIONALES),
+                }
+                for row in rows
+            ]
+            if not turns:
+                continue
+            outline = await outline_builder.peek(session_obj.topic) or outline_builder.preliminary(session_obj.topic)
+            questions = [q.question for section in outline.sections for q in section.questions]
+            sessions.append(RecordedSession(session_obj.topic, questions, turns))
+    return sessions
+
+
+async def replay(sessions: Iterable[RecordedSession], live: bool, llm_seconds: float) -> List[Comparison]:
+    orchestrator = AgentOrchestrator()
+    results: List[Comparison] = []
+    for number, session in enumerate(sessions):
+        machine = StateMachine(session_id=f"replay-{number}", topic=session.topic, outline_questions=session.questions)
+        for turn in session.turns:
+            orchestrator._prepare_turn(machine, turn["text"])
+            local = assess_local(machine)
+            reference: Optional[PolicyDecision] = None
+            elapsed = llm_seconds
+            if live:
+                started = time.perf_counter()
+                try:
+                    reference = await decide_policy(machine.data)
+                except PolicyError as exc:
+                    print(f"  policy call failed, turn skipped: {exc}", file=sys.stderr)
+                elapsed = time.perf_counter() - started
+            elif turn.get("recorded_by_llm", True):
+                reference = PolicyDecision(
+                    action=turn["action"],
+                    question=turn.get("question") or local.decision.question,
+                    rationale="recorded",
+                )
+            if reference is not None:
+                results.append(Comparison(local.confidence, local.reason, local.decision.action == reference.action, elapsed))
+            decision = reference or local.decision
+            orchestrator._sync_stage_with_action(machine, decision.action)
+            machine.apply_policy_decision(decision)
+    return results
+
+
+def report(results: List[Comparison]) -> None:
+    if not results:
+        print("no LLM-decided turns to compare")
+        return
+    total = len(results)
+    overall = sum(item.agrees for item in results) / total
+    print(f"turns={total}  rule/LLM action agreement={overall:.1%}")
+    print(f"{'min_conf':>8}  {'local':>6}  {'share':>6}  {'agree':>6}  {'saved_ms':>9}")
+    for threshold in THRESHOLDS:
+        local = [item for item in results if item.confidence >= threshold]
+        agree = sum(item.agrees for item in local) / len(local) if local else 0.0
+        saved = sum(item.llm_seconds for item in local) * 1000
+        print(f"{threshold:>8.2f}  {len(local):>6}  {len(local) / total:>6.1%}  {agree:>6.1%}  {saved:>9.0f}")
+    by_reason: dict = {}
+    for item in results:
+        count, agreed = by_reason.get(item.reason, (0, 0))
+        by_reason[item.reason] = (count + 1, agreed + item.agrees)
+    for reason, (count, agreed) in sorted(by_reason.items()):
+        print(f"  {reason:<22} turns={count:<5} agree={agreed / count:.1%}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--input", type=Path, help="JSONL file of recorded sessions (default: the database)")
+    parser.add_argument("--live", action="store_true", help="ask the policy LLM again for every turn")
+    parser.add_argument("--llm-ms", type=float, default=1500.0, help="assumed LLM decision latency without --live")
+    args = parser.parse_args()
+    sessions = load_jsonl(args.input) if args.input else await load_database()
+    report(await replay(sessions, args.live, args.llm_ms / 1000))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
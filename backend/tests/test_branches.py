@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.core import tts_client
+from app.core.tts_client import AudioPrefetcher, text_segments
+from app.services import agent as agent_module
+from app.services.agent import AgentOrchestrator
+from app.services.branches import BranchStats
+from app.services.policy import PolicyDecision
+from app.services.policy_gate import FOLLOWUP_QUESTION
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+
+
+def _outline() -> PlanResponse:
+    return PlanResponse(
+        topic="主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question=q) for q in ("Q1", "Q2", "Q3", "Q4", "Q5")])],
+    )
+
+
+async def _orchestrator(monkeypatch, session_id: str) -> AgentOrchestrator:
+    monkeypatch.setattr(settings, "precompute_branches_enabled", True)
+    monkeypatch.setattr(settings, "hybrid_policy_enabled", True)
+    monkeypatch.setattr(settings, "hybrid_policy_min_confidence", 0.5)
+    monkeypatch.setattr(agent_module, "branch_stats", BranchStats())
+    orchestrator = AgentOrchestrator()
+
+    async def _skip_persist(**kwargs):
+        return None
+
+    async def no_llm(state, **kwargs):
+        raise AssertionError("policy LLM should not be called")
+
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+    monkeypatch.setattr(agent_module, "decide_policy", no_llm)
+    await orchestrator.ensure_session(session_id, "主题", _outline())
+    await orchestrator.bootstrap_decision(session_id)
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_branches_cover_followup_and_next(monkeypatch):
+    orchestrator = await _orchestrator(monkeypatch, "b1")
+    machine = orchestrator._machines["b1"]
+    before = machine.data.checkpoint()
+    branches = {branch.kind: branch.decision for branch in orchestrator.precompute_branches("b1")}
+    assert branches["followup"].question == FOLLOWUP_QUESTION
+    assert branches["next"].question == "Q2"
+    # 引用样例原话的澄清问题不可能被真实回答命中，不做推演
+    assert "clarify" not in branches
+    # 推演在副本上进行，不影响真实状态
+    assert machine.data.checkpoint() == before
+
+
+@pytest.mark.asyncio
+async def test_turn_reports_matching_branch(monkeypatch):
+    orchestrator = await _orchestrator(monkeypatch, "b2")
+    orchestrator.precompute_branches("b2")
+    decision = await orchestrator.handle_user_turn("b2", "我们团队目前有二十个人，分成三个小组。")
+    assert decision.question == "Q2"
+    assert decision.branch == "next"
+
+    orchestrator.precompute_branches("b2")
+    decision = await orchestrator.handle_user_turn("b2", "对")
+    assert decision.branch == "followup"
+
+    # 没有预先推演的轮次不计命中
+    decision = await orchestrator.handle_user_turn("b2", "我们团队目前有二十个人，分成三个小组。")
+    assert decision.branch is None
+    stats = agent_module.branch_stats.snapshot()
+    assert stats["turns"] == 3 and stats["hits"] == 2
+    assert stats["hits_by_kind"] == {"next": 1, "followup": 1}
+    await asyncio.sleep(0.01)  # 让后台持久化任务结束
+
+
+@pytest.mark.asyncio
+async def test_disabled_precompute_is_a_no_op(monkeypatch):
+    orchestrator = await _orchestrator(monkeypatch, "b3")
+    monkeypatch.setattr(settings, "precompute_branches_enabled", False)
+    assert orchestrator.precompute_branches("b3") == []
+
+
+@pytest.mark.asyncio
+async def test_branches_need_the_local_policy(monkeypatch):
+    orchestrator = await _orchestrator(monkeypatch, "b4")
+    monkeypatch.setattr(settings, "hybrid_policy_enabled", False)
+    assert orchestrator.precompute_branches("b4") == []
+
+    monkeypatch.setattr(settings, "hybrid_policy_enabled", True)
+    monkeypatch.setattr(settings, "hybrid_policy_min_confidence", 0.9)
+    # 一句话回答的通用追问置信度不足，但仍是最可能的分支，保留预合成
+    kinds = {branch.kind for branch in orchestrator.precompute_branches("b4")}
+    assert kinds == {"followup", "next"}
+
+    orchestrator.release_session("b4")
+    assert "b4" not in orchestrator._branches
+
+
+@pytest.mark.asyncio
+async def test_matching_branch_decision_is_reused(monkeypatch):
+    orchestrator = await _orchestrator(monkeypatch, "b5")
+    # 门控阈值高于追问分支：没有预先推演时该轮需要调用 LLM
+    monkeypatch.setattr(settings, "hybrid_policy_min_confidence", 0.9)
+    orchestrator.precompute_branches("b5")
+    decision = await orchestrator.handle_user_turn("b5", "对")
+    assert decision.question == FOLLOWUP_QUESTION
+    assert decision.branch == "followup"
+    assert decision.rationale.startswith("precomputed branch (followup")
+    assert "b5" not in orchestrator._branches
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_prefetched_audio_is_reused(monkeypatch):
+    prefetcher = AudioPrefetcher()
+    monkeypatch.setattr(tts_client, "audio_prefetcher", prefetcher)
+    monkeypatch.setattr(tts_client, "VOLC_TTS_KEY", "key")
+    synthesized = []
+
+    async def fake_synth(text):
+        synthesized.append(text)
+        return f"audio:{text}".encode()
+
+    monkeypatch.setattr(tts_client, "_synth_with_retry", fake_synth)
+    assert prefetcher.prefetch("s", "下一个问题是什么？") == 1
+    assert prefetcher.prefetch("s", "另一个候选问题？") == 1
+    prefetcher.retain("s", ["下一个问题是什么？"])
+    await asyncio.sleep(0)
+
+    segment = text_segments("下一个问题是什么？")[0]
+    assert await tts_client._synth_segment("s", segment) == f"audio:{segment}".encode()
+    assert await tts_client._synth_segment("s", "没有预合成的问题") == "audio:没有预合成的问题".encode()
+    stats = prefetcher.stats()
+    assert stats["hits"] == 1 and stats["wasted"] == 1
+    assert synthesized.count(segment) == 1
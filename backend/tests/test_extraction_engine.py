@@ -0,0 +1,82 @@
+import random
+
+from app.services.extraction import (
+    FUZZY_MARKERS,
+    NUMBER_PATTERN,
+    ExtractionEngine,
+    ExtractionStats,
+    IncrementalExtractor,
+    extractor,
+)
+
+
+def _contents(notes):
+    return [(note.category, note.content) for note in notes]
+
+
+def test_engine_matches_per_rule_extraction() -> None:
+    engine = ExtractionEngine()
+    rng = random.Random(3)
+    alphabet = list("0123456789.%万亿件人小时元人民币可能大概不确定暂时，我")
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+        notes = engine.extract(text)
+        assert [content for category, content in _contents(notes) if category == "数字"] == [
+            value + unit for value, unit in NUMBER_PATTERN.findall(text)
+        ]
+        assert any(note.requires_clarification for note in notes) == any(marker in text for marker in FUZZY_MARKERS)
+
+
+def test_keywords_do_not_hide_fuzzy_markers() -> None:
+    engine = ExtractionEngine(keywords=["最大", "不确", "可", "能力", "暂"])
+
+    notes = engine.extract("最大概率明年上线")
+    assert ("关键词", "最大") in _contents(notes)
+    assert any(note.requires_clarification for note in notes)
+    batch = ["明年上线", "最大概率明年上线", "最大"]
+    assert engine.extract_batch(batch) == [engine.extract(text) for text in batch]
+
+    # 与基线（逐个子串判断）一致：关键词与标记重叠时仍识别为含糊
+    rng = random.Random(5)
+    alphabet = list("最大概率不确定可能力暂时12人，")
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        vague = any(note.requires_clarification for note in engine.extract(text))
+        assert vague == any(marker in text for marker in FUZZY_MARKERS), text
+
+
+def test_keywords_prefer_longest_and_are_deduplicated() -> None:
+    engine = ExtractionEngine(keywords=["北京", "北京市", "中台"])
+
+    notes = engine.extract("总部在北京市，中台团队30人，北京还有分部，中台可能要扩")
+
+    assert _contents(notes) == [
+        ("数字", "30人"),
+        ("关键词", "北京市"),
+        ("关键词", "中台"),
+        ("关键词", "北京"),
+        ("澄清", "回答含糊，需要追问"),
+    ]
+
+
+def test_batch_equals_single_extraction() -> None:
+    engine = ExtractionEngine(keywords=["供应链", "出海"])
+    utterances = ["", "供应链大概有12个环节", "没有", "出海业务占30%", "", "暂时不好说"]
+
+    assert engine.extract_batch(utterances) == [engine.extract(text) for text in utterances]
+    assert engine.extract_batch(["第一行\n第二行12"]) == [engine.extract("第一行\n第二行12")]
+    assert engine.extract_batch([]) == []
+
+
+def test_incremental_extraction_with_keywords() -> None:
+    engine = ExtractionEngine(keywords=["数据", "数据中台"])
+    incremental = IncrementalExtractor(engine)
+    final = "我们的数据中台有20人"
+    for end in range(1, len(final) + 1):
+        incremental.feed(final[:end])
+
+    assert _contents(incremental.finish(final, stats=ExtractionStats())) == [("数字", "20人"), ("关键词", "数据中台")]
+
+
+def test_default_extractor_has_no_keywords() -> None:
+    assert _contents(extractor.extract("供应链还不错")) == [("观点", "供应链还不错")]
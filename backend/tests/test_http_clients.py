@@ -0,0 +1,60 @@
+import asyncio
+import warnings
+
+import pytest
+
+from app.core.http_clients import HttpClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_one_session_per_upstream() -> None:
+    registry = HttpClientRegistry()
+    registry.register("ark", prewarm_url="https://ark.example.com/api/v3")
+
+    first = registry.get("ark")
+    second = registry.get("ark")
+    other = registry.get("tts")
+
+    assert first is second
+    assert other is not first
+    assert registry._clients["ark"].config.prewarm_url == "https://ark.example.com/"
+    stats = registry.stats()
+    assert stats["ark"]["open"] is True
+    assert stats["ark"]["in_use"] == 0
+    assert stats["ark"]["sessions_created"] == 1
+
+    await registry.close()
+    assert first.closed and other.closed
+    assert registry.stats()["ark"]["open"] is False
+
+
+def test_registry_recreates_session_for_new_event_loop() -> None:
+    registry = HttpClientRegistry()
+
+    async def grab():
+        session = registry.get("asr")
+        return session
+
+    first = asyncio.run(grab())
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        second = asyncio.run(grab())
+
+    assert first is not second
+    # 会话本身被关闭（而非只关闭连接器），GC 时不会出现 "Unclosed client session"
+    assert first.closed and first.connector is None
+    assert registry.stats()["asr"]["sessions_created"] == 2
+    asyncio.run(registry.close())
+
+
+def test_registry_pool_limits_can_be_overridden() -> None:
+    registry = HttpClientRegistry()
+    client = registry.register("asr", limit=0, limit_per_host=0)
+    assert (client.config.limit, client.config.limit_per_host) == (0, 0)
+    assert registry.register("tts").config.limit_per_host > 0
+
+
+def test_asr_prewarm_url_uses_https_origin() -> None:
+    registry = HttpClientRegistry()
+    client = registry.register("asr", prewarm_url="wss://openspeech.bytedance.com/api/v2/asr")
+    assert client.config.prewarm_url == "https://openspeech.bytedance.com/"
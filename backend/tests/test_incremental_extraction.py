@@ -0,0 +1,136 @@
+import asyncio
+import random
+
+import pytest
+
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+from app.services import agent as agent_module
+from app.services.agent import AgentOrchestrator
+from app.services.extraction import ExtractionStats, IncrementalExtractor, extractor
+from app.services.policy import PolicyDecision
+
+
+def _feed_all(partials):
+    incremental = IncrementalExtractor()
+    for partial in partials:
+        incremental.feed(partial)
+    return incremental
+
+
+def test_growing_partials_scan_only_new_suffix() -> None:
+    final = "我们团队有12人，预计明年营收大概3.5亿元，目前还在招聘。"
+    incremental = _feed_all(final[:end] for end in range(1, len(final) + 1))
+
+    notes = incremental.finish(final, stats=ExtractionStats())
+
+    assert notes == extractor.extract(final)
+    assert [note.content for note in notes] == ["12人", "3.5亿元", "回答含糊，需要追问"]
+    # 每个字只需扫描常数次，final 到来时几乎无需再扫
+    assert incremental.scanned <= (incremental.engine.lookahead + 2) * len(final)
+
+
+def test_number_at_partial_boundary_is_not_committed_early() -> None:
+    incremental = _feed_all(["营收12", "营收12.", "营收12.5万"])
+
+    assert [note.content for note in incremental.finish("营收12.5万元", stats=ExtractionStats())] == ["12.5万元"]
+
+
+def test_revised_final_is_reconciled() -> None:
+    stats = ExtractionStats()
+    incremental = _feed_all(["可能有", "可能有30人", "可能有30人在做"])
+
+    notes = incremental.finish("目前有300人在做", stats=stats)
+
+    assert notes == extractor.extract("目前有300人在做")
+    assert not any(note.requires_clarification for note in notes)
+    assert stats.snapshot()["revised"] == 1
+
+
+def test_random_partials_match_batch_extraction() -> None:
+    alphabet = list("0123456789.%万亿件人元可能大概不确定暂时，我们 a")
+    rng = random.Random(7)
+    for _ in range(2000):
+        text = ""
+        incremental = IncrementalExtractor()
+        for _ in range(rng.randint(0, 10)):
+            if rng.random() < 0.7:
+                text += "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            else:
+                text = text[: rng.randint(0, len(text))] + rng.choice(alphabet)
+            incremental.feed(text)
+        final = text[: rng.randint(0, len(text))] + "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+        assert incremental.finish(final, stats=ExtractionStats()) == extractor.extract(final)
+
+
+@pytest.mark.asyncio
+async def test_turn_uses_notes_extracted_from_partials(monkeypatch: pytest.MonkeyPatch) -> None:
+    orchestrator = AgentOrchestrator()
+    outline = PlanResponse(
+        topic="测试主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="Q1"), PlanQuestion(question="Q2")])],
+    )
+    await orchestrator.ensure_session("48", "测试主题", outline)
+
+    async def fake_policy(state, **kwargs):
+        return PolicyDecision(action="ask", question="Q2", rationale="llm")
+
+    async def skip_persist(**kwargs):
+        return None
+
+    def no_batch(text):
+        raise AssertionError("final turn should reuse the incremental notes")
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", skip_persist)
+    monkeypatch.setattr(agent_module.extractor, "extract", no_batch)
+
+    assert orchestrator.observe_partial("48", "大概有") == "大概有"
+    orchestrator.observe_final("48", "大概有20人")
+    # 返回合并后的整轮文本，与去抖后提交给 handle_user_turn 的文本一致（用于预判）
+    assert orchestrator.observe_partial("48", "都在北京") == "大概有20人 都在北京"
+    decision = await orchestrator.handle_user_turn("48", "大概有20人 都在北京")
+
+    assert [note["content"] for note in decision.new_notes] == ["20人", "回答含糊，需要追问"]
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_turn_keeps_live_extraction(monkeypatch: pytest.MonkeyPatch) -> None:
+    orchestrator = AgentOrchestrator()
+    outline = PlanResponse(
+        topic="测试主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="Q1"), PlanQuestion(question="Q2")])],
+    )
+    await orchestrator.ensure_session("48c", "测试主题", outline)
+    started = asyncio.Event()
+
+    async def slow_policy(state, **kwargs):
+        started.set()
+        await asyncio.sleep(10)
+
+    async def skip_persist(**kwargs):
+        return None
+
+    monkeypatch.setattr(agent_module, "decide_policy", slow_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", skip_persist)
+
+    orchestrator.observe_final("48c", "大概有20人")
+    turn = asyncio.create_task(orchestrator.handle_user_turn("48c", "大概有20人"))
+    await started.wait()
+    turn.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await turn
+
+    # 被去抖合并取消后，缓存的 final 仍在，后续 partial 接着增量抽取
+    live = orchestrator._live_turns["48c"]
+    assert live.finals == ["大概有20人"]
+    assert orchestrator.observe_partial("48c", "都在北京") == "大概有20人 都在北京"
+
+    async def fake_policy(state, **kwargs):
+        return PolicyDecision(action="ask", question="Q2", rationale="llm")
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+    decision = await orchestrator.handle_user_turn("48c", "大概有20人 都在北京")
+    assert [note["content"] for note in decision.new_notes] == ["20人", "回答含糊，需要追问"]
+    assert "48c" not in orchestrator._live_turns
+    await asyncio.sleep(0.01)
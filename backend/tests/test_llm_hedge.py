@@ -0,0 +1,181 @@
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.core import llm
+from app.core.llm_hedge import HedgedStreams
+from app.services import policy
+from app.services.state_machine import StateMachine
+
+
+def _slow_then_fast(delays, closed):
+    """Stream factory whose n-th request waits ``delays[n]`` before its first chunk."""
+
+    calls = []
+
+    def factory():
+        index = len(calls)
+        calls.append(index)
+
+        async def stream():
+            try:
+                await asyncio.sleep(delays[index])
+                yield f"r{index}-a"
+                yield f"r{index}-b"
+            finally:
+                closed.append(index)
+
+        return stream()
+
+    return factory, calls
+
+
+async def _collect(hedger, factory):
+    return [chunk async for chunk in hedger.stream(factory)]
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    closed: list = []
+    factory, calls = _slow_then_fast([0.0], closed)
+    hedger = HedgedStreams(max_ratio=1.0, initial_delay=0.05, min_delay=0.01)
+    assert await _collect(hedger, factory) == ["r0-a", "r0-b"]
+    assert calls == [0]
+    assert hedger.stats()["hedged"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_loser_cancelled():
+    closed: list = []
+    factory, calls = _slow_then_fast([1.0, 0.0], closed)
+    hedger = HedgedStreams(max_ratio=1.0, initial_delay=0.05, min_delay=0.01)
+    started = asyncio.get_running_loop().time()
+    chunks = await _collect(hedger, factory)
+    assert chunks == ["r1-a", "r1-b"]
+    assert asyncio.get_running_loop().time() - started < 0.5
+    assert calls == [0, 1]
+    assert sorted(closed) == [0, 1]
+    stats = hedger.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_still_wins_if_it_starts_first():
+    closed: list = []
+    factory, _ = _slow_then_fast([0.08, 1.0], closed)
+    hedger = HedgedStreams(max_ratio=1.0, initial_delay=0.05, min_delay=0.01)
+    assert await _collect(hedger, factory) == ["r0-a", "r0-b"]
+    stats = hedger.stats()
+    assert stats["hedged"] == 1 and stats["hedge_wins"] == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_by_ratio():
+    hedger = HedgedStreams(max_ratio=0.25, initial_delay=0.01, min_delay=0.01)
+    for _ in range(8):
+        factory, _ = _slow_then_fast([0.03, 0.0], [])
+        await _collect(hedger, factory)
+    stats = hedger.stats()
+    assert stats["hedged"] == 2
+    assert stats["skipped_over_budget"] == 6
+    assert stats["extra_request_ratio"] <= 0.25
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_falls_back_to_the_other():
+    def factory_gen():
+        calls = []
+
+        def factory():
+            index = len(calls)
+            calls.append(index)
+
+            async def stream():
+                if index == 0:
+                    await asyncio.sleep(0.05)
+                    raise RuntimeError("upstream reset")
+                await asyncio.sleep(0.1)
+                yield "ok"
+
+            return stream()
+
+        return factory
+
+    hedger = HedgedStreams(max_ratio=1.0, initial_delay=0.01, min_delay=0.01)
+    assert await _collect(hedger, factory_gen()) == ["ok"]
+
+
+def test_delay_tracks_recent_percentile():
+    hedger = HedgedStreams(percentile=0.9, min_delay=0.05, min_samples=10, initial_delay=1.0)
+    assert hedger.delay() == 1.0
+    for value in range(1, 21):
+        hedger.record(value / 100)
+    assert hedger.delay() == pytest.approx(0.19)
+    hedger = HedgedStreams(min_delay=0.5, min_samples=1)
+    hedger.record(0.01)
+    assert hedger.delay() == 0.5
+
+
+@pytest.mark.asyncio
+async def test_decide_policy_uses_hedger_when_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    monkeypatch.setattr(settings, "policy_hedge_enabled", True)
+    monkeypatch.setattr(policy, "policy_hedger", HedgedStreams(max_ratio=1.0, initial_delay=0.02, min_delay=0.01))
+    calls = []
+
+    async def fake_chat_stream(messages, **kwargs):
+        index = len(calls)
+        calls.append(index)
+        await asyncio.sleep(1.0 if index == 0 else 0.0)
+        yield json.dumps({"action": "ask", "question": f"问题{index}", "rationale": ""}, ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    machine = StateMachine(session_id="h", topic="主题", outline_questions=["Q1"])
+    decision = await asyncio.wait_for(policy.decide_policy(machine.data), timeout=0.5)
+    assert decision.question == "问题1"
+    assert policy.policy_hedger.stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ttft_is_measured_from_the_winning_attempt():
+    closed: list = []
+    factory, _ = _slow_then_fast([1.0, 0.0], closed)
+    hedger = HedgedStreams(max_ratio=1.0, initial_delay=0.1, min_delay=0.01)
+    await _collect(hedger, factory)
+    # 对冲请求立即返回首包：记录的是它自身的 TTFT，而不是从主请求开始算起的 0.1s
+    assert hedger._samples[-1] < 0.05
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_caller_while_closing_the_loser_is_not_swallowed():
+    loser_closing = asyncio.Event()
+
+    def factory_for(index):
+        async def stream():
+            if index == 0:
+                try:
+                    await asyncio.sleep(1.0)
+                finally:
+                    # 败者的清理较慢：调用方恰在等待它关闭时被取消
+                    loser_closing.set()
+                    await asyncio.sleep(0.1)
+            yield f"r{index}-a"
+
+        return stream()
+
+    calls = []
+
+    def factory():
+        calls.append(len(calls))
+        return factory_for(calls[-1])
+
+    hedger = HedgedStreams(max_ratio=1.0, initial_delay=0.02, min_delay=0.01)
+    task = asyncio.create_task(_collect(hedger, factory))
+    await loser_closing.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.core.llm_limiter import LLMAdmissionController, LLMPriority, LLMQueueFullError
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(settings, "llm_rate_per_second", 50.0)
+    monkeypatch.setattr(settings, "llm_burst", 1)
+    monkeypatch.setattr(settings, "llm_queue_size", 8)
+    return LLMAdmissionController()
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_is_admitted_first(limiter):
+    await limiter.acquire("ep", LLMPriority.BATCH)  # 用掉唯一的令牌
+    order: list[str] = []
+
+    async def request(priority: LLMPriority) -> None:
+        await limiter.acquire("ep", priority)
+        order.append(priority.name)
+
+    tasks = [asyncio.create_task(request(priority)) for priority in (LLMPriority.BATCH, LLMPriority.SETUP, LLMPriority.LIVE)]
+    await asyncio.gather(*tasks)
+    assert order == ["LIVE", "SETUP", "BATCH"]
+    stats = limiter.stats()
+    assert stats["live"]["admitted"] == 1
+    assert stats["batch"]["admitted"] == 2
+    assert stats["batch"]["max_wait_ms"] >= stats["live"]["max_wait_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_models_have_separate_buckets(limiter):
+    await limiter.acquire("ep-a", LLMPriority.LIVE)
+    assert await limiter.acquire("ep-b", LLMPriority.LIVE) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "llm_queue_size", 1)
+    monkeypatch.setattr(settings, "llm_rate_per_second", 5.0)
+    await limiter.acquire("ep", LLMPriority.BATCH)
+    waiting = asyncio.create_task(limiter.acquire("ep", LLMPriority.BATCH))
+    await asyncio.sleep(0)
+    with pytest.raises(LLMQueueFullError):
+        await limiter.acquire("ep", LLMPriority.BATCH)
+    # 其他优先级有各自的队列额度
+    live = asyncio.create_task(limiter.acquire("ep", LLMPriority.LIVE))
+    await asyncio.gather(waiting, live)
+    assert limiter.stats()["batch"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_consume_a_token(limiter):
+    await limiter.acquire("ep", LLMPriority.SETUP)
+    cancelled = asyncio.create_task(limiter.acquire("ep", LLMPriority.LIVE))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    waited = await asyncio.wait_for(limiter.acquire("ep", LLMPriority.BATCH), timeout=1)
+    assert waited < 0.1
+    assert limiter.stats()["live"]["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disabled_limiter_admits_immediately(monkeypatch):
+    monkeypatch.setattr(settings, "llm_rate_per_second", 0)
+    limiter = LLMAdmissionController()
+    for _ in range(100):
+        assert await limiter.acquire("ep", LLMPriority.BATCH) == 0.0
@@ -0,0 +1,65 @@
+import asyncio
+
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+from app.services.agent import AgentOrchestrator
+from app.services.notes import NoteIndex
+
+
+def _note(content: str, confidence: float = 0.9, clarify: bool = False) -> dict:
+    return {
+        "category": "数字",
+        "content": content,
+        "confidence": confidence,
+        "requires_clarification": clarify,
+    }
+
+
+def test_note_index_returns_only_changed_notes():
+    index = NoteIndex()
+
+    assert index.merge([_note("10%"), _note("3人")]) == [_note("10%"), _note("3人")]
+    assert index.version == 1
+
+    assert index.merge([_note("10%")]) == []
+    assert index.version == 1
+
+    changed = index.merge([_note("10%", confidence=0.95), _note("5亿")])
+    assert [item["content"] for item in changed] == ["10%", "5亿"]
+    assert changed[0]["confidence"] == 0.95
+    assert index.version == 2
+    assert len(index) == 3
+
+
+def test_note_index_since_supports_resync():
+    index = NoteIndex()
+    index.merge([_note("10%")])
+    index.merge([_note("3人")])
+    index.merge([_note("10%", clarify=True)])
+
+    assert [item["content"] for item in index.since(1)] == ["10%", "3人"]
+    assert [item["content"] for item in index.since(2)] == ["10%"]
+    assert index.since(3) == []
+    assert len(index.since(0)) == 2
+
+
+def test_handle_user_turn_sends_note_delta(monkeypatch):
+    orchestrator = AgentOrchestrator()
+    outline = PlanResponse(
+        topic="测试主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="Q1")])],
+    )
+    asyncio.run(orchestrator.ensure_session("7", "测试主题", outline))
+
+    async def skip_persist(**kwargs):
+        return None
+
+    monkeypatch.setattr(orchestrator, "_persist_turn", skip_persist)
+
+    first = asyncio.run(orchestrator.handle_user_turn("7", "营收增长 10%"))
+    second = asyncio.run(orchestrator.handle_user_turn("7", "营收增长 10%"))
+
+    assert [item["content"] for item in first.changed_notes] == ["10%"]
+    assert first.notes_version == 1
+    assert second.changed_notes == []
+    assert second.notes_version == 1
+    assert orchestrator.notes_since("7", 0) == (1, [first.changed_notes[0]])
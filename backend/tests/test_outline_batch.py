@@ -0,0 +1,93 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.config import settings
+from app.core import llm
+from app.services.outline import DEFAULT_STAGES, OutlineBuilder
+
+
+def _configure(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    monkeypatch.setattr(settings, "outline_topic_match_threshold", 1.5)
+
+
+def test_build_many_bounds_concurrency_and_coalesces(monkeypatch):
+    _configure(monkeypatch)
+    state = {"active": 0, "peak": 0, "calls": 0}
+
+    async def fake_chat_stream(messages, **kwargs):
+        topic = json.loads(messages[1]["content"])["topic"]
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01 * (len(topic) % 3))
+        state["active"] -= 1
+        yield json.dumps([{"stage": "背景", "questions": [f"关于{topic}"]}], ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    builder = OutlineBuilder()
+    topics = [f"主题{i}" * (i % 3 + 1) for i in range(8)] + ["主题0"]
+
+    async def collect():
+        return [item async for item in builder.build_many(topics, concurrency=3)]
+
+    results = asyncio.run(collect())
+    assert sorted(index for index, _, _ in results) == list(range(len(topics)))
+    assert all(error is None for _, _, error in results)
+    assert all(outline.topic == topics[index] for index, outline, _ in results)
+    assert state["peak"] <= 3
+    assert state["calls"] == 8
+
+
+def test_build_many_falls_back_per_item(monkeypatch):
+    builder = OutlineBuilder()
+    real_build = builder.build
+
+    async def flaky_build(topic, seeds=None, on_section=None, priority=None):
+        if topic == "坏主题":
+            raise RuntimeError("upstream exploded")
+        return await real_build(topic)
+
+    monkeypatch.setattr(settings, "ark_api_key", None)
+    monkeypatch.setattr(builder, "build", flaky_build)
+
+    async def collect():
+        return {index: (outline, error) async for index, outline, error in builder.build_many(["好主题", "坏主题"], 2)}
+
+    results = asyncio.run(collect())
+    outline, error = results[1]
+    assert isinstance(error, RuntimeError)
+    assert outline.topic == "坏主题"
+    assert [section.stage for section in outline.sections] == [stage for stage, _ in DEFAULT_STAGES]
+    assert results[0][1] is None
+
+
+def test_build_many_reports_shed_items_as_fallback(monkeypatch):
+    _configure(monkeypatch)
+
+    async def shed_chat_stream(messages, **kwargs):
+        raise llm.LLMQueueFullError("batch queue full")
+        yield ""  # pragma: no cover
+
+    monkeypatch.setattr(llm, "chat_stream", shed_chat_stream)
+    builder = OutlineBuilder()
+
+    async def collect():
+        return [item async for item in builder.build_many(["主题甲"], concurrency=1)]
+
+    [(index, outline, error)] = asyncio.run(collect())
+    assert isinstance(error, llm.LLMQueueFullError)
+    assert [section.stage for section in outline.sections] == [stage for stage, _ in DEFAULT_STAGES]
+
+    # 交互请求被限流时仍直接退回默认提纲
+    outline = asyncio.run(builder.build("主题甲"))
+    assert [section.stage for section in outline.sections] == [stage for stage, _ in DEFAULT_STAGES]
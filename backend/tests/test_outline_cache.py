@@ -0,0 +1,153 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.config import settings
+from app.core import llm
+from app.schemas import PlanResponse
+from app.services.outline import OutlineBuilder
+from app.services.outline_cache import OutlineCache, normalize_topic
+
+
+def _configure(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+
+
+def _counting_stream(monkeypatch, delay=0.0):
+    calls = []
+
+    async def fake_chat_stream(messages, **kwargs):
+        calls.append(kwargs.get("model"))
+        if delay:
+            await asyncio.sleep(delay)
+        yield json.dumps([{"stage": "背景", "questions": ["Q1"]}], ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    return calls
+
+
+def test_normalize_topic_folds_case_width_and_spacing():
+    assert normalize_topic("  ＡＩ   Agent 落地！ ") == normalize_topic("ai agent 落地")
+
+
+def test_cache_hits_on_normalized_topic(monkeypatch):
+    _configure(monkeypatch)
+    calls = _counting_stream(monkeypatch)
+    builder = OutlineBuilder()
+
+    async def scenario():
+        first = await builder.build("AI Agent 落地")
+        second = await builder.build("  ai   agent 落地。")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert second.topic == "  ai   agent 落地。"
+    assert second.sections == first.sections
+    stats = builder.cache.stats()
+    assert stats["memory_hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_cache_key_includes_model(monkeypatch):
+    _configure(monkeypatch)
+    calls = _counting_stream(monkeypatch)
+    builder = OutlineBuilder()
+
+    asyncio.run(builder.build("主题"))
+    monkeypatch.setattr(settings, "ark_model_id", "ep-other")
+    asyncio.run(builder.build("主题"))
+    assert calls == ["ep-test", "ep-other"]
+
+
+def test_concurrent_misses_are_coalesced(monkeypatch):
+    _configure(monkeypatch)
+    calls = _counting_stream(monkeypatch, delay=0.05)
+    builder = OutlineBuilder()
+
+    async def scenario():
+        return await asyncio.gather(*(builder.build("并发主题") for _ in range(5)))
+
+    outlines = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(outline.sections == outlines[0].sections for outline in outlines)
+    assert builder.cache.stats()["coalesced"] == 4
+
+
+def test_fallback_outline_is_not_cached(monkeypatch):
+    _configure(monkeypatch)
+    calls = []
+
+    async def broken_chat_stream(messages, **kwargs):
+        calls.append(1)
+        yield "{"
+
+    monkeypatch.setattr(llm, "chat_stream", broken_chat_stream)
+    builder = OutlineBuilder()
+    asyncio.run(builder.build("主题"))
+    asyncio.run(builder.build("主题"))
+    assert len(calls) == 2
+
+
+def test_invalidate_and_ttl(monkeypatch):
+    _configure(monkeypatch)
+    calls = _counting_stream(monkeypatch)
+    builder = OutlineBuilder(OutlineCache(ttl=60, memory_size=8))
+
+    asyncio.run(builder.build("主题"))
+    assert asyncio.run(builder.invalidate("主题")) == 1
+    asyncio.run(builder.build("主题"))
+    assert len(calls) == 2
+
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 120)
+    asyncio.run(builder.build("主题"))
+    assert len(calls) == 3
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = OutlineCache(ttl=60, memory_size=2)
+    outline = PlanResponse(topic="t", sections=[])
+
+    async def scenario():
+        for key in ("a", "b"):
+            await cache.put(key, outline, topic=key, model="m", prompt_version="v")
+        await cache.get("a")
+        await cache.put("c", outline, topic="c", model="m", prompt_version="v")
+        return [await cache.get(key) is not None for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+
+
+def test_cancelled_leader_does_not_cancel_coalesced_waiters():
+    cache = OutlineCache(ttl=60, memory_size=8)
+    outline = PlanResponse(topic="t", sections=[])
+    calls = []
+
+    async def create():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return outline, True
+
+    async def scenario():
+        leader = asyncio.create_task(cache.get_or_create("k", create))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(cache.get_or_create("k", create))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        result = await follower
+        return leader.cancelled(), result, await cache.get("k")
+
+    cancelled, result, cached = asyncio.run(scenario())
+    assert cancelled
+    assert result is outline and cached is outline
+    assert len(calls) == 1
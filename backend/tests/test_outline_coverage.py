@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.outline_coverage import covered_questions, outline_vectors
+from app.services.state_machine import StateMachine
+
+QUESTIONS = (
+    "请介绍一下当前的业务背景",
+    "团队目前的规模与分工情况如何？",
+    "这个项目的核心指标有哪些？",
+    "在实施过程中遇到了什么挑战？",
+    "下一步的关键计划是什么？",
+    "还需要哪些外部支持？",
+)
+
+
+@pytest.mark.parametrize(
+    "answer, expected",
+    [
+        ("我们是做跨境电商的，业务背景主要是服务中小卖家。", [0]),
+        ("我们团队有二十个人，分成产品、研发两组，分工比较明确。", [1]),
+        ("核心指标是GMV和复购率，去年复购率提升到了35%。", [2]),
+        ("下一步计划是上线会员系统，另外我们需要一些外部支持，比如资金。", [4, 5]),
+        ("还好吧，没什么特别的。", []),
+    ],
+)
+def test_answers_cover_matching_questions(answer, expected):
+    assert covered_questions(QUESTIONS, answer, 0.5) == expected
+
+
+def test_vectors_are_built_once_per_outline():
+    assert outline_vectors(QUESTIONS) is outline_vectors(tuple(QUESTIONS))
+    scores = outline_vectors(QUESTIONS).scores("")
+    assert scores.shape == (len(QUESTIONS),)
+    assert not scores.any()
+
+
+def test_threshold_above_one_disables():
+    assert covered_questions(QUESTIONS, "业务背景", 1.1) == []
+
+
+def test_credit_answer_marks_other_outline_items():
+    machine = StateMachine(session_id="c", topic="主题", outline_questions=list(QUESTIONS))
+    machine.data.last_question = QUESTIONS[0]
+    credited = machine.credit_answer("下一步计划是上线会员系统，还需要外部支持。", 0.5)
+    assert credited == [QUESTIONS[4], QUESTIONS[5]]
+    machine.transition_after_answer()
+    assert machine.data.coverage() == pytest.approx(3 / 6)
+    assert machine.data.next_unanswered() == QUESTIONS[1]
+    assert machine.credit_answer("下一步计划是上线会员系统。", 0.5) == []
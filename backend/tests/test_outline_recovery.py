@@ -0,0 +1,104 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.core.json_stream import scan_json_spans
+from app.services.outline import _coerce_outline_payload, _strip_code_fence
+
+
+def _legacy_coerce(raw):
+    """The previous raw_decode-at-every-offset implementation, kept as an oracle."""
+
+    cleaned = _strip_code_fence(raw.strip())
+
+    def _normalize(value):
+        if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            return value
+        if isinstance(value, dict):
+            for key in ("outline", "data", "result"):
+                candidate = value.get(key)
+                if isinstance(candidate, list) and all(isinstance(item, dict) for item in candidate):
+                    return candidate
+        return None
+
+    try:
+        parsed = json.loads(cleaned)
+    except json.JSONDecodeError:
+        parsed = None
+    if parsed is not None and _normalize(parsed) is not None:
+        return _normalize(parsed)
+    decoder = json.JSONDecoder()
+    idx = 0
+    while idx < len(cleaned):
+        try:
+            value, next_idx = decoder.raw_decode(cleaned, idx)
+        except json.JSONDecodeError:
+            idx += 1
+            continue
+        idx = max(next_idx, idx + 1)
+        normalized = _normalize(value)
+        if normalized is not None:
+            return normalized
+    return None
+
+
+OUTLINE = [
+    {"stage": "背景", "questions": ["请介绍一下业务背景", "团队规模如何？"]},
+    {"stage": "细节", "questions": ["核心指标是什么？[含 {括号} 与 \"引号\"]"]},
+]
+
+PROSE = ["好的，以下是提纲：", "Sure! Here you go.", "注意：第[1]部分较长", "2024 年 true null", "{不是 JSON}", "]", "}", "\n"]
+
+
+def _fragments(rng):
+    payload = json.dumps(OUTLINE, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 2]))
+    wrapped = json.dumps({rng.choice(["outline", "data", "result", "meta"]): OUTLINE}, ensure_ascii=False)
+    return [
+        payload,
+        wrapped,
+        payload[: rng.randrange(1, len(payload))],  # truncated stream
+        json.dumps(OUTLINE[0], ensure_ascii=False),
+        "[1, 2, 3]",
+        '["a", "b"]',
+        "[{]",
+        *PROSE,
+    ]
+
+
+def _corpus(size=400, seed=20241018):
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(size):
+        fragments = _fragments(rng)
+        text = " ".join(rng.choice(fragments) for _ in range(rng.randint(1, 6)))
+        if rng.random() < 0.2:
+            text = "```json\n" + text + "\n```"
+        cases.append(text)
+    return cases
+
+
+def test_recovery_agrees_with_legacy_parser():
+    for raw in _corpus():
+        recovered = _coerce_outline_payload(raw)
+        expected = _legacy_coerce(raw)
+        if expected is not None:
+            assert recovered == expected, raw
+        elif recovered is not None:
+            # 截断片段后跟完整提纲时，新解析器能重新同步而旧实现会错位
+            assert recovered == OUTLINE, raw
+
+
+def test_recovers_outline_after_junk_and_stray_brackets():
+    raw = "思考中…] } {未闭合 [ 最终答案：" + json.dumps({"outline": OUTLINE}, ensure_ascii=False) + " 以上。"
+    assert _coerce_outline_payload(raw) == OUTLINE
+
+
+def test_scanner_ignores_brackets_inside_strings():
+    text = 'x ["a]", {"b": "}\\"["}] y'
+    assert scan_json_spans(text) == [(2, len(text) - 2), (text.index("{"), len(text) - 3)]
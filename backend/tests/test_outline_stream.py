@@ -0,0 +1,87 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.config import settings
+from app.core import llm
+from app.core.json_stream import JsonObjectStream
+from app.schemas import PlanResponse, PlanSection
+from app.services.outline import OutlineBuilder
+
+PAYLOAD = "```json\n" + json.dumps(
+    {
+        "outline": [
+            {"stage": "背景", "questions": ["Q1 {not a brace}", "Q2"]},
+            {"stage": "细节", "questions": ["Q3"]},
+            {"stage": "结论", "questions": []},
+        ]
+    },
+    ensure_ascii=False,
+) + "\n```"
+
+
+def _chunks(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+def test_object_stream_emits_objects_as_they_close():
+    stream = JsonObjectStream()
+    emitted = []
+    for chunk in _chunks(PAYLOAD):
+        emitted.extend(stream.feed(chunk))
+    stages = [value.get("stage") for value in emitted]
+    assert stages == ["背景", "细节", "结论", None]
+    assert emitted[0]["questions"][0] == "Q1 {not a brace}"
+
+
+def test_stream_yields_sections_before_generation_finishes(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    progress = {"sent": 0}
+    chunks = _chunks(PAYLOAD)
+
+    async def fake_chat_stream(messages, **kwargs):
+        for chunk in chunks:
+            progress["sent"] += 1
+            await asyncio.sleep(0)
+            yield chunk
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    builder = OutlineBuilder()
+
+    async def collect():
+        events = []
+        async for item in builder.stream("主题"):
+            events.append((item, progress["sent"]))
+        return events
+
+    events = asyncio.run(collect())
+    sections = [item for item, _ in events if isinstance(item, PlanSection)]
+    assert [section.stage for section in sections] == ["背景", "细节"]
+    assert events[0][1] < len(chunks)
+    final = events[-1][0]
+    assert isinstance(final, PlanResponse)
+    assert [section.stage for section in final.sections] == ["背景", "细节"]
+
+    # 第二次命中缓存：逐段回放后给出完整提纲
+    replay = asyncio.run(collect())
+    assert [type(item).__name__ for item, _ in replay] == ["PlanSection", "PlanSection", "PlanResponse"]
+
+
+def test_stream_falls_back_to_defaults_without_llm(monkeypatch):
+    monkeypatch.setattr(settings, "ark_api_key", None)
+    builder = OutlineBuilder()
+
+    async def collect():
+        return [item async for item in builder.stream("主题")]
+
+    items = asyncio.run(collect())
+    assert isinstance(items[-1], PlanResponse)
+    assert len(items) == len(items[-1].sections) + 1
@@ -0,0 +1,128 @@
+import pytest
+
+from app.config import settings
+from app.services import agent as agent_module
+from app.services.agent import AgentOrchestrator
+from app.services.policy import PolicyDecision
+from app.services.policy_gate import PolicyGate, assess_local
+from app.services.state_machine import InterviewStage, StateMachine
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+
+
+def _machine(answer: str | None = None) -> StateMachine:
+    machine = StateMachine(session_id="g", topic="主题", outline_questions=["Q1", "Q2", "Q3", "Q4"])
+    machine.data.add_turn("assistant", "Q1")
+    machine.data.last_question = "Q1"
+    if answer is not None:
+        machine.data.add_turn("user", answer)
+    machine.transition_after_answer()
+    return machine
+
+
+def test_assessment_reasons():
+    machine = _machine("我们团队目前有二十个人，分成三个小组。")
+    assert assess_local(machine).reason == "next_question"
+    assert assess_local(machine).decision.question == "Q2"
+
+    assert assess_local(_machine("还行")).reason == "short_answer"
+    assert assess_local(_machine("一开始很顺利，但是后来预算被砍了一半。")).reason == "open_ended"
+
+    clarify = _machine("我们团队目前有二十个人，分成三个小组。")
+    clarify.register_clarification("预算不确定")
+    assessment = assess_local(clarify)
+    assert assessment.reason == "pending_clarification"
+    assert assessment.decision.action == "clarify"
+
+    closing = _machine("我们团队目前有二十个人，分成三个小组。")
+    closing.data.answered_questions.extend(["Q2", "Q3", "Q4"])
+    closing.data.stage = InterviewStage.CLOSING
+    assert assess_local(closing).decision.action == "close"
+
+
+def test_clarification_quotes_the_vague_sentence():
+    machine = _machine("我们团队有二十个人。预算大概明年翻倍吧，还在谈。")
+    machine.register_clarification("回答含糊，需要追问")
+
+    assessment = assess_local(machine)
+
+    assert assessment.confidence >= 0.9
+    assert assessment.decision.question == "您提到“预算大概明年翻倍吧，还在谈”，能再具体说明一下吗？"
+    assert "回答含糊" not in assessment.decision.question
+
+
+def test_clarification_without_quotable_sentence_goes_to_llm():
+    machine = _machine("我们团队有二十个人，预算嘛" + "其实还在和财务反复讨论" * 3 + "可能会调整。")
+    machine.register_clarification("回答含糊，需要追问")
+
+    assert assess_local(machine).confidence < settings.hybrid_policy_min_confidence
+
+
+def test_closing_question_is_taken_locally_only_once():
+    machine = _machine("我们团队目前有二十个人，分成三个小组。")
+    machine.data.answered_questions.extend(["Q2", "Q3", "Q4"])
+    machine.data.stage = InterviewStage.CLOSING
+    first = assess_local(machine)
+    assert first.confidence >= 0.9
+    assert first.decision.question == "感谢分享，我们来做个小结：还有哪些重点没有提到？"
+
+    machine.apply_policy_decision(first.decision)
+    machine.record_user_turn("基本都聊到了，没有别的了。")
+    machine.transition_after_answer()
+
+    assert machine.data.stage == InterviewStage.CLOSING
+    assert assess_local(machine).confidence < settings.hybrid_policy_min_confidence
+
+
+def test_gate_respects_threshold_and_switch(monkeypatch):
+    gate = PolicyGate()
+    machine = _machine("我们团队目前有二十个人，分成三个小组。")
+    monkeypatch.setattr(settings, "hybrid_policy_enabled", False)
+    assert gate.decide(machine) is None
+    assert gate.snapshot()["llm"] == 0
+
+    monkeypatch.setattr(settings, "hybrid_policy_enabled", True)
+    monkeypatch.setattr(settings, "hybrid_policy_min_confidence", 0.95)
+    assert gate.decide(machine) is None
+    monkeypatch.setattr(settings, "hybrid_policy_min_confidence", 0.9)
+    decision = gate.decide(machine)
+    assert decision is not None and decision.question == "Q2"
+    assert decision.rationale.startswith("local policy (next_question")
+    gate.record_llm_latency(1.2)
+    stats = gate.snapshot()
+    assert stats["local"] == 1 and stats["llm"] == 1
+    assert stats["saved_ms_estimate"] == 1200.0
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_skips_llm_for_confident_turns(monkeypatch):
+    monkeypatch.setattr(settings, "hybrid_policy_enabled", True)
+    monkeypatch.setattr(settings, "hybrid_policy_min_confidence", 0.9)
+    orchestrator = AgentOrchestrator()
+    outline = PlanResponse(
+        topic="主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question=q) for q in ("Q1", "Q2", "Q3", "Q4")])],
+    )
+    await orchestrator.ensure_session("g1", "主题", outline)
+    calls = []
+
+    async def fake_policy(state, **kwargs):
+        calls.append(state)
+        return PolicyDecision(action="followup", question="LLM 追问", rationale="llm")
+
+    async def _skip_persist(**kwargs):
+        return None
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+
+    first = await orchestrator.bootstrap_decision("g1")
+    assert first.question == "LLM 追问" and len(calls) == 1
+
+    local = await orchestrator.handle_user_turn("g1", "我们团队目前有二十个人，分成三个小组。")
+    assert local.rationale.startswith("local policy")
+    assert len(calls) == 1
+
+    remote = await orchestrator.handle_user_turn("g1", "一开始很顺利，但是后来预算被砍了一半。")
+    assert remote.question == "LLM 追问"
+    assert len(calls) == 2
+    assert orchestrator.speculate("g1", "我们团队目前有二十个人，分成三个小组。") is None
@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+from app.config import settings
+from app.core import llm
+from app.services import policy
+from app.services.policy import PolicyDecision, decide_policy
+from app.services.policy_memo import PolicyMemo
+from app.services.state_machine import StateMachine
+
+
+def _decision(question: str = "Q") -> PolicyDecision:
+    return PolicyDecision(action="ask", question=question, rationale="")
+
+
+def test_key_buckets_coverage_but_not_turns():
+    payload = {"topic": "t", "stage": "Opening", "coverage": 0.42, "recent_turns": []}
+    key = PolicyMemo.make_key("ep", "sys", payload)
+    assert PolicyMemo.make_key("ep", "sys", {**payload, "coverage": 0.44}) == key
+    assert PolicyMemo.make_key("ep", "sys", {**payload, "coverage": 0.52}) != key
+    assert PolicyMemo.make_key("ep-2", "sys", payload) != key
+    turns = [{"role": "user", "content": "A"}]
+    assert PolicyMemo.make_key("ep", "sys", {**payload, "recent_turns": turns}) != key
+
+
+def test_key_buckets_exact_deciles_upward():
+    payload = {"topic": "t", "stage": "Opening", "recent_turns": []}
+    for tenths in range(11):
+        exact = PolicyMemo.make_key("ep", "sys", {**payload, "coverage": tenths / 10})
+        inside = PolicyMemo.make_key("ep", "sys", {**payload, "coverage": (tenths + 0.5) / 10})
+        assert exact == inside, tenths
+        if tenths:
+            below = PolicyMemo.make_key("ep", "sys", {**payload, "coverage": (tenths - 0.5) / 10})
+            assert exact != below, tenths
+
+
+def test_memo_ttl_and_lru_bounds(monkeypatch):
+    memo = PolicyMemo(ttl=10, max_size=2)
+    memo.put("a", _decision("A"))
+    memo.put("b", _decision("B"))
+    assert memo.get("a").question == "A"
+    memo.put("c", _decision("C"))
+    assert memo.get("b") is None  # 最久未使用的被淘汰
+    assert memo.get("a") is not None
+
+    now = [1000.0]
+    monkeypatch.setattr("app.services.policy_memo.time.monotonic", lambda: now[0])
+    memo = PolicyMemo(ttl=10, max_size=4)
+    memo.put("a", _decision())
+    now[0] += 11
+    assert memo.get("a") is None
+    assert memo.stats()["expired"] == 1
+
+
+def test_cached_decision_is_a_copy():
+    memo = PolicyMemo(ttl=10, max_size=4)
+    memo.put("a", _decision("A"))
+    memo.get("a").question = "changed"
+    assert memo.get("a").question == "A"
+
+
+def test_decide_policy_memoizes_per_model(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    monkeypatch.setattr(settings, "policy_memo_models_raw", "ep-test")
+    monkeypatch.setattr(policy, "policy_memo", PolicyMemo(ttl=60, max_size=16))
+    calls = []
+
+    async def fake_chat_stream(messages, **kwargs):
+        calls.append(messages)
+        yield json.dumps({"action": "ask", "question": "开场问题", "rationale": "r"}, ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+
+    def fresh_state(session_id: str):
+        return StateMachine(session_id=session_id, topic="同一主题", outline_questions=["Q1", "Q2"]).data
+
+    first = asyncio.run(decide_policy(fresh_state("1")))
+    streamed = []
+    second = asyncio.run(decide_policy(fresh_state("2"), on_question=streamed.append))
+    assert len(calls) == 1
+    assert second == first
+    assert streamed == ["开场问题"]
+
+    other = fresh_state("3")
+    other.add_turn("user", "不同的回答")
+    asyncio.run(decide_policy(other))
+    assert len(calls) == 2
+    assert policy.policy_memo.stats()["hits"] == 1
+
+    monkeypatch.setattr(settings, "policy_memo_models_raw", "ep-other")
+    asyncio.run(decide_policy(fresh_state("4")))
+    assert len(calls) == 3
@@ -0,0 +1,125 @@
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.core import llm
+from app.services.agent import AgentOrchestrator
+from app.services.policy import decide_policy
+from app.services.prompt_context import (
+    build_policy_payload,
+    clip_text,
+    estimate_tokens,
+    prompt_budget,
+    summarize_turns,
+    update_summary,
+)
+from app.services.state_machine import ConversationState, StateMachine
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+
+LONG_ANSWER = "我们当时主要在做渠道整合。" * 80 + "最终留存提升了 12%。"
+
+
+def test_estimate_tokens_counts_cjk_per_character():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("供应链") == 3
+    assert estimate_tokens("supply chain") == 3
+
+
+def test_clip_text_keeps_head_and_tail_within_budget():
+    clipped = clip_text(LONG_ANSWER, 50)
+    assert estimate_tokens(clipped) <= 51
+    assert clipped.startswith("我们当时")
+    assert clipped.endswith("12%。")
+
+
+def test_history_overflow_goes_to_summary():
+    state = ConversationState("s", "主题", ["Q1"])
+    for i in range(7):
+        state.add_turn("assistant", f"问题{i}")
+        state.add_turn("user", f"回答{i}，收入增长 {i}0%。其他细节略。")
+    assert len(state.turn_history) == ConversationState.MAX_TURNS
+    assert update_summary(state, max_tokens=500)
+    assert not state.has_evicted_turns
+    lines = state.summary.splitlines()
+    assert lines[0].startswith("问：问题0 答：回答0")
+    assert len(lines) == 2
+    assert not update_summary(state)
+
+
+def test_summary_drops_oldest_lines_over_budget():
+    turns = []
+    for i in range(20):
+        turns += [{"role": "assistant", "content": f"问题{i}"}, {"role": "user", "content": f"回答{i}"}]
+    summary = summarize_turns("", turns, max_tokens=40)
+    assert estimate_tokens(summary) <= 40
+    assert summary.splitlines()[-1] == "问：问题19 答：回答19"
+
+
+def test_payload_respects_budget_and_prefers_newest_turns():
+    state = ConversationState("s", "主题", ["Q1"], pending_clarifications=["缺少预算"])
+    state.summary = "问：早期问题 答：早期回答"
+    for i in range(5):
+        state.add_turn("assistant", f"问题{i}")
+        state.add_turn("user", LONG_ANSWER)
+    payload, tokens = build_policy_payload(state, 400)
+    assert tokens <= 400
+    assert estimate_tokens(json.dumps(payload, ensure_ascii=False)) <= 400 * 1.2
+    assert payload["pending_clarifications"] == ["缺少预算"]
+    assert payload["recent_turns"][-1]["role"] == "user"
+    assert payload["recent_turns"][-2] == {"role": "assistant", "content": "问题4"}
+    assert len(payload["recent_turns"]) < len(state.turn_history)
+
+    roomy, _ = build_policy_payload(state, 100000)
+    assert roomy["summary"] == state.summary
+    assert [turn["content"] for turn in roomy["recent_turns"]] == [turn["content"] for turn in state.turn_history]
+
+
+def test_prompt_budget_per_model(monkeypatch):
+    monkeypatch.setattr(settings, "policy_prompt_tokens", 900)
+    monkeypatch.setattr(settings, "prompt_token_budgets_raw", "ep-small=300, ep-big=4000,bad")
+    assert prompt_budget("ep-small") == 300
+    assert prompt_budget("ep-big") == 4000
+    assert prompt_budget("ep-other") == 900
+
+
+def test_decide_policy_sends_budgeted_payload(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    monkeypatch.setattr(settings, "policy_prompt_tokens", 300)
+    captured = {}
+
+    async def fake_chat_stream(messages, **kwargs):
+        captured["messages"] = messages
+        yield json.dumps({"action": "ask", "question": "下一个问题", "rationale": ""}, ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    machine = StateMachine(session_id="p", topic="主题", outline_questions=["Q1"])
+    for _ in range(4):
+        machine.data.add_turn("assistant", "请展开讲讲")
+        machine.data.add_turn("user", LONG_ANSWER)
+    asyncio.run(decide_policy(machine.data))
+    user_message = captured["messages"][1]["content"]
+    assert estimate_tokens(captured["messages"][0]["content"]) + estimate_tokens(user_message) <= 300 * 1.2
+
+
+@pytest.mark.asyncio
+async def test_user_answers_are_recorded_in_history(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", None)
+    orchestrator = AgentOrchestrator()
+
+    async def _skip_persist(**kwargs):
+        return None
+
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+    outline = PlanResponse(
+        topic="主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="请介绍背景")])],
+    )
+    await orchestrator.ensure_session("u1", "主题", outline)
+    await orchestrator.handle_user_turn("u1", "我们做了三年")
+    history = orchestrator._machines["u1"].data.turn_history
+    assert history[0] == {"role": "user", "content": "我们做了三年"}
+    assert history[-1]["role"] == "assistant"
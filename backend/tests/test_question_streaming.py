@@ -0,0 +1,115 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.core import llm, tts_client
+from app.core.json_stream import JsonStringFieldExtractor
+from app.core.tts_client import SentenceStream
+from app.services.policy import decide_policy
+from app.services.state_machine import StateMachine
+
+
+def _feed_all(extractor: JsonStringFieldExtractor, text: str, step: int = 1) -> str:
+    return "".join(extractor.feed(text[i : i + step]) for i in range(0, len(text), step))
+
+
+@pytest.mark.parametrize("step", [1, 3, 1000])
+def test_extractor_matches_json_loads(step):
+    payload = {
+        "action": "followup",
+        "meta": {"question": "nested, ignored", "list": ["a", "}"]},
+        "question": "能否说说\"核心指标\"？\n例如 GMV\\留存 😀",
+        "rationale": "r",
+    }
+    raw = "```json\n" + json.dumps(payload, ensure_ascii=True) + "\n```"
+    extractor = JsonStringFieldExtractor("question")
+
+    assert _feed_all(extractor, raw, step) == payload["question"]
+    assert extractor.done
+
+
+def test_extractor_surfaces_question_before_stream_ends():
+    extractor = JsonStringFieldExtractor("question")
+    assert extractor.feed('{"action": "ask", "question": "你们团队') == "你们团队"
+    assert extractor.feed('有多少人？", "rationale": "') == "有多少人？"
+    assert extractor.feed('question: nope"}') == ""
+
+
+def test_sentence_stream_emits_complete_sentences():
+    async def run():
+        stream = SentenceStream()
+        for piece in ["好的。能否", "具体说说", "增长来源？还有", "别的吗"]:
+            stream.feed(piece)
+        stream.close()
+        return [sentence async for sentence in stream]
+
+    assert asyncio.run(run()) == ["好的。能否具体说说增长来源？", "还有别的吗"]
+
+
+def test_decide_policy_streams_question_pieces(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    deltas = ['{"action": "followup", "quest', 'ion": "能否具体', '说说？", "rationale"', ': "r"}']
+
+    async def fake_chat_stream(messages, **kwargs):
+        for delta in deltas:
+            yield delta
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    pieces: list[str] = []
+    machine = StateMachine(session_id="1", topic="主题", outline_questions=["Q1"])
+    decision = asyncio.run(decide_policy(machine.data, on_question=pieces.append))
+
+    assert pieces == ["能否具体", "说说？"]
+    assert decision.question == "能否具体说说？"
+    assert decision.action == "followup"
+
+
+@pytest.mark.asyncio
+async def test_first_sentence_is_synthesized_before_text_is_complete(monkeypatch: pytest.MonkeyPatch) -> None:
+    events: list[str] = []
+
+    class DummyManager:
+        active_peers: dict = {}
+
+        def start_stream(self, sid, task):
+            return SimpleNamespace(is_cancelled=lambda: False)
+
+        async def wait_until_ready(self, sid):
+            return None
+
+        def is_cancelled(self, sid):
+            return False
+
+        async def send_tts_ready(self, sid, mime="audio/mpeg"):
+            events.append("ready")
+
+        async def send_audio_chunk(self, sid, chunk):
+            events.append(f"audio:{chunk.decode()}")
+
+        async def send_tts_end(self, sid):
+            events.append("end")
+
+        def finish_stream(self, sid, task):
+            events.append("finished")
+
+    async def fake_synth(text: str) -> bytes:
+        return text.encode()
+
+    monkeypatch.setattr(tts_client, "ws_manager", DummyManager())
+    monkeypatch.setattr(tts_client, "synth_once", fake_synth)
+
+    stream = SentenceStream()
+    task = asyncio.create_task(tts_client.stream_and_broadcast("s1", stream))
+    stream.feed("第一句话。第二")
+    await asyncio.sleep(0.05)
+    assert events == ["ready", "audio:第一句话。"]
+
+    stream.feed("句话？")
+    stream.close()
+    await task
+    assert events[2:] == ["audio:第二句话？", "end", "finished"]
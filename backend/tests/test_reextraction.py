@@ -0,0 +1,127 @@
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base, Note, Session, Turn
+from app.services.extraction import extractor
+from app.services.reextraction import ensure_keyset_index, reextract_notes
+
+TRANSCRIPTS = {
+    "A": ["我们有12人", "营收大概3亿元", "还行"],
+    "B": ["主要做出海", "暂时没有数据"],
+    "C": ["成本下降了20%"],
+}
+
+
+async def _database(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'notes.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with factory() as db:
+        for topic, transcripts in TRANSCRIPTS.items():
+            session = Session(topic=topic)
+            db.add(session)
+            await db.flush()
+            for transcript in transcripts:
+                db.add(Turn(session_id=session.id, speaker="user", transcript=transcript, stage="opening", llm_action="ask"))
+            # 采访者的问题不产生笔记
+            db.add(Turn(session_id=session.id, speaker="assistant", transcript="大概有多少人？100人吗", stage="opening", llm_action="ask"))
+            db.add(Note(session_id=session.id, category="旧规则", content="stale"))
+        await db.commit()
+    return engine, factory
+
+
+async def _notes(factory):
+    async with factory() as db:
+        rows = (await db.execute(select(Note.session_id, Note.content).order_by(Note.session_id, Note.id))).all()
+    return [tuple(row) for row in rows]
+
+
+def _expected(sessions):
+    expected = []
+    for session_id, topic in sessions:
+        for text in TRANSCRIPTS[topic]:
+            expected.extend((session_id, note.content) for note in extractor.extract(text))
+    return expected
+
+
+def test_reextraction_replaces_notes_of_every_session(tmp_path) -> None:
+    async def scenario():
+        engine, factory = await _database(tmp_path)
+        report = await reextract_notes(factory, chunk_size=2)
+        notes = await _notes(factory)
+        await engine.dispose()
+        return report, notes
+
+    report, notes = asyncio.run(scenario())
+
+    assert notes == _expected([(1, "A"), (2, "B"), (3, "C")])
+    assert (report.sessions, report.turns, report.notes) == (3, 6, len(notes))
+    assert report.rows_per_second > 0
+
+
+def test_keyset_query_uses_the_composite_index(tmp_path) -> None:
+    async def scenario():
+        engine, _ = await _database(tmp_path)
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP INDEX ix_turns_session_id_id"))
+        await ensure_keyset_index(engine)
+        async with engine.connect() as conn:
+            plan = (await conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT id FROM turns WHERE session_id > 1 OR (session_id = 1 AND id > 2) "
+                "ORDER BY session_id, id LIMIT 2"
+            ))).all()
+        await engine.dispose()
+        return " ".join(str(row[-1]) for row in plan)
+
+    plan = asyncio.run(scenario())
+    assert "ix_turns_session_id_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_reextraction_resumes_after_checkpoint(tmp_path) -> None:
+    checkpoint = tmp_path / "reextract.json"
+    checkpoint.write_text(json.dumps({"session_id": 1}), encoding="utf-8")
+
+    async def scenario():
+        engine, factory = await _database(tmp_path)
+        report = await reextract_notes(factory, chunk_size=4, checkpoint=checkpoint)
+        notes = await _notes(factory)
+        await engine.dispose()
+        return report, notes
+
+    report, notes = asyncio.run(scenario())
+
+    assert notes == [(1, "stale")] + _expected([(2, "B"), (3, "C")])
+    assert report.sessions == 2
+    assert not checkpoint.exists()
+
+
+def test_reextraction_in_process_pool(tmp_path) -> None:
+    async def scenario():
+        engine, factory = await _database(tmp_path)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            await reextract_notes(factory, chunk_size=1, executor=pool, max_in_flight=3)
+        notes = await _notes(factory)
+        await engine.dispose()
+        return notes
+
+    assert asyncio.run(scenario()) == _expected([(1, "A"), (2, "B"), (3, "C")])
+
+
+def test_dry_run_keeps_stored_notes(tmp_path) -> None:
+    async def scenario():
+        engine, factory = await _database(tmp_path)
+        report = await reextract_notes(factory, dry_run=True)
+        notes = await _notes(factory)
+        await engine.dispose()
+        return report, notes
+
+    report, notes = asyncio.run(scenario())
+
+    assert notes == [(1, "stale"), (2, "stale"), (3, "stale")]
+    assert report.notes == len(_expected([(1, "A"), (2, "B"), (3, "C")]))
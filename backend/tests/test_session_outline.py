@@ -0,0 +1,134 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+from app.services import agent as agent_module
+from app.services.agent import AgentOrchestrator
+from app.services.outline import DEFAULT_STAGES
+from app.services.state_machine import ConversationState
+
+
+def _outline(topic: str, questions: list[str]) -> PlanResponse:
+    return PlanResponse(
+        topic=topic,
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question=q) for q in questions])],
+    )
+
+
+def test_replace_outline_keeps_matching_answers():
+    state = ConversationState("s", "t", ["a", "b", "c"])
+    state.mark_answered("a")
+    state.mark_answered("c")
+    state.mark_answered("off-outline")
+    state.add_clarification("x")
+    before = state.fingerprint()
+
+    state.replace_outline(["c", "d", "off-outline"])
+
+    assert state.outline_questions == ("c", "d", "off-outline")
+    assert list(state.answered_questions) == ["c", "off-outline"]
+    assert state.next_unanswered() == "d"
+    assert state.coverage() == pytest.approx(2 / 3)
+    assert list(state.pending_clarifications) == ["x"]
+    assert state.fingerprint() != before
+
+
+def test_restore_keeps_outline_swapped_in_after_checkpoint():
+    state = ConversationState("s", "t", ["a", "b"])
+    state.mark_answered("b")
+    checkpoint = state.checkpoint()
+    state.mark_answered("a")
+    state.replace_outline(["b", "z"])
+    state.restore(checkpoint)
+    assert state.outline_questions == ("b", "z")
+    assert list(state.answered_questions) == ["b"]
+    assert state.next_unanswered() == "z"
+
+
+@pytest.mark.asyncio
+async def test_start_outline_returns_preliminary_and_swaps_in_background(monkeypatch):
+    release = asyncio.Event()
+    generated = _outline("主题", ["LLM 问题 1", "LLM 问题 2"])
+
+    async def fake_peek(topic):
+        return None
+
+    async def slow_build(topic, seeds=None, on_section=None):
+        await release.wait()
+        return generated
+
+    monkeypatch.setattr(agent_module.outline_builder, "peek", fake_peek)
+    monkeypatch.setattr(agent_module.outline_builder, "build", slow_build)
+    orchestrator = AgentOrchestrator()
+
+    job = await orchestrator.start_outline("7", "主题")
+    assert job.status == "pending"
+    assert [s.stage for s in job.outline.sections] == [stage for stage, _ in DEFAULT_STAGES]
+
+    machine = await orchestrator.ensure_session("7", "主题")
+    machine.data.mark_answered(DEFAULT_STAGES[0][1][0])
+    assert machine.data.outline_questions[0] == DEFAULT_STAGES[0][1][0]
+
+    release.set()
+    outline = await asyncio.wait_for(job.wait(), timeout=1)
+    assert outline is generated
+    assert job.status == "ready"
+    assert orchestrator._machines["7"] is machine
+    assert machine.data.outline_questions == ("LLM 问题 1", "LLM 问题 2")
+    assert machine.data.next_unanswered() == "LLM 问题 1"
+
+    # 提纲不随 agent socket 关闭而丢弃，生成完成后按 TTL 淘汰
+    orchestrator.release_session("7")
+    assert orchestrator.outline_job("7") is job
+    monkeypatch.setattr(agent_module.settings, "outline_job_ttl_seconds", 0)
+    assert orchestrator.outline_job("7") is None
+    assert not orchestrator._finished_jobs
+
+
+@pytest.mark.asyncio
+async def test_start_outline_uses_cached_outline_immediately(monkeypatch):
+    cached = _outline("主题", ["缓存问题"])
+    builds = []
+
+    async def fake_peek(topic):
+        return cached
+
+    async def fake_build(topic, seeds=None, on_section=None):
+        builds.append(topic)
+        return cached
+
+    monkeypatch.setattr(agent_module.outline_builder, "peek", fake_peek)
+    monkeypatch.setattr(agent_module.outline_builder, "build", fake_build)
+    orchestrator = AgentOrchestrator()
+
+    job = await orchestrator.start_outline("8", "主题")
+    assert job.status == "ready" and job.outline is cached
+    machine = await orchestrator.ensure_session("8", "主题")
+    assert machine.data.outline_questions == ("缓存问题",)
+    assert builds == []
+
+
+@pytest.mark.asyncio
+async def test_failed_generation_keeps_preliminary_outline(monkeypatch):
+    async def fake_peek(topic):
+        return None
+
+    async def broken_build(topic, seeds=None, on_section=None):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(agent_module.outline_builder, "peek", fake_peek)
+    monkeypatch.setattr(agent_module.outline_builder, "build", broken_build)
+    orchestrator = AgentOrchestrator()
+
+    job = await orchestrator.start_outline("9", "主题")
+    outline = await asyncio.wait_for(job.wait(), timeout=1)
+    assert job.status == "ready"
+    assert [s.stage for s in outline.sections] == [stage for stage, _ in DEFAULT_STAGES]
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+from app.services import agent as agent_module
+from app.services.agent import AgentOrchestrator
+from app.services.policy import PolicyDecision
+from app.services.speculation import PartialSpeculator, SpeculationStats, text_similarity
+
+
+def _outline() -> PlanResponse:
+    return PlanResponse(
+        topic="测试主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="Q1"), PlanQuestion(question="Q2")])],
+    )
+
+
+def test_text_similarity_ignores_punctuation():
+    assert text_similarity("我们团队有十个人。", "我们团队有十个人") == 1.0
+    assert text_similarity("我们团队有十个人", "完全不同的内容") < 0.5
+
+
+@pytest.mark.asyncio
+async def test_stable_partial_speculation_is_reused_for_final(monkeypatch: pytest.MonkeyPatch) -> None:
+    orchestrator = AgentOrchestrator()
+    await orchestrator.ensure_session("31", "测试主题", _outline())
+    calls: list[str] = []
+
+    async def fake_policy(state, **kwargs):
+        calls.append(state.session_id)
+        return PolicyDecision(action="ask", question="Q2", rationale="llm")
+
+    async def skip_persist(**kwargs):
+        return None
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", skip_persist)
+
+    stats = SpeculationStats()
+    speculator = PartialSpeculator(
+        lambda text: orchestrator.speculate("31", text),
+        stable_for=0.01,
+        threshold=0.9,
+        max_waste_ratio=0.5,
+        stats=stats,
+    )
+    speculator.on_partial("团队有十个人")
+    await asyncio.sleep(0.05)
+
+    decision = await orchestrator.handle_user_turn(
+        "31", "团队有十个人。", speculation=speculator.take("团队有十个人。")
+    )
+
+    assert decision.question == "Q2"
+    assert calls == ["31"]
+    assert stats.snapshot()["hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_diverging_final_discards_speculation(monkeypatch: pytest.MonkeyPatch) -> None:
+    orchestrator = AgentOrchestrator()
+    await orchestrator.ensure_session("32", "测试主题", _outline())
+    calls = 0
+
+    async def fake_policy(state, **kwargs):
+        nonlocal calls
+        calls += 1
+        return PolicyDecision(action="ask", question="Q2", rationale="llm")
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+
+    stats = SpeculationStats()
+    speculator = PartialSpeculator(
+        lambda text: orchestrator.speculate("32", text),
+        stable_for=0.01,
+        threshold=0.9,
+        max_waste_ratio=0.5,
+        stats=stats,
+    )
+    speculator.on_partial("团队有十个人")
+    await asyncio.sleep(0.05)
+
+    assert speculator.take("其实我们的预算大概五百万") is None
+    assert stats.launched == 1 and stats.hits == 0
+
+
+@pytest.mark.asyncio
+async def test_speculation_rejected_when_prepared_state_differs(monkeypatch: pytest.MonkeyPatch) -> None:
+    orchestrator = AgentOrchestrator()
+    await orchestrator.ensure_session("33", "测试主题", _outline())
+    questions: list[str] = []
+
+    async def fake_policy(state, **kwargs):
+        question = "clarify" if state.pending_clarifications else "Q2"
+        questions.append(question)
+        return PolicyDecision(action="ask", question=question, rationale="llm")
+
+    async def skip_persist(**kwargs):
+        return None
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", skip_persist)
+
+    speculation = orchestrator.speculate("33", "团队有十个人")
+    await asyncio.sleep(0)
+    decision = await orchestrator.handle_user_turn("33", "团队大概有十个人", speculation=speculation)
+
+    assert decision.question == "clarify"
+
+
+def test_waste_cap_limits_extra_llm_calls():
+    stats = SpeculationStats()
+    stats.turns = 4
+    stats.launched = 3
+    assert stats.allow(0.5) is True
+    stats.launched = 4
+    assert stats.allow(0.5) is False
@@ -0,0 +1,94 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+
+from app.config import settings
+from app.core import llm
+from app.core.sse import SSEDecoder, decode_json_event
+
+RECORDED = (Path(__file__).parent / "data" / "ark_chat_stream.sse").read_bytes()
+
+
+def _decode(chunks):
+    decoder = SSEDecoder()
+    events = []
+    for chunk in chunks:
+        events.extend(decoder.feed(chunk))
+    events.extend(decoder.close())
+    return events, decoder
+
+
+def test_decoder_is_independent_of_read_boundaries():
+    whole, decoder = _decode([RECORDED])
+    per_byte, _ = _decode([RECORDED[i : i + 1] for i in range(len(RECORDED))])
+    rng = random.Random(7)
+    cuts = sorted(rng.sample(range(1, len(RECORDED)), 40))
+    random_split, _ = _decode([RECORDED[a:b] for a, b in zip([0] + cuts, cuts + [len(RECORDED)])])
+
+    assert [e.data for e in whole] == [e.data for e in per_byte] == [e.data for e in random_split]
+    assert whole[-1].data == b"[DONE]"
+    assert decoder.comments == 2
+
+
+def test_decoder_handles_multiline_data_crlf_and_fields():
+    stream = b"event: message\r\nid: 7\r\ndata: {\"a\":\r\ndata:  1}\r\n\r\ndata: tail"
+    events, _ = _decode([stream[:22], stream[22:23], stream[23:]])
+
+    assert events[0].event == "message"
+    assert events[0].id == "7"
+    assert events[0].data == b"{\"a\":\n 1}"
+    assert decode_json_event(events[0]) == [{"a": 1}]
+    assert events[1].data == b"tail"
+
+
+def test_decode_json_event_splits_events_without_blank_lines():
+    events, _ = _decode([b"data: {\"x\": 1}\ndata: {\"x\": 2}\n\n"])
+    assert decode_json_event(events[0]) == [{"x": 1}, {"x": 2}]
+
+
+class _FakeContent:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def iter_any(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class _FakeResponse:
+    def __init__(self, chunks):
+        self.content = _FakeContent(chunks)
+
+    def raise_for_status(self):
+        return None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def post(self, *args, **kwargs):
+        return _FakeResponse(self._chunks)
+
+
+def test_chat_stream_yields_deltas_from_recorded_stream(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    chunks = [RECORDED[i : i + 37] for i in range(0, len(RECORDED), 37)]
+    monkeypatch.setattr(llm.http_clients, "get", lambda name: _FakeSession(chunks))
+
+    async def collect():
+        return [part async for part in llm.chat_stream([{"role": "user", "content": "hi"}])]
+
+    parts = asyncio.run(collect())
+    decision = json.loads("".join(parts))
+    assert decision["action"] == "followup"
+    assert decision["question"] == "能否具体说说去年营收增长的主要来源？"
@@ -0,0 +1,80 @@
+import sys
+
+from app.services.state_machine import ConversationState, InterviewStage, StateMachine
+
+
+def test_answered_bitset_tracks_coverage_and_next_question():
+    machine = StateMachine(session_id="1", topic="主题", outline_questions=["Q1", "Q2", "Q3", "Q4"])
+    state = machine.data
+
+    state.mark_answered("Q1")
+    state.mark_answered("Q1")
+    state.mark_answered("Q3")
+
+    assert state.coverage() == 0.5
+    assert state.next_unanswered() == "Q2"
+    assert "Q3" in state.answered_questions
+    assert list(state.answered_questions) == ["Q1", "Q3"]
+    assert machine.rule_based_decision().question == "Q2"
+
+    state.answered_questions.extend(["Q2", "Q4"])
+    assert state.next_unanswered() is None
+    assert state.coverage() == 1.0
+
+
+def test_off_outline_answers_still_count_towards_coverage():
+    state = ConversationState(session_id="1", topic="主题", outline_questions=["Q1", "Q2"])
+    state.last_question = "一个追问"
+    state.mark_last_answered()
+
+    assert state.coverage() == 0.5
+    assert state.is_answered("一个追问")
+    assert state.next_unanswered() == "Q1"
+
+
+def test_pending_clarifications_behave_like_ordered_set():
+    state = ConversationState(session_id="1", topic="主题", outline_questions=["Q1"])
+    state.add_clarification("预算")
+    state.pending_clarifications.append("人数")
+    state.add_clarification("预算")
+
+    assert state.pending_clarifications == ["预算", "人数"]
+    assert state.pending_clarifications[0] == "预算"
+
+    state.resolve_clarification("预算")
+    state.resolve_clarification("不存在")
+    assert list(state.pending_clarifications) == ["人数"]
+
+
+def test_outline_index_is_shared_between_sessions():
+    questions = [f"Q{i}" for i in range(100)]
+    first = ConversationState(session_id="1", topic="主题", outline_questions=questions)
+    second = ConversationState(session_id="2", topic="主题", outline_questions=list(questions))
+
+    assert first.outline_questions is second.outline_questions
+    assert not hasattr(first, "__dict__")
+
+
+def test_snapshot_round_trip():
+    questions = [f"问题{i}" for i in range(20)]
+    state = ConversationState(session_id="s-9", topic="新能源", outline_questions=questions)
+    state.answered_questions.extend(["问题0", "问题7", "提纲外的问题"])
+    state.add_clarification("缺少 KPI")
+    state.stage = InterviewStage.CLARIFY
+    state.last_question = "问题8"
+    state.add_turn("assistant", "问题7")
+    state.add_turn("user", "回答 10%")
+    state.summary = "问题6：团队 12 人"
+
+    restored = ConversationState.from_bytes(state.to_bytes())
+
+    assert restored.session_id == "s-9"
+    assert restored.topic == "新能源"
+    assert restored.stage == InterviewStage.CLARIFY
+    assert restored.last_question == "问题8"
+    assert list(restored.answered_questions) == ["问题0", "问题7", "提纲外的问题"]
+    assert restored.pending_clarifications == ["缺少 KPI"]
+    assert restored.turn_history == state.turn_history
+    assert restored.summary == state.summary
+    assert restored.coverage() == state.coverage()
+    assert sys.getsizeof(state.to_bytes()) < 1024
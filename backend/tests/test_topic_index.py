@@ -0,0 +1,125 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+BACKEND_PATH = ROOT / "backend"
+if str(BACKEND_PATH) not in sys.path:
+    sys.path.insert(0, str(BACKEND_PATH))
+
+pytest.importorskip("numpy")
+
+from app.config import settings
+from app.core import llm
+from app.services.outline import OutlineBuilder
+from app.services.topic_index import TopicIndex
+
+CORPUS = [
+    "2024 新能源车 供应链",
+    "AI Agent 在金融行业的落地",
+    "跨境电商 物流 成本",
+    "大模型 推理 优化",
+    "新能源车 销售策略",
+    "医疗影像 AI 诊断",
+]
+
+
+def _index() -> TopicIndex:
+    index = TopicIndex()
+    for i, topic in enumerate(CORPUS):
+        index.add(str(i), topic)
+    return index
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("新能源汽车供应链 2024", "2024 新能源车 供应链"),
+        ("金融行业 AI Agent 落地", "AI Agent 在金融行业的落地"),
+        ("大模型推理性能优化", "大模型 推理 优化"),
+    ],
+)
+def test_near_duplicate_topics_match(query, expected):
+    match = _index().query(query, threshold=0.7)
+    assert match is not None and match.topic == expected
+
+
+@pytest.mark.parametrize("query", ["新能源车 电池 回收", "医疗 大模型", "新能源车 出海 销售"])
+def test_unrelated_topics_do_not_match(query):
+    assert _index().query(query, threshold=0.7) is None
+
+
+def test_same_template_different_domain_does_not_match():
+    index = _index()
+    index.add("m", "人工智能在医疗行业的应用")
+    assert index.query("人工智能在教育行业的应用", threshold=0.7) is None
+    match = index.query("人工智能在医疗行业中的应用", threshold=0.7)
+    assert match is not None and match.key == "m"
+
+
+def test_removed_topics_are_compacted():
+    index = TopicIndex(compact_after=3)
+    for i in range(5):
+        index.add(str(i), f"主题{i} 供应链")
+    for i in range(3):
+        index.remove(str(i))
+    assert len(index._keys) == 2 and len(index) == 2
+    match = index.query("主题4 供应链", threshold=0.7)
+    assert match is not None and match.key == "4"
+
+
+def test_removed_topics_are_not_returned():
+    index = _index()
+    index.remove("0")
+    assert index.query("2024 新能源车 供应链", threshold=0.7) is None
+    assert len(index) == len(CORPUS) - 1
+    assert index.stats()["lookups"] == 1
+
+
+def test_outline_builder_reuses_similar_topic(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    calls = []
+
+    async def fake_chat_stream(messages, **kwargs):
+        calls.append(messages)
+        yield json.dumps([{"stage": "背景", "questions": ["Q1"]}], ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    builder = OutlineBuilder()
+
+    async def scenario():
+        await builder.build("2024 新能源车 供应链")
+        similar = await builder.build("新能源汽车供应链 2024")
+        await builder.build("医疗影像 AI 诊断")
+        return similar
+
+    similar = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert similar.topic == "新能源汽车供应链 2024"
+    assert similar.sections[0].questions[0].question == "Q1"
+    stats = builder.stats()
+    assert stats["llm_calls_saved"] == 1
+    assert stats["topic_index"]["topics"] == 2
+
+
+def test_similarity_matching_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    monkeypatch.setattr(settings, "outline_topic_match_threshold", 1.5)
+    calls = []
+
+    async def fake_chat_stream(messages, **kwargs):
+        calls.append(messages)
+        yield json.dumps([{"stage": "背景", "questions": ["Q1"]}], ensure_ascii=False)
+
+    monkeypatch.setattr(llm, "chat_stream", fake_chat_stream)
+    builder = OutlineBuilder()
+    asyncio.run(builder.build("2024 新能源车 供应链"))
+    asyncio.run(builder.build("新能源汽车供应链 2024"))
+    assert len(calls) == 2
@@ -0,0 +1,173 @@
+import asyncio
+import time
+
+import pytest
+
+from app.config import settings
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+from app.services import agent as agent_module
+from app.services import turn_budget as turn_budget_module
+from app.services.agent import AgentOrchestrator
+from app.services.policy import PolicyDecision
+from app.services.turn_budget import CircuitBreaker, TurnBudget
+
+
+def _outline() -> PlanResponse:
+    return PlanResponse(
+        topic="测试主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="Q1"), PlanQuestion(question="Q2")])],
+    )
+
+
+async def _skip_persist(**kwargs):
+    return None
+
+
+def test_budget_reserves_time_for_tts():
+    budget = TurnBudget(1.0, tts_reserve=0.3, min_policy=0.1, started_at=time.perf_counter() - 0.5)
+    assert budget.policy_timeout() == pytest.approx(0.2, abs=0.02)
+    budget.mark("extraction")
+    late = TurnBudget(1.0, tts_reserve=0.3, min_policy=0.1, started_at=time.perf_counter() - 2)
+    assert late.policy_timeout() == 0.1
+    assert late.summary()["over_budget"] is True
+    assert "extraction_ms" in budget.summary()
+
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch):
+    now = {"t": 100.0}
+    monkeypatch.setattr(turn_budget_module.time, "monotonic", lambda: now["t"])
+    breaker = CircuitBreaker(failure_threshold=2, reset_after=10)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    now["t"] += 10
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # 半开状态只放行一次试探
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now["t"] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["trips"] == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_policy_falls_back_within_budget(monkeypatch):
+    monkeypatch.setattr(settings, "turn_budget_ms", 150)
+    monkeypatch.setattr(settings, "turn_tts_reserve_ms", 50)
+    orchestrator = AgentOrchestrator()
+    await orchestrator.ensure_session("41", "测试主题", _outline())
+    cancelled = asyncio.Event()
+
+    async def slow_policy(state, **kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return PolicyDecision(action="ask", question="LLM", rationale="llm")
+
+    monkeypatch.setattr(agent_module, "decide_policy", slow_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+
+    started = time.perf_counter()
+    decision = await orchestrator.handle_user_turn("41", "我们的团队有十个人")
+    assert time.perf_counter() - started < 1.0
+    assert decision.rationale == "rule-based fallback"
+    assert decision.budget.fallback == "timeout"
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert orchestrator.policy_breaker.failures == 0
+    assert orchestrator.policy_breaker.snapshot()["budget_timeouts"] == 1
+    assert orchestrator.policy_breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_budget_does_not_cut_off_a_question_being_spoken(monkeypatch):
+    monkeypatch.setattr(settings, "turn_budget_ms", 150)
+    monkeypatch.setattr(settings, "turn_tts_reserve_ms", 50)
+    orchestrator = AgentOrchestrator()
+    await orchestrator.ensure_session("44", "测试主题", _outline())
+
+    async def streaming_policy(state, on_question=None, **kwargs):
+        on_question("能具体说说")
+        await asyncio.sleep(0.3)
+        on_question("团队分工吗？")
+        return PolicyDecision(action="followup", question="能具体说说团队分工吗？", rationale="llm")
+
+    monkeypatch.setattr(agent_module, "decide_policy", streaming_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+    pieces = []
+
+    decision = await orchestrator.handle_user_turn("44", "我们的团队有十个人", on_question=pieces.append)
+    assert decision.question == "能具体说说团队分工吗？"
+    assert decision.budget.fallback is None
+    assert "".join(pieces) == decision.question
+    assert orchestrator.policy_breaker.snapshot()["budget_timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_llm(monkeypatch):
+    orchestrator = AgentOrchestrator()
+    orchestrator.policy_breaker = CircuitBreaker(failure_threshold=1, reset_after=60)
+    orchestrator.policy_breaker.record_failure()
+    await orchestrator.ensure_session("42", "测试主题", _outline())
+    calls = []
+
+    async def fake_policy(state, **kwargs):
+        calls.append(state)
+        return PolicyDecision(action="ask", question="LLM", rationale="llm")
+
+    monkeypatch.setattr(agent_module, "decide_policy", fake_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+
+    decision = await orchestrator.handle_user_turn("42", "回答")
+    assert calls == []
+    assert decision.rationale == "rule-based fallback"
+    assert orchestrator.policy_breaker.snapshot()["skipped_calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_errors_trip_the_breaker(monkeypatch):
+    orchestrator = AgentOrchestrator()
+    orchestrator.policy_breaker = CircuitBreaker(failure_threshold=2, reset_after=60)
+    await orchestrator.ensure_session("43", "测试主题", _outline())
+
+    async def broken_policy(state, **kwargs):
+        raise ConnectionError("reset by peer")
+
+    monkeypatch.setattr(agent_module, "decide_policy", broken_policy)
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+
+    for text in ("第一轮", "第二轮"):
+        decision = await orchestrator.handle_user_turn("43", text)
+        assert decision.rationale == "rule-based fallback"
+    assert orchestrator.policy_breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_admission_backpressure_does_not_trip_the_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "ark_base_url", "https://ark.example.com")
+    monkeypatch.setattr(settings, "ark_api_key", "test-key")
+    monkeypatch.setattr(settings, "ark_model_id", "ep-test")
+    orchestrator = AgentOrchestrator()
+    orchestrator.policy_breaker = CircuitBreaker(failure_threshold=1, reset_after=60)
+    await orchestrator.ensure_session("45", "测试主题", _outline())
+
+    async def queue_full(state, **kwargs):
+        raise agent_module.PolicyBackpressureError("LLM admission queue full")
+
+    monkeypatch.setattr(agent_module, "decide_policy", queue_full)
+    monkeypatch.setattr(orchestrator, "_persist_turn", _skip_persist)
+
+    for text in ("第一轮", "第二轮"):
+        decision = await orchestrator.handle_user_turn("45", text)
+        assert decision.rationale == "rule-based fallback"
+    assert orchestrator.policy_breaker.state == "closed"
+    assert orchestrator.policy_breaker.failures == 0
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from app.schemas import PlanQuestion, PlanResponse, PlanSection
+from app.services import agent as agent_module
+from app.services.agent import AgentOrchestrator
+from app.services.policy import PolicyDecision
+from app.services.turn_debouncer import TurnDebouncer
+
+
+@pytest.mark.asyncio
+async def test_finals_within_window_are_merged_into_one_turn() -> None:
+    decided: list[str] = []
+    delivered: list[str] = []
+
+    async def decide(text: str) -> str:
+        decided.append(text)
+        return f"reply:{text}"
+
+    async def deliver(result: str) -> None:
+        delivered.append(result)
+
+    debouncer = TurnDebouncer(0.05, decide, deliver)
+    debouncer.submit("我们去年")
+    await asyncio.sleep(0.01)
+    debouncer.submit("营收增长了 10%")
+    await asyncio.sleep(0.1)
+
+    assert decided == ["我们去年 营收增长了 10%"]
+    assert delivered == ["reply:我们去年 营收增长了 10%"]
+    assert debouncer.stats == {"finals": 2, "turns": 1, "cancelled_decisions": 0}
+
+
+@pytest.mark.asyncio
+async def test_new_speech_cancels_in_flight_decision() -> None:
+    started = asyncio.Event()
+    decided: list[str] = []
+    delivered: list[str] = []
+
+    async def decide(text: str) -> str:
+        decided.append(text)
+        started.set()
+        await asyncio.sleep(0.05)
+        return text
+
+    async def deliver(result: str) -> None:
+        delivered.append(result)
+
+    debouncer = TurnDebouncer(0.0, decide, deliver)
+    debouncer.submit("第一段")
+    await asyncio.wait_for(started.wait(), timeout=1)
+    debouncer.submit("第二段")
+    await debouncer.flush()
+
+    assert decided == ["第一段", "第一段 第二段"]
+    assert delivered == ["第一段 第二段"]
+    assert debouncer.stats["cancelled_decisions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_speech_after_commit_starts_next_turn() -> None:
+    release = asyncio.Event()
+    delivered: list[str] = []
+
+    async def decide(text: str) -> str:
+        return text
+
+    async def deliver(result: str) -> None:
+        await release.wait()
+        delivered.append(result)
+
+    debouncer = TurnDebouncer(0.0, decide, deliver)
+    debouncer.submit("第一轮")
+    await asyncio.sleep(0.01)
+    debouncer.submit("第二轮")
+    await asyncio.sleep(0.01)
+    release.set()
+    await debouncer.flush()
+    await asyncio.sleep(0.01)
+
+    assert delivered == ["第一轮", "第二轮"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_turn_rolls_back_conversation_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    orchestrator = AgentOrchestrator()
+    outline = PlanResponse(
+        topic="测试主题",
+        sections=[PlanSection(stage="背景", questions=[PlanQuestion(question="Q1"), PlanQuestion(question="Q2")])],
+    )
+    machine = await orchestrator.ensure_session("9", "测试主题", outline)
+    machine.data.last_question = "Q1"
+
+    async def slow_policy(state, **kwargs):
+        await asyncio.sleep(1)
+        return PolicyDecision(action="ask", question="Q2", rationale="")
+
+    monkeypatch.setattr(agent_module, "decide_policy", slow_policy)
+
+    task = asyncio.create_task(orchestrator.handle_user_turn("9", "大概 10 个人"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert machine.data.last_question == "Q1"
+    assert machine.data.coverage() == 0.0
+    assert len(machine.data.pending_clarifications) == 0
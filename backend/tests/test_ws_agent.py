@@ -86,3 +86,66 @@ async def test_initial_tts_uses_question(monkeypatch: pytest.MonkeyPatch) -> Non
     await asyncio.sleep(0)
 
     assert calls == [("123", "请介绍一下公司的产品亮点")]
+
+
+class ScriptedWebSocket(DummyWebSocket):
+    def __init__(self, messages: list[dict]) -> None:
+        super().__init__()
+        self.messages = list(messages)
+        self.client_state = None
+        self.app = SimpleNamespace(state=SimpleNamespace())
+
+    async def receive_json(self) -> dict:
+        if not self.messages:
+            raise WebSocketDisconnect()
+        return self.messages.pop(0)
+
+    async def close(self) -> None:
+        return None
+
+
+class RecordingManager(DummyManager):
+    def __init__(self) -> None:
+        super().__init__()
+        self.cancelled = 0
+
+    async def cancel_tts(self, session_id: str) -> None:
+        self.cancelled += 1
+
+    def dispatch_tts(self, session_id: str, text) -> None:
+        return None
+
+    async def disconnect(self, session_id: str) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_first_partial_of_an_utterance_barges_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    recording = RecordingManager()
+    monkeypatch.setattr(ws_agent, "manager", recording)
+    monkeypatch.setattr(ws_agent.settings, "speculative_policy_enabled", False)
+    decision = AgentDecision(
+        action="followup", question="q1", stage=InterviewStage.OPENING, rationale="test"
+    )
+
+    async def fake_ensure(session_id: str, topic: str):
+        return SimpleNamespace(data=SimpleNamespace(stage=InterviewStage.OPENING))
+
+    async def fake_bootstrap(session_id: str) -> AgentDecision:
+        return decision
+
+    monkeypatch.setattr(ws_agent.agent_orchestrator, "ensure_session", fake_ensure)
+    monkeypatch.setattr(ws_agent.agent_orchestrator, "outline_job", lambda session_id: None)
+    monkeypatch.setattr(ws_agent.agent_orchestrator, "bootstrap_decision", fake_bootstrap)
+    monkeypatch.setattr(ws_agent.agent_orchestrator, "precompute_branches", lambda session_id: [])
+    monkeypatch.setattr(ws_agent.agent_orchestrator, "observe_partial", lambda session_id, text: text)
+
+    socket = ScriptedWebSocket([
+        {"type": "partial", "text": "我们"},
+        {"type": "partial", "text": "我们公司"},
+        {"type": "partial", "text": "我们公司主要"},
+    ])
+    await ws_agent.websocket_agent(socket)
+
+    # 首个 partial 打断一次，其余 partial 不重复打断；finally 中的清理再取消一次
+    assert recording.cancelled == 2
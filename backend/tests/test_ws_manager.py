@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.ws_tts_manager import manager as tts_manager
+from app.utils import ws_manager as ws_manager_module
+from app.utils.ws_manager import WebSocketManager
+
+
+@pytest.mark.asyncio
+async def test_dispatch_tts_returns_without_waiting_for_playback(monkeypatch: pytest.MonkeyPatch) -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_stream(session_id: str, text: str) -> None:
+        started.set()
+        await release.wait()
+
+    monkeypatch.setattr(ws_manager_module, "stream_and_broadcast", slow_stream)
+    manager = WebSocketManager()
+
+    begin = time.perf_counter()
+    task = manager.dispatch_tts("s-dispatch", "你好")
+    assert (time.perf_counter() - begin) < 0.01
+    assert task is not None and not task.done()
+
+    await asyncio.wait_for(started.wait(), timeout=1)
+    release.set()
+    await task
+    assert manager.tts_stats()["active_tts_tasks"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_tts_interrupts_stream_quickly(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def endless_stream(session_id: str, text: str) -> None:
+        task = asyncio.current_task()
+        tts_manager.start_stream(session_id, task)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            tts_manager.finish_stream(session_id, task)
+
+    monkeypatch.setattr(ws_manager_module, "stream_and_broadcast", endless_stream)
+    manager = WebSocketManager()
+
+    task = manager.dispatch_tts("s-cancel", "一个很长的问题")
+    await asyncio.sleep(0)
+    latency_ms = await manager.cancel_tts("s-cancel")
+
+    assert task.cancelled()
+    assert latency_ms is not None and latency_ms < 50
+    assert "s-cancel" not in tts_manager.stream_tokens
+    assert manager.tts_stats()["cancel_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatch_tts_replaces_previous_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def endless_stream(session_id: str, text: str) -> None:
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(ws_manager_module, "stream_and_broadcast", endless_stream)
+    manager = WebSocketManager()
+
+    first = manager.dispatch_tts("s-replace", "第一个问题")
+    await asyncio.sleep(0)
+    second = manager.dispatch_tts("s-replace", "第二个问题")
+    await asyncio.sleep(0)
+
+    assert first.cancelled()
+    assert not second.done()
+    await manager.cancel_tts("s-replace")
+    assert await manager.cancel_tts("s-replace") is None
@@ -8,8 +8,19 @@ const WS_OPTIONS = {
   reconnectionDelayGrowFactor: 1.5,
 };
 
+const toNoteEntries = (notes: any[]) =>
+  notes.map((item: any) => ({
+    category: item.category,
+    content: item.content,
+    requiresClarification: item.requires_clarification,
+    confidence: item.confidence,
+  }));
+
 export class AgentClient {
   private socket: ReconnectingWebSocket | null = null;
+  private notesVersion = 0;
+  // 当前这段话是否已发送 speech_start（收到 final 后复位）
+  private speaking = false;
 
   constructor(
     public baseUrl: string,
@@ -49,14 +60,7 @@ export class AgentClient {
             store.addTranscript({ speaker: 'agent', text: data.question });
             store.setPendingQuestion(data.question);
             store.setStage(data.stage);
-            store.updateNotes(
-              data.notes.map((item: any) => ({
-                category: item.category,
-                content: item.content,
-                requiresClarification: item.requires_clarification,
-                confidence: item.confidence,
-              }))
-            );
+            store.updateNotes(toNoteEntries(data.notes));
             break;
           }
 
@@ -67,6 +71,22 @@ export class AgentClient {
             break;
           }
 
+          case 'notes_delta': {
+            // 版本不连续说明丢了增量，向后端请求补发
+            if (data.version !== this.notesVersion + 1) {
+              this.socket?.send(JSON.stringify({ type: 'notes_resync', since: this.notesVersion }));
+            }
+            store.updateNotes(toNoteEntries(data.notes));
+            this.notesVersion = Math.max(this.notesVersion, data.version);
+            break;
+          }
+
+          case 'notes_snapshot': {
+            store.updateNotes(toNoteEntries(data.notes));
+            this.notesVersion = data.version;
+            break;
+          }
+
           case 'agent_ack':
             console.info('[agentClient] ack:', data.text);
             break;
@@ -82,9 +102,20 @@ export class AgentClient {
 
   sendUserTurn(text: string) {
     if (!this.socket) return;
+    this.speaking = false;
     this.socket.send(JSON.stringify({ type: 'user_turn', text }));
   }
 
+  sendPartial(text: string) {
+    if (!this.socket || !text) return;
+    if (!this.speaking) {
+      // 🎙️ 本段话的首个 partial：先通知后端打断正在播报的问题
+      this.speaking = true;
+      this.socket.send(JSON.stringify({ type: 'speech_start' }));
+    }
+    this.socket.send(JSON.stringify({ type: 'partial', text }));
+  }
+
   close() {
     this.socket?.close();
   }
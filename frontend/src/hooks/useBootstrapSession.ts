@@ -2,6 +2,15 @@
 import { useEffect, useRef } from 'react';
 import { useSessionStore } from '../store/useSessionStore';
 
+type OutlineSection = { stage: string; questions: string[] };
+
+function toOutlineSection(section: any): OutlineSection {
+  return {
+    stage: section.stage,
+    questions: section.questions.map((q: any) => q.question),
+  };
+}
+
 export function useBootstrapSession(apiBaseUrl: string) {
   const setSession = useSessionStore((state) => state.setSession);
   const setOutline = useSessionStore((state) => state.setOutline);
@@ -17,6 +26,7 @@ export function useBootstrapSession(apiBaseUrl: string) {
     (async () => {
       try {
         console.info('[bootstrap] creating new session...');
+        // 立即返回：outline 为缓存或默认提纲，LLM 提纲就绪后经 /ws/agent 的 outline 消息替换
         const response = await fetch(`${apiBaseUrl}/v1/sessions`, {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
@@ -25,15 +35,10 @@ export function useBootstrapSession(apiBaseUrl: string) {
         const data = await response.json();
 
         const sid = String(data.session.id);
-        console.info('[bootstrap] ✅ session created', sid);
+        console.info('[bootstrap] ✅ session created', sid, 'outline:', data.outline_status);
 
         setSession({ sessionId: sid, topic: data.session.topic });
-        setOutline(
-          data.outline.sections.map((section: any) => ({
-            stage: section.stage,
-            questions: section.questions.map((q: any) => q.question),
-          })),
-        );
+        setOutline(data.outline.sections.map(toOutlineSection));
       } catch (error) {
         console.error('[bootstrap] ❌ failed to create session', error);
       }
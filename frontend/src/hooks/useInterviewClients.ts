@@ -56,6 +56,7 @@ export function useInterviewClients(apiBaseUrl: string) {
       onPartial: (text) => {
         const store = useSessionStore.getState();
         store.setAsrPartial?.(text);
+        agentRef.current?.sendPartial(text);
       },
     });
     asrRef.current = asr;